@@ -0,0 +1,10 @@
+"""Run the admin console with ``python -m src.apps.admin``.
+
+Starting from the package keeps parse worker processes from re-importing
+the admin app (and with it the embedding stack), which they would do for a
+plain module run as ``__main__``.
+"""
+
+from src.apps.admin.app import main
+
+main()
@@ -3,23 +3,35 @@ Admin app for managing Obsidian Vector Search operations.
 This is a standalone tool for administrators to monitor and control build index operations.
 """
 
+import asyncio
+import hashlib
+import hmac
 import json
 import os
 from pathlib import Path
 
 import httpx
-from fastapi import Depends, FastAPI, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from src.dependencies import get_sync_coordinator
-from src.services import SyncCoordinator
+from src.dependencies import (
+    admin_lifespan,
+    get_job_manager,
+    get_settings,
+    get_sync_coordinator,
+    get_sync_scheduler,
+    reload_embedding_model,
+)
+from src.schemas import ReloadModelRequest
+from src.services import IndexJob, JobManager, SyncCoordinator, SyncScheduler
 
 app = FastAPI(
     title="Obsidian Vector Search - Admin Console",
     description="Administrative tools for managing vector search operations",
     version="1.0.0",
+    lifespan=admin_lifespan,
 )
 
 # Get the directory containing this file
@@ -105,49 +117,151 @@ async def get_repository_status():
         return {"error": str(e)}
 
 
-@app.post("/api/sync")
-async def sync_stream(
-    coordinator: SyncCoordinator = Depends(get_sync_coordinator),
-):
-    """Stream incremental sync progress."""
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _stream_job(
+    job_manager: JobManager, job: IndexJob, from_event: int = 0
+) -> StreamingResponse:
+    """Stream a job's events; disconnecting does not stop the job."""
 
     async def generate_progress():
-        async for progress in coordinator.incremental_sync_stream():
+        async for progress in job_manager.subscribe(job, from_event):
             yield f"data: {json.dumps(progress)}\n\n"
 
     return StreamingResponse(
         generate_progress(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        headers={**SSE_HEADERS, "X-Job-Id": job.id},
     )
 
 
+def _start_or_join(
+    coordinator: SyncCoordinator, kind: str, resume: bool = False
+) -> StreamingResponse:
+    job, _ = coordinator.start_job(kind, resume=resume)
+    if job.kind != kind:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": f"A {job.kind} job is already running",
+                "job": job.to_dict(),
+            },
+        )
+    return _stream_job(coordinator.job_manager, job)
+
+
+@app.post("/api/sync")
+async def sync_stream(
+    coordinator: SyncCoordinator = Depends(get_sync_coordinator),
+):
+    """Start (or join) an incremental sync job and stream its progress."""
+    return _start_or_join(coordinator, "sync")
+
+
 @app.post("/api/build-index")
 async def build_index_stream(
+    resume: bool = False,
     coordinator: SyncCoordinator = Depends(get_sync_coordinator),
 ):
-    """Stream full rebuild progress."""
+    """Start (or join) a full rebuild job, optionally resuming from a checkpoint."""
+    return _start_or_join(coordinator, "rebuild", resume=resume)
 
-    async def generate_progress():
-        async for progress in coordinator.rebuild_index_stream():
-            yield f"data: {json.dumps(progress)}\n\n"
 
-    return StreamingResponse(
-        generate_progress(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+@app.get("/api/jobs")
+async def list_jobs(job_manager: JobManager = Depends(get_job_manager)):
+    """List recent index jobs, newest first."""
+    return [job.to_dict() for job in job_manager.list_jobs()]
 
 
-if __name__ == "__main__":
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, job_manager: JobManager = Depends(get_job_manager)):
+    """Get the status and progress of an index job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(
+    job_id: str,
+    from_event: int = 0,
+    job_manager: JobManager = Depends(get_job_manager),
+):
+    """Replay a job's events from an index and follow it until it ends."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _stream_job(job_manager, job, from_event)
+
+
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str, job_manager: JobManager = Depends(get_job_manager)):
+    """Ask a running job to stop after its current step."""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.post("/api/webhook/sync", status_code=202)
+async def sync_webhook(
+    request: Request,
+    scheduler: SyncScheduler = Depends(get_sync_scheduler),
+):
+    """Schedule a debounced incremental sync on a push notification.
+
+    Requests must carry a GitHub-style X-Hub-Signature-256 HMAC of the body
+    made with SYNC_WEBHOOK_SECRET. The endpoint is off when no secret is set.
+    """
+    secret = get_settings().SYNC_WEBHOOK_SECRET
+    if not secret:
+        raise HTTPException(status_code=404, detail="Webhook is not enabled")
+
+    body = await request.body()
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    signature = request.headers.get("X-Hub-Signature-256", "")
+    if not hmac.compare_digest(signature, expected):
+        raise HTTPException(status_code=403, detail="Invalid signature")
+
+    scheduler.notify()
+    return {"scheduled": True, "scheduler": scheduler.get_stats()}
+
+
+@app.post("/api/reload-model")
+async def reload_model(
+    request: ReloadModelRequest,
+    job_manager: JobManager = Depends(get_job_manager),
+):
+    """Hot-swap the embedding model; a rebuild then re-embeds the index with it.
+
+    The running process cannot see a changed EMBEDDING_MODEL_NAME, so the
+    model is named in the request. Set the variable as well so a restart
+    keeps using it.
+    """
+    if not request.model_name.strip():
+        raise HTTPException(status_code=400, detail="model_name cannot be empty")
+    # A rebuild must embed every chunk with the model its collection names
+    if job_manager.active_job is not None:
+        raise HTTPException(
+            status_code=409,
+            detail="An index job is running; reload the model once it finishes",
+        )
+    try:
+        return await asyncio.to_thread(
+            reload_embedding_model, request.model_name.strip()
+        )
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def main() -> None:
+    """Run the admin console with uvicorn."""
     import uvicorn
 
     host = os.getenv("ADMIN_HOST", "0.0.0.0")
@@ -159,3 +273,7 @@ if __name__ == "__main__":
     # Only enable reload in development environment
     reload = os.getenv("ENVIRONMENT", "production") == "development"
     uvicorn.run(app, host=host, port=port, reload=reload)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,25 @@
+import asyncio
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 
-from src.dependencies import get_sync_coordinator
-from src.schemas import SearchRequest
+from src.config.settings import Settings
+from src.dependencies import get_settings, get_sync_coordinator
+from src.schemas import (
+    BatchSearchRequest,
+    SearchRequest,
+    SearchResult,
+    SimilarRequest,
+)
 from src.services import SyncCoordinator
 
 router = APIRouter(prefix="/obs-vctr-srch", tags=["obs-vctr-srch"])
 logger = logging.getLogger(__name__)
 
 
-@router.post("/search", response_model=Dict[str, Any])
-async def search_documents(
-    request: SearchRequest, coordinator: SyncCoordinator = Depends(get_sync_coordinator)
-):
-    """Search documents in the vector store."""
-    # Validate request
+def _validate_search_request(request: SearchRequest) -> None:
     if not request.query.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty")
 
@@ -24,20 +27,195 @@ async def search_documents(
         raise HTTPException(status_code=400, detail="n_results must be positive")
     if request.n_results > 200:
         raise HTTPException(status_code=400, detail="n_results exceeds maximum (200)")
+    if request.mmr_lambda is not None and not 0 <= request.mmr_lambda <= 1:
+        raise HTTPException(status_code=400, detail="mmr_lambda must be within [0, 1]")
+    if request.max_chunks_per_file is not None and request.max_chunks_per_file < 1:
+        raise HTTPException(
+            status_code=400, detail="max_chunks_per_file must be positive"
+        )
+    if request.fields is not None:
+        unknown = sorted(set(request.fields) - set(SearchResult.model_fields))
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+            )
+
+
+def _dump_result(result: SearchResult, fields: Optional[List[str]] = None) -> bytes:
+    """Serialize one result, keeping only the requested fields (and id)."""
+    include = None if fields is None else {"id", *fields}
+    return result.model_dump_json(include=include).encode()
+
+
+def _dump_results(
+    results: List[SearchResult], fields: Optional[List[str]] = None
+) -> bytes:
+    return b"[" + b",".join(_dump_result(result, fields) for result in results) + b"]"
+
+
+def _results_response(content: bytes) -> Response:
+    """Wrap serialized results in {"results": ...}.
+
+    Results are serialized directly with pydantic's JSON serializer; they
+    are already validated models, so returning a Response skips FastAPI's
+    re-validation of the response model and jsonable_encoder.
+    """
+    return Response(
+        content=b'{"results":' + content + b"}", media_type="application/json"
+    )
+
+
+def _stream_results(
+    results: List[SearchResult], fields: Optional[List[str]] = None
+) -> Iterator[bytes]:
+    for result in results:
+        yield _dump_result(result, fields) + b"\n"
+
+
+async def _search(
+    request: SearchRequest, coordinator: SyncCoordinator, settings: Settings
+) -> List[SearchResult]:
+    # Validate request
+    _validate_search_request(request)
 
     try:
-        results = coordinator.search_documents(
+        return await coordinator.search_documents_async(
             query=request.query,
             n_results=request.n_results,
             file_filter=request.file_filter,
             tag_filter=request.tag_filter,
+            mode=request.mode,
+            rerank=request.rerank,
+            mmr_lambda=request.mmr_lambda,
+            max_chunks_per_file=request.max_chunks_per_file,
+            fields=request.fields,
+            snippet=request.snippet,
+            timeout=settings.SEARCH_TIMEOUT,
         )
-        return {"results": results}
+    except asyncio.TimeoutError:
+        logger.warning("Search timed out after %ss", settings.SEARCH_TIMEOUT)
+        raise HTTPException(status_code=504, detail="Search timed out")
     except Exception:
         logger.exception("Search failed")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/search")
+async def search_documents(
+    request: SearchRequest,
+    coordinator: SyncCoordinator = Depends(get_sync_coordinator),
+    settings: Settings = Depends(get_settings),
+):
+    """Search documents in the vector store."""
+    results = await _search(request, coordinator, settings)
+    return _results_response(_dump_results(results, request.fields))
+
+
+@router.post("/search/stream")
+async def stream_search_documents(
+    request: SearchRequest,
+    coordinator: SyncCoordinator = Depends(get_sync_coordinator),
+    settings: Settings = Depends(get_settings),
+):
+    """Search, returning one JSON result per line (application/x-ndjson).
+
+    The search itself completes before the response starts; only
+    serialization is chunked, one result per line as the body is written,
+    so the whole result document is never built in memory at once.
+    """
+    results = await _search(request, coordinator, settings)
+    return StreamingResponse(
+        _stream_results(results, request.fields), media_type="application/x-ndjson"
+    )
+
+
+@router.post("/search/batch")
+async def search_documents_batch(
+    request: BatchSearchRequest,
+    coordinator: SyncCoordinator = Depends(get_sync_coordinator),
+    settings: Settings = Depends(get_settings),
+):
+    """Run several searches in one request; results[i] answers searches[i]."""
+    if not request.searches:
+        raise HTTPException(status_code=400, detail="searches cannot be empty")
+    if len(request.searches) > settings.SEARCH_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many searches (max {settings.SEARCH_BATCH_MAX_QUERIES})",
+        )
+    for i, search in enumerate(request.searches):
+        try:
+            _validate_search_request(search)
+        except HTTPException as e:
+            raise HTTPException(status_code=400, detail=f"searches[{i}]: {e.detail}")
+    total_results = sum(search.n_results for search in request.searches)
+    if total_results > settings.SEARCH_BATCH_MAX_TOTAL_RESULTS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "Total n_results exceeds maximum "
+                f"({settings.SEARCH_BATCH_MAX_TOTAL_RESULTS})"
+            ),
+        )
+
+    try:
+        results = await coordinator.search_documents_batch_async(
+            request.searches, timeout=settings.SEARCH_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Batch search timed out after %ss", settings.SEARCH_TIMEOUT)
+        raise HTTPException(status_code=504, detail="Search timed out")
+    except Exception:
+        logger.exception("Batch search failed")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    # Each search's own field projection applies to its result list
+    return _results_response(
+        b"["
+        + b",".join(
+            _dump_results(search_results, search.fields)
+            for search_results, search in zip(results, request.searches)
+        )
+        + b"]"
+    )
+
+
+@router.post("/similar")
+async def find_similar_documents(
+    request: SimilarRequest,
+    coordinator: SyncCoordinator = Depends(get_sync_coordinator),
+    settings: Settings = Depends(get_settings),
+):
+    """Find chunks related to an indexed note or chunk (more like this)."""
+    if (request.file_path is None) == (request.chunk_id is None):
+        raise HTTPException(
+            status_code=400, detail="Provide exactly one of file_path or chunk_id"
+        )
+    if request.n_results < 1:
+        raise HTTPException(status_code=400, detail="n_results must be positive")
+    if request.n_results > 200:
+        raise HTTPException(status_code=400, detail="n_results exceeds maximum (200)")
+    if request.max_chunks_per_file is not None and request.max_chunks_per_file < 1:
+        raise HTTPException(
+            status_code=400, detail="max_chunks_per_file must be positive"
+        )
+
+    try:
+        results = await coordinator.find_similar_async(
+            request, timeout=settings.SEARCH_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Similar search timed out after %ss", settings.SEARCH_TIMEOUT)
+        raise HTTPException(status_code=504, detail="Search timed out")
+    except Exception:
+        logger.exception("Similar search failed")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    if results is None:
+        raise HTTPException(status_code=404, detail="Source not found in the index")
+    return _results_response(_dump_results(results))
+
+
 @router.get("/health")
 async def obs_health_check():
     """Simple health check for obs endpoints."""
@@ -17,6 +17,43 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL_NAME: str = "sentence-transformers/all-mpnet-base-v2"
     OBS_VAULT_TOKEN: str = ""  # For private repositories
     BUILD_INDEX_TIMEOUT: int = 600  # Timeout in seconds for build-index operation
+    INGEST_BATCH_MAX_CHUNKS: int = (
+        256  # Chunks embedded and written together on rebuild
+    )
+    INGEST_BATCH_MAX_TOKENS: int = 64000  # Token budget of one rebuild batch
+    REBUILD_READ_CONCURRENCY: int = 4  # Workers reading note contents
+    REBUILD_PARSE_CONCURRENCY: int = 2  # Workers parsing and chunking notes
+    REBUILD_QUEUE_SIZE: int = 64  # Bound of each queue between rebuild stages
+    PARSE_PROCESS_WORKERS: int = 0  # Processes for parsing/chunking (0 uses threads)
+    EMBEDDING_CACHE_ENABLED: bool = True  # Persist chunk embeddings by content hash
+    GIT_READ_FROM_OBJECTS: bool = False  # Read notes at the fetched commit, no pull
+    AUTO_SYNC_INTERVAL_SECONDS: float = 0  # Poll the remote for new commits (0 = off)
+    AUTO_SYNC_DEBOUNCE_SECONDS: float = 10  # Quiet period before a triggered sync
+    SYNC_WEBHOOK_SECRET: str = ""  # Enables the push webhook (GitHub HMAC secret)
+
+    # Search execution settings
+    SEARCH_MAX_WORKERS: int = (
+        4  # Threads dedicated to query encoding and Chroma queries
+    )
+    SEARCH_TIMEOUT: float = 10.0  # Timeout in seconds for a single search request
+    QUERY_BATCH_MAX_SIZE: int = 32  # Max queries encoded together in one call
+    QUERY_BATCH_WAIT_MS: float = 5.0  # Max wait behind a running encode (0 disables)
+    QUERY_CACHE_MAX_ENTRIES: int = 1024  # Cached query embeddings (0 disables)
+    QUERY_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # Approximate size cap (0 = no cap)
+    QUERY_CACHE_TTL_SECONDS: float = 0  # Expiry for cached query embeddings (0 = none)
+    SEARCH_RESULT_CACHE_MAX_ENTRIES: int = 512  # Cached result lists (0 disables)
+    SEARCH_BATCH_MAX_QUERIES: int = 32  # Searches accepted by one /search/batch call
+    SEARCH_BATCH_MAX_TOTAL_RESULTS: int = 1000  # Sum of n_results in one batch
+    LEXICAL_INDEX_ENABLED: bool = True  # Maintain the BM25 index for hybrid search
+    HYBRID_RRF_K: int = 60  # Reciprocal rank fusion constant of hybrid search
+    RERANK_MODEL_NAME: str = (
+        "cross-encoder/ms-marco-MiniLM-L-6-v2"  # Cross-encoder for rerank ("" = off)
+    )
+    RERANK_CANDIDATES: int = 50  # Candidates rescored per reranked search
+    RERANK_BATCH_SIZE: int = 32  # Pairs scored per cross-encoder call
+    RERANK_BUDGET_MS: float = 300  # Rerank time before keeping vector order (0 = none)
+    RERANK_CACHE_MAX_ENTRIES: int = 10000  # Cached (query, chunk) scores (0 disables)
+    SNIPPET_MAX_CHARS: int = 300  # Length of snippet-mode result content
 
     # Hardcoded paths and branch - these don't change
     OBSIDIAN_LOCAL_PATH: str = "./obs-vault"
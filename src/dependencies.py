@@ -1,10 +1,26 @@
+import asyncio
+from contextlib import asynccontextmanager
 from functools import lru_cache
+from pathlib import Path
+from typing import Dict
 
-from fastapi import Depends
+from fastapi import Depends, FastAPI
 
 from src.config.settings import Settings
-from src.models import GitManager, ObsidianProcessor, VectorStore
-from src.services import SyncCoordinator
+from src.models import (
+    GitManager,
+    ObsidianProcessor,
+    ParseWorkerPool,
+    RebuildCheckpoint,
+    VectorStore,
+    VectorStoreRegistry,
+)
+from src.services import (
+    JobManager,
+    SearchResultCache,
+    SyncCoordinator,
+    SyncScheduler,
+)
 
 
 @lru_cache
@@ -12,12 +28,82 @@ def get_settings() -> Settings:
     return Settings()
 
 
+# VectorStore（ChromaDBクライアントと埋め込みモデル）はプロセス内で共有する
+vector_store_registry = VectorStoreRegistry()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    try:
+        await asyncio.to_thread(vector_store_registry.startup, get_settings())
+    except Exception as e:
+        # Fall back to lazy initialization on the first request
+        print(f"Warning: Failed to preload vector store: {e}")
+
+    try:
+        yield
+    finally:
+        await get_job_manager().shutdown()
+        get_parse_worker_pool().shutdown()
+        await asyncio.to_thread(vector_store_registry.shutdown)
+
+
+@asynccontextmanager
+async def admin_lifespan(app: FastAPI):
+    """Shared lifespan plus the automatic sync scheduler of the admin app."""
+    async with lifespan(app):
+        settings = get_settings()
+        scheduler = get_sync_scheduler()
+        if settings.AUTO_SYNC_INTERVAL_SECONDS > 0 or settings.SYNC_WEBHOOK_SECRET:
+            scheduler.start()
+        try:
+            yield
+        finally:
+            await scheduler.stop()
+
+
+def reload_embedding_model(model_name: str) -> Dict[str, str]:
+    """Hot-swap the embedding model that indexes documents in this process.
+
+    Searches and incremental syncs keep the serving collection's model
+    until a rebuild with the new model is swapped in; every process, including the API workers,
+    then follows through the collection metadata.
+    """
+    if not vector_store_registry.is_initialized:
+        vector_store_registry.get(get_settings())
+    return vector_store_registry.reload_model(model_name)
+
+
 def get_vector_store(settings: Settings = Depends(get_settings)) -> VectorStore:
-    return VectorStore(settings=settings)
+    return vector_store_registry.get(settings)
+
+
+@lru_cache
+def get_search_result_cache() -> SearchResultCache:
+    return SearchResultCache(max_entries=get_settings().SEARCH_RESULT_CACHE_MAX_ENTRIES)
+
+
+@lru_cache
+def get_parse_worker_pool() -> ParseWorkerPool:
+    return ParseWorkerPool(max_workers=get_settings().PARSE_PROCESS_WORKERS)
 
 
-def get_git_manager(settings: Settings = Depends(get_settings)) -> GitManager:
-    return GitManager(settings=settings)
+@lru_cache
+def get_job_manager() -> JobManager:
+    return JobManager()
+
+
+@lru_cache
+def get_rebuild_checkpoint() -> RebuildCheckpoint:
+    return RebuildCheckpoint(
+        Path(get_settings().VECTOR_DB_PATH) / "rebuild_checkpoint.jsonl"
+    )
+
+
+@lru_cache
+def get_git_manager() -> GitManager:
+    return GitManager(settings=get_settings())
 
 
 def get_obsidian_processor(
@@ -31,7 +117,48 @@ def get_sync_coordinator(
     git_manager: GitManager = Depends(get_git_manager),
     vector_store: VectorStore = Depends(get_vector_store),
     processor: ObsidianProcessor = Depends(get_obsidian_processor),
+    result_cache: SearchResultCache = Depends(get_search_result_cache),
+    parse_pool: ParseWorkerPool = Depends(get_parse_worker_pool),
+    checkpoint: RebuildCheckpoint = Depends(get_rebuild_checkpoint),
+    job_manager: JobManager = Depends(get_job_manager),
+    settings: Settings = Depends(get_settings),
 ) -> SyncCoordinator:
     return SyncCoordinator(
-        git_manager=git_manager, vector_store=vector_store, processor=processor
+        git_manager=git_manager,
+        vector_store=vector_store,
+        processor=processor,
+        result_cache=result_cache,
+        ingest_batch_max_chunks=settings.INGEST_BATCH_MAX_CHUNKS,
+        ingest_batch_max_tokens=settings.INGEST_BATCH_MAX_TOKENS,
+        read_concurrency=settings.REBUILD_READ_CONCURRENCY,
+        parse_concurrency=settings.REBUILD_PARSE_CONCURRENCY,
+        pipeline_queue_size=settings.REBUILD_QUEUE_SIZE,
+        parse_pool=parse_pool,
+        checkpoint=checkpoint,
+        job_manager=job_manager,
+    )
+
+
+def build_sync_coordinator() -> SyncCoordinator:
+    """Build a coordinator outside of a request, e.g. for scheduled syncs."""
+    settings = get_settings()
+    return get_sync_coordinator(
+        git_manager=get_git_manager(),
+        vector_store=get_vector_store(settings),
+        processor=get_obsidian_processor(settings),
+        result_cache=get_search_result_cache(),
+        parse_pool=get_parse_worker_pool(),
+        checkpoint=get_rebuild_checkpoint(),
+        job_manager=get_job_manager(),
+        settings=settings,
+    )
+
+
+@lru_cache
+def get_sync_scheduler() -> SyncScheduler:
+    settings = get_settings()
+    return SyncScheduler(
+        coordinator_factory=build_sync_coordinator,
+        interval_seconds=settings.AUTO_SYNC_INTERVAL_SECONDS,
+        debounce_seconds=settings.AUTO_SYNC_DEBOUNCE_SECONDS,
     )
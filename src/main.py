@@ -1,11 +1,13 @@
 from fastapi import FastAPI
 
 from src.apps.api import router
+from src.dependencies import lifespan
 
 app = FastAPI(
     title="Obsidian Vector Search API",
     version="0.1.0",
     description="A FastAPI application for searching Obsidian vault with vector embeddings",
+    lifespan=lifespan,
 )
 
 app.include_router(router.router, prefix="/api")
@@ -1,7 +1,17 @@
 """Models for the application."""
 
+from src.processing import ObsidianProcessor, ParseWorkerPool
+
 from .git_manager import GitManager
-from .obsidian_processor import ObsidianProcessor
+from .rebuild_checkpoint import RebuildCheckpoint
 from .vector_store import VectorStore
+from .vector_store_registry import VectorStoreRegistry
 
-__all__ = ["GitManager", "ObsidianProcessor", "VectorStore"]
+__all__ = [
+    "GitManager",
+    "ObsidianProcessor",
+    "ParseWorkerPool",
+    "RebuildCheckpoint",
+    "VectorStore",
+    "VectorStoreRegistry",
+]
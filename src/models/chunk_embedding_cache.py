@@ -0,0 +1,129 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+class ChunkEmbeddingCache:
+    """Persistent cache of chunk embeddings keyed by model and content hash.
+
+    Stored in a SQLite file next to the ChromaDB data so that rebuilds and
+    re-syncs only encode chunk texts that have never been embedded with the
+    current model. Every lookup and insert refreshes ``last_used``; after a
+    full rebuild, entries not touched since it started are unreferenced and
+    can be evicted with ``evict_unused``.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_embeddings (
+                model_name TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model_name, content_hash)
+            )
+            """)
+        self._conn.commit()
+
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(
+        self, model_name: str, content_hashes: Iterable[str]
+    ) -> Dict[str, List[float]]:
+        """Return cached embeddings for the hashes that are present."""
+        unique_hashes = list(dict.fromkeys(content_hashes))
+        found: Dict[str, List[float]] = {}
+        if not unique_hashes:
+            return found
+
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique_hashes), 500):
+                batch = unique_hashes[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, embedding FROM chunk_embeddings "
+                    f"WHERE model_name = ? AND content_hash IN ({placeholders})",
+                    [model_name, *batch],
+                ).fetchall()
+                for content_hash, blob in rows:
+                    found[content_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE chunk_embeddings SET last_used = ? "
+                "WHERE model_name = ? AND content_hash = ?",
+                [(now, model_name, content_hash) for content_hash in found],
+            )
+            self._conn.commit()
+
+            self._hits += len(found)
+            self._misses += len(unique_hashes) - len(found)
+
+        return found
+
+    def put_many(self, model_name: str, embeddings: Dict[str, List[float]]) -> None:
+        """Store embeddings for the given content hashes."""
+        if not embeddings:
+            return
+
+        now = time.time()
+        rows = [
+            (
+                model_name,
+                content_hash,
+                np.asarray(embedding, dtype=np.float32).tobytes(),
+                now,
+            )
+            for content_hash, embedding in embeddings.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunk_embeddings "
+                "(model_name, content_hash, embedding, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def evict_unused(self, since: float) -> int:
+        """Delete entries (of any model) not used since the given timestamp."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM chunk_embeddings WHERE last_used < ?", (since,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and the number of stored embeddings."""
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM chunk_embeddings"
+            ).fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                "entries": entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,3 +1,4 @@
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -18,6 +19,19 @@ class GitManager:
         self.github_token = settings.OBS_VAULT_TOKEN
         self.repo: Optional[Repo] = None
 
+        # Read notes from the object database instead of the working tree.
+        # Syncs and rebuilds then read at the fetched commit and never pull.
+        # Submodule contents are not part of that tree.
+        self.read_from_objects = settings.GIT_READ_FROM_OBJECTS
+        self._tree_commit: Optional[str] = None
+        self._tree_blobs: Dict[str, str] = {}
+        # Tracked markdown files of the checkout, cached per HEAD commit
+        self._md_files_commit: Optional[str] = None
+        self._md_files: List[str] = []
+        # Guards the tree listing and the persistent `git cat-file --batch`
+        # process, which serves one read at a time
+        self._object_lock = threading.Lock()
+
     def setup_repository(self) -> bool:
         """Clone or initialize the repository."""
         try:
@@ -100,53 +114,92 @@ class GitManager:
             raise RuntimeError("Repository not initialized")
 
         try:
-            # Fetch latest changes
-            origin = self.repo.remotes.origin
-            origin.fetch()
-
-            # Get current HEAD and origin HEAD
-            local_commit = self.repo.head.commit
-            remote_commit = origin.refs[self.branch].commit
+            remote_commit = self.fetch_remote_head()
+            local_commit = self.get_head_commit()
 
-            if local_commit.hexsha == remote_commit.hexsha:
+            if local_commit == remote_commit:
                 print("No changes detected")
                 return []
 
-            # Get diff between local and remote
-            diff_items = local_commit.diff(remote_commit)
-
-            changes = []
-            for item in diff_items:
-                change_type_map = {
-                    "A": FileStatus.ADDED,
-                    "M": FileStatus.MODIFIED,
-                    "D": FileStatus.DELETED,
-                    "R": FileStatus.RENAMED,
-                    "T": FileStatus.MODIFIED,  # Treat type changes as modifications
-                }
-                status = change_type_map.get(item.change_type)
-                if not status:
-                    continue  # Skip unsupported change types
-
-                file_path = item.a_path or item.b_path
-                old_file_path = item.a_path if item.renamed else None
-
-                # Only process .md files (Obsidian notes)
-                if file_path and file_path.endswith(".md"):
-                    changes.append(
-                        FileChange(
-                            file_path=file_path,
-                            status=status,
-                            old_file_path=old_file_path,
-                        )
-                    )
-
-            return changes
+            return self.get_changes_between(local_commit, remote_commit)
 
         except Exception as e:
             print(f"Failed to get changed files: {e}")
             return []
 
+    def fetch_remote_head(self) -> str:
+        """Fetch the remote and return the SHA of the tracked branch's head."""
+        if not self.repo:
+            raise RuntimeError("Repository not initialized")
+
+        origin = self.repo.remotes.origin
+        origin.fetch()
+        return origin.refs[self.branch].commit.hexsha
+
+    def get_remote_head(self) -> Optional[str]:
+        """Look up the remote branch head with ls-remote, without fetching."""
+        if self._open_repository() is None:
+            return None
+
+        output = self.repo.git.ls_remote("origin", f"refs/heads/{self.branch}")
+        return output.split()[0] if output else None
+
+    def get_head_commit(self) -> Optional[str]:
+        """Return the SHA of the checked-out commit."""
+        if not self.repo:
+            return None
+        return self.repo.head.commit.hexsha
+
+    def has_commit(self, commit_sha: str) -> bool:
+        """Whether the commit exists in the local object database."""
+        if not self.repo:
+            return False
+        try:
+            self.repo.commit(commit_sha)
+            return True
+        except Exception:
+            return False
+
+    def get_changes_between(
+        self, base_commit: str, target_commit: str
+    ) -> List[FileChange]:
+        """List markdown files changed between two commits."""
+        if not self.repo:
+            raise RuntimeError("Repository not initialized")
+
+        if base_commit == target_commit:
+            return []
+
+        diff_items = self.repo.commit(base_commit).diff(target_commit)
+
+        changes = []
+        for item in diff_items:
+            change_type_map = {
+                "A": FileStatus.ADDED,
+                "M": FileStatus.MODIFIED,
+                "D": FileStatus.DELETED,
+                "R": FileStatus.RENAMED,
+                "T": FileStatus.MODIFIED,  # Treat type changes as modifications
+            }
+            status = change_type_map.get(item.change_type)
+            if not status:
+                continue  # Skip unsupported change types
+
+            file_path = item.a_path or item.b_path
+            old_file_path = item.a_path if item.renamed else None
+
+            # Only process .md files (Obsidian notes)
+            if file_path and file_path.endswith(".md"):
+                changes.append(
+                    FileChange(
+                        file_path=file_path,
+                        status=status,
+                        old_file_path=old_file_path,
+                    )
+                )
+
+        return changes
+
     def pull_changes(self) -> bool:
         """Pull latest changes from remote and update submodules."""
         if not self.repo:
@@ -169,8 +222,13 @@ class GitManager:
             print(f"Failed to pull changes or update submodules: {e}")
             return False
 
-    def get_file_content(self, file_path: str) -> Optional[str]:
+    def get_file_content(
+        self, file_path: str, revision: Optional[str] = None
+    ) -> Optional[str]:
         """Get content of a specific file."""
+        if self.read_from_objects or revision:
+            return self._read_blob_content(file_path, revision or "HEAD")
+
         try:
             full_path = self.local_path / file_path
             if full_path.exists():
@@ -180,8 +238,31 @@ class GitManager:
             print(f"Failed to read file {file_path}: {e}")
             return None
 
-    def get_all_markdown_files(self) -> List[str]:
-        """Get list of all markdown files in the repository."""
+    def get_all_markdown_files(
+        self, revision: Optional[str] = None, strict: bool = False
+    ) -> List[str]:
+        """Get list of all markdown files in the repository.
+
+        With strict, a failed listing raises instead of returning an empty
+        (or working-tree) list, so callers can tell it from an empty vault.
+        """
+        if self.read_from_objects or revision:
+            try:
+                return sorted(self.list_markdown_blobs(revision or "HEAD"))
+            except Exception as e:
+                if strict:
+                    raise
+                print(f"Failed to list markdown files from git tree: {e}")
+                return []
+
+        if self._open_repository() is not None:
+            try:
+                return self._list_tracked_markdown_files()
+            except Exception as e:
+                if strict:
+                    raise
+                print(f"Failed to list markdown files from git index: {e}")
+
         if not self.local_path.exists():
             return []
 
@@ -192,6 +273,64 @@ class GitManager:
 
         return md_files
 
+    def _open_repository(self) -> Optional[Repo]:
+        """Open an existing local clone without touching the remote."""
+        if self.repo is None and (self.local_path / ".git").exists():
+            self.repo = Repo(self.local_path)
+        return self.repo
+
+    def _list_tracked_markdown_files(self) -> List[str]:
+        """List tracked markdown files from the git index, cached per HEAD."""
+        with self._object_lock:
+            head_commit = self.repo.head.commit.hexsha
+            if head_commit != self._md_files_commit:
+                # Submodule notes are checked out too, so list them as well
+                output = self.repo.git.ls_files(
+                    "-z", "--recurse-submodules", "--", "*.md"
+                )
+                self._md_files = [path for path in output.split("\0") if path]
+                self._md_files_commit = head_commit
+            return list(self._md_files)
+
+    def list_markdown_blobs(self, revision: str = "HEAD") -> Dict[str, str]:
+        """Map markdown paths in a commit's tree to their blob SHAs."""
+        if self._open_repository() is None:
+            raise RuntimeError("Repository not initialized")
+
+        with self._object_lock:
+            commit_sha = self.repo.commit(revision).hexsha
+            if commit_sha == self._tree_commit:
+                return self._tree_blobs
+
+            # One ls-tree call lists the whole tree; -z keeps unusual paths intact
+            output = self.repo.git.ls_tree("-r", "-z", "--full-tree", commit_sha)
+            blobs = {}
+            for entry in output.split("\0"):
+                if not entry:
+                    continue
+                info, path = entry.split("\t", 1)
+                _, object_type, object_sha = info.split()
+                if object_type == "blob" and path.endswith(".md"):
+                    blobs[path] = object_sha
+
+            self._tree_commit = commit_sha
+            self._tree_blobs = blobs
+            return blobs
+
+    def _read_blob_content(self, file_path: str, revision: str) -> Optional[str]:
+        """Read a file's content at a revision via `git cat-file --batch`."""
+        try:
+            blob_sha = self.list_markdown_blobs(revision).get(file_path)
+            if blob_sha is None:
+                return None
+
+            with self._object_lock:
+                _, _, _, data = self.repo.git.get_object_data(blob_sha)
+            return data.decode("utf-8")
+        except Exception as e:
+            print(f"Failed to read blob for {file_path}: {e}")
+            return None
+
     def get_last_sync_info(self) -> Dict[str, str]:
         """Get information about the last sync."""
         if not self.repo:
@@ -0,0 +1,242 @@
+import heapq
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+# Scripts written without spaces between words are indexed as character bigrams
+_CJK = r"\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_CJK_RUN = re.compile(f"([{_CJK}]+)")
+_CJK_WORD = re.compile(f"^[{_CJK}]+$")
+# Words, keeping dotted and dashed identifiers such as "v1.2" or "foo-bar" whole
+_WORD = re.compile(r"\w+(?:[.\-]\w+)*")
+_WORD_PARTS = re.compile(r"[.\-_]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase BM25 terms.
+
+    Compound identifiers ("snake_case", "pkg.module", "foo-bar") are indexed
+    both whole and by their parts, so either form of a query matches.
+    """
+    tokens = []
+    for word in _WORD.findall(_CJK_RUN.sub(r" \1 ", text.lower())):
+        if _CJK_WORD.match(word):
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+            continue
+
+        tokens.append(word)
+        parts = [part for part in _WORD_PARTS.split(word) if part]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class LexicalIndex:
+    """Persistent BM25 inverted index over the chunks of one collection.
+
+    Stored in a SQLite file next to the ChromaDB data and updated chunk by
+    chunk alongside the collection, so keeping it current never needs a scan
+    of the vault. The chunk count and total length used for BM25 are kept as
+    running totals for the same reason.
+    """
+
+    def __init__(self, path: Path, k1: float = 1.2, b: float = 0.75):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                chunk_id TEXT PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_file_path ON chunks (file_path);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, chunk_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_chunk_id ON postings (chunk_id);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """)
+        self._conn.commit()
+
+    @property
+    def complete(self) -> bool:
+        """Whether every chunk of the collection has been indexed."""
+        with self._lock:
+            return self._get_meta("complete", "0") == "1"
+
+    def mark_complete(self) -> None:
+        """Mark the index as covering its collection, e.g. one created empty."""
+        with self._lock:
+            self._set_meta("complete", "1")
+            self._conn.commit()
+
+    def add_chunks(
+        self, ids: List[str], file_paths: List[str], texts: List[str]
+    ) -> None:
+        """Index (or re-index) chunks by ID."""
+        with self._lock:
+            self._delete_ids(ids)
+
+            chunk_rows = []
+            posting_rows = []
+            for chunk_id, file_path, text in zip(ids, file_paths, texts):
+                terms = Counter(tokenize(text))
+                length = sum(terms.values())
+                chunk_rows.append((chunk_id, file_path, length))
+                posting_rows.extend((term, chunk_id, tf) for term, tf in terms.items())
+
+            self._conn.executemany(
+                "INSERT INTO chunks (chunk_id, file_path, length) VALUES (?, ?, ?)",
+                chunk_rows,
+            )
+            self._conn.executemany(
+                "INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                posting_rows,
+            )
+            self._add_totals(len(chunk_rows), sum(row[2] for row in chunk_rows))
+            self._conn.commit()
+
+    def remove_chunks(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            self._delete_ids(list(ids))
+            self._conn.commit()
+
+    def remove_files(self, file_paths: Iterable[str]) -> None:
+        """Remove every chunk of the given files."""
+        with self._lock:
+            ids = []
+            for batch in self._batches(list(file_paths)):
+                placeholders = ",".join("?" * len(batch))
+                ids.extend(
+                    row[0]
+                    for row in self._conn.execute(
+                        f"SELECT chunk_id FROM chunks WHERE file_path IN ({placeholders})",
+                        batch,
+                    )
+                )
+            self._delete_ids(ids)
+            self._conn.commit()
+
+    def search(self, query: str, n_results: int) -> List[Tuple[str, float]]:
+        """Return up to n_results (chunk ID, BM25 score) pairs, best first."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            chunk_count = int(self._get_meta("chunk_count", "0"))
+            total_length = int(self._get_meta("total_length", "0"))
+            if chunk_count == 0:
+                return []
+            average_length = total_length / chunk_count or 1
+
+            scores: Dict[str, float] = defaultdict(float)
+            for term in terms:
+                rows = self._conn.execute(
+                    "SELECT p.chunk_id, p.tf, c.length FROM postings p "
+                    "JOIN chunks c ON c.chunk_id = p.chunk_id WHERE p.term = ?",
+                    (term,),
+                ).fetchall()
+                if not rows:
+                    continue
+
+                df = len(rows)
+                idf = math.log(1 + (chunk_count - df + 0.5) / (df + 0.5))
+                for chunk_id, tf, length in rows:
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                    scores[chunk_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+
+    def clear(self) -> None:
+        """Remove all chunks; an empty index still covers its (empty) collection."""
+        with self._lock:
+            self._conn.execute("DELETE FROM postings")
+            self._conn.execute("DELETE FROM chunks")
+            self._set_meta("chunk_count", "0")
+            self._set_meta("total_length", "0")
+            self._set_meta("complete", "1")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "chunks": int(self._get_meta("chunk_count", "0")),
+                "complete": self._get_meta("complete", "0") == "1",
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def destroy(self) -> None:
+        """Close the index and delete its files."""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+
+    def _delete_ids(self, ids: List[str]) -> None:
+        removed_count = 0
+        removed_length = 0
+        for batch in self._batches(ids):
+            placeholders = ",".join("?" * len(batch))
+            count, length = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks "
+                f"WHERE chunk_id IN ({placeholders})",
+                batch,
+            ).fetchone()
+            removed_count += count
+            removed_length += length
+            self._conn.execute(
+                f"DELETE FROM postings WHERE chunk_id IN ({placeholders})", batch
+            )
+            self._conn.execute(
+                f"DELETE FROM chunks WHERE chunk_id IN ({placeholders})", batch
+            )
+        if removed_count:
+            self._add_totals(-removed_count, -removed_length)
+
+    def _add_totals(self, chunk_count: int, total_length: int) -> None:
+        self._set_meta(
+            "chunk_count", str(int(self._get_meta("chunk_count", "0")) + chunk_count)
+        )
+        self._set_meta(
+            "total_length",
+            str(int(self._get_meta("total_length", "0")) + total_length),
+        )
+
+    def _get_meta(self, key: str, default: str) -> str:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    @staticmethod
+    def _batches(values: List[str], size: int = 500) -> Iterable[List[str]]:
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(values), size):
+            yield values[start : start + size]
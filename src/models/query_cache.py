@@ -0,0 +1,118 @@
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+CacheKey = Tuple[str, str]
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU cache of query embeddings keyed by model and normalized query."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int = 0,
+        ttl_seconds: float = 0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes  # 0 means no byte cap
+        self.ttl_seconds = ttl_seconds  # 0 means entries never expire
+
+        # key -> (embedding, stored_at, approximate size in bytes)
+        self._entries: "OrderedDict[CacheKey, Tuple[List[float], float, int]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Normalize unicode forms and collapse whitespace."""
+        return " ".join(unicodedata.normalize("NFKC", query).split())
+
+    @staticmethod
+    def _estimate_size(key: CacheKey, embedding: List[float]) -> int:
+        # Python floats are 8 bytes of payload; the key strings dominate the rest
+        return len(embedding) * 8 + len(key[0]) + len(key[1])
+
+    def get(self, model_name: str, query: str) -> Optional[List[float]]:
+        """Return the cached embedding or None, counting hits and misses."""
+        if not self.enabled:
+            return None
+
+        key = (model_name, self.normalize(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[1]):
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, model_name: str, query: str, embedding: List[float]) -> None:
+        """Store an embedding and evict least recently used entries."""
+        if not self.enabled:
+            return
+
+        key = (model_name, self.normalize(query))
+        size = self._estimate_size(key, embedding)
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (embedding, time.monotonic(), size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes and self._bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. after the embedding model changed)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return bool(self.ttl_seconds) and (
+            time.monotonic() - stored_at > self.ttl_seconds
+        )
+
+    def _remove(self, key: CacheKey) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and current cache size."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0,
+                "evictions": self._evictions,
+            }
@@ -0,0 +1,214 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence
+
+EncodeFn = Callable[[Sequence[str]], List[List[float]]]
+
+
+class QueryEncoder:
+    """Coalesces concurrent query encodings into batched encode calls.
+
+    Callers block in ``encode`` while a worker thread collects queries for up
+    to ``max_wait_ms`` (or until ``max_batch_size`` queries are waiting),
+    encodes them in one call and hands each caller its own embedding.
+
+    ``encode_async`` coalesces on the event loop instead, so the number of
+    queries waiting for a batch is not capped by a thread pool. A query that
+    arrives while no encode runs is encoded at once; queries arriving during
+    an encode are batched and sent when it finishes, when ``max_batch_size``
+    of them wait, or after ``max_wait_ms``, whichever comes first.
+    """
+
+    def __init__(self, encode_fn: EncodeFn, max_batch_size: int, max_wait_ms: float):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._closed = False
+
+        # encode_async state, only touched on the event loop thread
+        self._pending: List[tuple] = []
+        self._pending_flush: Optional[asyncio.TimerHandle] = None
+        self._in_flight = 0
+
+        self._batches = 0
+        self._queries = 0
+        self._max_batch_size_seen = 0
+        self._total_queue_delay = 0.0
+        self._max_queue_delay = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch_size > 1 and self.max_wait > 0
+
+    def encode(self, query: str) -> List[float]:
+        """Encode a single query, sharing the model call with concurrent callers."""
+        if not self.enabled:
+            embedding = self.encode_fn([query])[0]
+            self._record_batch([0.0])
+            return embedding
+
+        if self._closed:
+            raise RuntimeError("Query encoder is closed")
+
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((query, future, time.monotonic()))
+        return future.result()
+
+    def encode_batch(self, queries: List[str]) -> List[List[float]]:
+        """Encode a batch the caller already assembled, e.g. a batch search.
+
+        It is encoded in one call on the calling thread, without waiting in
+        the queue, and counted as one batch in the stats.
+        """
+        if not queries:
+            return []
+        if self._closed:
+            raise RuntimeError("Query encoder is closed")
+
+        embeddings = self.encode_fn(queries)
+        self._record_batch([0.0] * len(queries))
+        return embeddings
+
+    async def encode_async(self, query: str) -> List[float]:
+        """Encode a single query without holding a thread while it waits."""
+        if self._closed:
+            raise RuntimeError("Query encoder is closed")
+        if not self.enabled:
+            embedding = (await asyncio.to_thread(self.encode_fn, [query]))[0]
+            self._record_batch([0.0])
+            return embedding
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, future, time.monotonic()))
+        if self._in_flight == 0 or len(self._pending) >= self.max_batch_size:
+            self._flush_pending()
+        elif self._pending_flush is None:
+            self._pending_flush = loop.call_later(self.max_wait, self._flush_pending)
+        return await future
+
+    def _flush_pending(self) -> None:
+        if self._pending_flush is not None:
+            self._pending_flush.cancel()
+            self._pending_flush = None
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = []
+        self._in_flight += 1
+        asyncio.get_running_loop().create_task(self._encode_batch_async(batch))
+
+    async def _encode_batch_async(self, batch: List[tuple]) -> None:
+        started_at = time.monotonic()
+        self._record_batch([started_at - enqueued_at for _, _, enqueued_at in batch])
+        try:
+            embeddings = await asyncio.to_thread(
+                self.encode_fn, [query for query, _, _ in batch]
+            )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        else:
+            for (_, future, _), embedding in zip(batch, embeddings):
+                if not future.done():  # The caller may have timed out
+                    future.set_result(embedding)
+        finally:
+            self._in_flight -= 1
+            # Queries that gathered during this encode go out together now
+            self._flush_pending()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="query-encoder", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._encode_batch(batch)
+                    return
+                batch.append(item)
+
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[tuple]) -> None:
+        started_at = time.monotonic()
+        self._record_batch([started_at - enqueued_at for _, _, enqueued_at in batch])
+
+        try:
+            embeddings = self.encode_fn([query for query, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future, _), embedding in zip(batch, embeddings):
+            future.set_result(embedding)
+
+    def _record_batch(self, queue_delays: List[float]) -> None:
+        with self._stats_lock:
+            self._batches += 1
+            self._queries += len(queue_delays)
+            self._max_batch_size_seen = max(
+                self._max_batch_size_seen, len(queue_delays)
+            )
+            self._total_queue_delay += sum(queue_delays)
+            self._max_queue_delay = max(self._max_queue_delay, *queue_delays)
+
+    def get_stats(self) -> Dict:
+        """Get batch size and queueing delay metrics."""
+        with self._stats_lock:
+            return {
+                "enabled": self.enabled,
+                "batches": self._batches,
+                "queries": self._queries,
+                "avg_batch_size": (
+                    round(self._queries / self._batches, 2) if self._batches else 0
+                ),
+                "max_batch_size": self._max_batch_size_seen,
+                "avg_queue_delay_ms": (
+                    round(self._total_queue_delay / self._queries * 1000, 3)
+                    if self._queries
+                    else 0
+                ),
+                "max_queue_delay_ms": round(self._max_queue_delay * 1000, 3),
+            }
+
+    def close(self) -> None:
+        """Stop the worker thread after it drains pending queries."""
+        self._closed = True
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout=5)
+            self._worker = None
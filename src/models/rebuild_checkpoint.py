@@ -0,0 +1,63 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+
+class RebuildCheckpoint:
+    """Append-only record of the files a full rebuild has already written.
+
+    The first line holds the commit being indexed; every later line is one
+    file path whose chunks are safely in the collection. Appending keeps each
+    checkpoint write O(batch) even for vaults with tens of thousands of notes,
+    and a torn last line after a crash is simply ignored on load.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def start(self, commit_sha: Optional[str]) -> None:
+        """Begin a fresh checkpoint for a rebuild of the given commit."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"commit": commit_sha}) + "\n")
+            tmp_path.replace(self.path)
+
+    def load(self) -> Optional[Dict]:
+        """Return the checkpointed commit and completed files, if any."""
+        with self._lock:
+            try:
+                lines = self.path.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                return None
+
+        if not lines:
+            return None
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError:
+            return None
+
+        completed: Set[str] = set()
+        for line in lines[1:]:
+            try:
+                completed.add(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # Partially written line from an interrupted run
+        return {"commit": header.get("commit"), "completed_files": completed}
+
+    def mark_completed(self, file_paths: Iterable[str]) -> None:
+        """Record files whose chunks have been written to the collection."""
+        lines = "".join(json.dumps(file_path) + "\n" for file_path in file_paths)
+        if not lines:
+            return
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def clear(self) -> None:
+        """Forget the checkpoint once a rebuild has fully completed."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
@@ -0,0 +1,163 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sentence_transformers import CrossEncoder
+
+from src.schemas import SearchResult
+
+from .query_cache import QueryEmbeddingCache
+
+CacheKey = Tuple[str, str]
+
+
+class CrossEncoderReranker:
+    """Rescores search candidates with a cross-encoder within a time budget.
+
+    The model is loaded on a background thread the first time a rerank is
+    requested, so enabling reranking never delays startup. Candidates are
+    scored in batches; (query, chunk text) scores are cached in a bounded
+    LRU, so repeated queries and overlapping candidate pools skip the model.
+    When the model is not ready yet or the budget runs out between batches,
+    ``rerank`` returns None and the caller keeps the vector order.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 32,
+        budget_ms: float = 300,
+        cache_max_entries: int = 10000,
+    ):
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.budget = max(0.0, budget_ms) / 1000  # 0 means no budget
+        self.cache_max_entries = cache_max_entries
+
+        self.model: Optional[CrossEncoder] = None
+        self._load_lock = threading.Lock()
+        self._loader: Optional[threading.Thread] = None
+
+        self._scores: "OrderedDict[CacheKey, float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._reranked = 0
+        self._degraded = 0
+        self._cache_hits = 0
+        self._scored_pairs = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the model is loaded; starts loading it if not."""
+        if self.model is not None:
+            return True
+        with self._load_lock:
+            if self._loader is None:
+                self._loader = threading.Thread(
+                    target=self._load_model, name="reranker-loader", daemon=True
+                )
+                self._loader.start()
+        return False
+
+    def _load_model(self) -> None:
+        try:
+            self.model = CrossEncoder(self.model_name)
+            print(f"Reranker model {self.model_name} loaded")
+        except Exception as e:
+            print(f"Failed to load reranker model {self.model_name}: {e}")
+            with self._load_lock:
+                self._loader = None  # Retry on the next rerank request
+
+    @staticmethod
+    def _cache_key(query: str, content: str) -> CacheKey:
+        return (
+            QueryEmbeddingCache.normalize(query),
+            hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        )
+
+    def rerank(
+        self, query: str, candidates: List[SearchResult]
+    ) -> Optional[List[SearchResult]]:
+        """Return the candidates ordered by cross-encoder score, best first.
+
+        Returns None (and counts a degraded request) when the model is not
+        loaded yet or the time budget ran out before every pair was scored.
+        """
+        started = time.monotonic()
+        if not self.ready:
+            self._count(degraded=True)
+            return None
+
+        keys = [self._cache_key(query, result.content) for result in candidates]
+        scores = self._get_cached(keys)
+        missing = [i for i, key in enumerate(keys) if key not in scores]
+
+        for start in range(0, len(missing), self.batch_size):
+            if self.budget and time.monotonic() - started > self.budget:
+                # Scores computed so far are cached, so a retry gets further
+                self._count(degraded=True)
+                return None
+
+            batch = missing[start : start + self.batch_size]
+            try:
+                batch_scores = self.model.predict(
+                    [(query, candidates[i].content) for i in batch],
+                    batch_size=self.batch_size,
+                    show_progress_bar=False,
+                )
+            except Exception as e:
+                print(f"Reranking failed, keeping vector order: {e}")
+                self._count(degraded=True)
+                return None
+            new_scores = {
+                keys[i]: float(score) for i, score in zip(batch, batch_scores)
+            }
+            self._put_cached(new_scores)
+            scores.update(new_scores)
+
+        for result, key in zip(candidates, keys):
+            result.rerank_score = scores[key]
+        self._count(degraded=False)
+        return sorted(candidates, key=lambda result: result.rerank_score, reverse=True)
+
+    def _get_cached(self, keys: List[CacheKey]) -> Dict[CacheKey, float]:
+        found = {}
+        with self._cache_lock:
+            for key in keys:
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                    found[key] = score
+            self._cache_hits += len(found)
+        return found
+
+    def _put_cached(self, scores: Dict[CacheKey, float]) -> None:
+        with self._cache_lock:
+            self._scored_pairs += len(scores)
+            if self.cache_max_entries <= 0:
+                return
+            self._scores.update(scores)
+            for key in scores:
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.cache_max_entries:
+                self._scores.popitem(last=False)
+
+    def _count(self, degraded: bool) -> None:
+        with self._cache_lock:
+            if degraded:
+                self._degraded += 1
+            else:
+                self._reranked += 1
+
+    def get_stats(self) -> Dict:
+        with self._cache_lock:
+            return {
+                "model_name": self.model_name,
+                "loaded": self.model is not None,
+                "reranked": self._reranked,
+                "degraded": self._degraded,
+                "scored_pairs": self._scored_pairs,
+                "cache_hits": self._cache_hits,
+                "cache_entries": len(self._scores),
+            }
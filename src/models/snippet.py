@@ -0,0 +1,66 @@
+import re
+from typing import Set
+
+from .lexical_index import tokenize
+
+# Sentence boundaries: end punctuation followed by space, or line breaks
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?。！？])\s*|\n+")
+
+
+def make_snippet(query: str, content: str, max_chars: int = 300) -> str:
+    """Cut content down to the window around its best-matching sentence.
+
+    The sentence sharing the most terms with the query is grown with its
+    neighbours while the window fits in max_chars, and query terms in the
+    window are highlighted in bold.
+    """
+    terms = {term for term in tokenize(query) if len(term) > 1}
+    sentences = [s.strip() for s in _SENTENCE_BREAK.split(content) if s.strip()]
+    if not sentences:
+        return ""
+
+    overlaps = [len(terms & set(tokenize(sentence))) for sentence in sentences]
+    start = end = overlaps.index(max(overlaps))
+    window = sentences[start]
+    while True:
+        grown = False
+        if end + 1 < len(sentences):
+            candidate = f"{window} {sentences[end + 1]}"
+            if len(candidate) <= max_chars:
+                window, end, grown = candidate, end + 1, True
+        if start > 0:
+            candidate = f"{sentences[start - 1]} {window}"
+            if len(candidate) <= max_chars:
+                window, start, grown = candidate, start - 1, True
+        if not grown:
+            break
+
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end + 1 < len(sentences) else ""
+    if len(window) > max_chars:
+        # A single long sentence: keep the part around its first match
+        match = _term_pattern(terms).search(window) if terms else None
+        offset = max(0, (match.start() if match else 0) - max_chars // 3)
+        offset = min(offset, len(window) - max_chars)
+        prefix = "…" if offset > 0 or start > 0 else ""
+        suffix = "…"
+        window = window[offset : offset + max_chars]
+
+    return prefix + highlight(window, terms) + suffix
+
+
+def highlight(text: str, terms: Set[str]) -> str:
+    """Wrap occurrences of the terms in Markdown bold."""
+    if not terms:
+        return text
+    return _term_pattern(terms).sub(lambda match: f"**{match.group(0)}**", text)
+
+
+def _term_pattern(terms: Set[str]) -> "re.Pattern[str]":
+    # Longest first, so "get_user_id" wins over its part "user"
+    alternatives = []
+    for term in sorted(terms, key=len, reverse=True):
+        escaped = re.escape(term)
+        # Word boundaries do not apply to scripts indexed as bigrams
+        alternatives.append(escaped if not term.isascii() else rf"\b{escaped}\b")
+    return re.compile("|".join(alternatives), re.IGNORECASE)
@@ -1,15 +1,51 @@
+import asyncio
 import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 import chromadb
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 from src.config.settings import Settings
-from src.schemas import FileChange, FileStatus, SearchResult
+from src.processing import ObsidianDocument
+from src.schemas import FileChange, FileStatus, SearchRequest, SearchResult
 
-from .obsidian_processor import ObsidianDocument
+from .chunk_embedding_cache import ChunkEmbeddingCache
+from .lexical_index import LexicalIndex
+from .query_cache import QueryEmbeddingCache
+from .query_encoder import QueryEncoder
+from .reranker import CrossEncoderReranker
+from .snippet import make_snippet
+
+
+@dataclass
+class EmbeddedBatch:
+    """Chunk records of several documents, ready to be written together."""
+
+    file_paths: List[str]
+    ids: List[str] = field(default_factory=list)
+    documents: List[str] = field(default_factory=list)
+    metadatas: List[Dict] = field(default_factory=list)
+    embeddings: List[List[float]] = field(default_factory=list)
+    cached_chunks: int = 0  # Embeddings reused from the chunk embedding cache
+
+
+# Metadata key marking a chunk's tag, e.g. "tag:project" = True
+TAG_KEY_PREFIX = "tag:"
+# Candidates fetched per requested result when tags must be filtered post-query
+TAG_FILTER_OVERFETCH = 4
+# Candidates taken from each ranking per requested result in hybrid search
+HYBRID_CANDIDATES = 4
+# Candidates fetched per requested result when diversifying results
+DIVERSITY_CANDIDATES = 4
 
 
 class VectorStore:
@@ -20,6 +56,33 @@ class VectorStore:
         self.model_name = settings.EMBEDDING_MODEL_NAME
         self.persist_directory = Path(settings.VECTOR_DB_PATH)
 
+        # Bumped on every index write so result caches can detect staleness.
+        # The marker file carries the change to other processes sharing the DB.
+        self._index_generation = 0
+        self._generation_lock = threading.Lock()
+        self.generation_file = self.persist_directory / "index_generation"
+
+        # Commit of the vault that the index reflects, for exact incremental syncs
+        self.indexed_commit_file = self.persist_directory / "indexed_commit"
+        # Files a sync could not index at that commit, retried by the next sync
+        self.failed_files_file = self.persist_directory / "sync_failed_files.json"
+
+        # Searches serve the collection named in the alias file; full rebuilds
+        # fill a shadow collection and then repoint the alias in one step
+        self.alias_file = self.persist_directory / "active_collection"
+        # Serializes switching the serving collection between search threads
+        self._collection_lock = threading.Lock()
+        self._pending_collection: Optional[str] = None
+        self._query_model_loader: Optional[threading.Thread] = None
+        self.build_file = self.persist_directory / "build_collection"
+        self.build_collection = None
+
+        # Dedicated, size-bounded pool so searches never block the event loop
+        self.search_executor = ThreadPoolExecutor(
+            max_workers=settings.SEARCH_MAX_WORKERS,
+            thread_name_prefix="vector-search",
+        )
+
         # Initialize ChromaDB
         self.client = chromadb.PersistentClient(
             path=str(self.persist_directory),
@@ -29,91 +92,634 @@ class VectorStore:
         # Initialize embedding model
         self.embedding_model = SentenceTransformer(self.model_name)
 
+        # Queries are encoded with the model of the serving collection, which
+        # lags behind embedding_model while a rebuild for a new model runs
+        # (see _sync_query_model)
+        self.query_model = self.embedding_model
+        self.query_model_name = self.model_name
+
+        # Coalesce concurrent search queries into batched encode calls
+        self.query_encoder = QueryEncoder(
+            encode_fn=self._encode_queries,
+            max_batch_size=settings.QUERY_BATCH_MAX_SIZE,
+            max_wait_ms=settings.QUERY_BATCH_WAIT_MS,
+        )
+
+        # Persistent cache so unchanged chunk texts are never re-embedded
+        self.chunk_cache = (
+            ChunkEmbeddingCache(self.persist_directory / "embedding_cache.sqlite3")
+            if settings.EMBEDDING_CACHE_ENABLED
+            else None
+        )
+
+        # Reuse embeddings of repeated queries
+        self.query_cache = QueryEmbeddingCache(
+            max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+            max_bytes=settings.QUERY_CACHE_MAX_BYTES,
+            ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS,
+        )
+
         # Get or create collection
+        self.active_collection_name = self._read_alias()
         self.collection = self.client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={
-                "description": "Obsidian vault embeddings",
-                "model_name": self.model_name,
-            },
+            name=self.active_collection_name,
+            metadata=self._collection_metadata(),
+        )
+
+        self._sync_query_model()
+
+        # BM25 index kept next to each collection for hybrid search
+        self.lexical_enabled = settings.LEXICAL_INDEX_ENABLED
+        self.rrf_k = settings.HYBRID_RRF_K
+        self.lexical_index = self._open_lexical_index(
+            self.active_collection_name,
+            created=self.collection.count() == 0,
+        )
+        self.build_lexical_index: Optional[LexicalIndex] = None
+
+        # Optional cross-encoder pass over the top candidates (rerank=True)
+        self.rerank_candidates = settings.RERANK_CANDIDATES
+        self.reranker = (
+            CrossEncoderReranker(
+                settings.RERANK_MODEL_NAME,
+                batch_size=settings.RERANK_BATCH_SIZE,
+                budget_ms=settings.RERANK_BUDGET_MS,
+                cache_max_entries=settings.RERANK_CACHE_MAX_ENTRIES,
+            )
+            if settings.RERANK_MODEL_NAME
+            else None
         )
 
+        # Content length in snippet mode (snippet=True)
+        self.snippet_max_chars = settings.SNIPPET_MAX_CHARS
+
         print(f"Vector store initialized with {self.collection.count()} documents")
 
-    def add_document(self, document: ObsidianDocument, chunks: List[Dict]) -> bool:
-        """Add a document and its chunks to the vector store."""
+    def load_embedding_model(self, model_name: str) -> None:
+        """Load a new embedding model and swap it in once it is ready."""
+        embedding_model = SentenceTransformer(model_name)
+
+        # Searches already in flight keep the model reference they started with
+        self.embedding_model = embedding_model
+        self.model_name = model_name
+
+        # Keep querying and syncing with the old model until a rebuild
+        # re-embeds the index (see _write_model)
+        serving_model = (self.collection.metadata or {}).get("model_name")
+        if serving_model == model_name:
+            self._use_query_model(embedding_model, model_name)
+        print(f"Embedding model swapped to {model_name}")
+
+    def _sync_query_model(self) -> None:
+        """Encode queries with the model that embedded the serving collection.
+
+        The collection metadata names the model, so processes that did not
+        run the rebuild (e.g. API workers) follow a model change too.
+        """
+        serving_model = (self.collection.metadata or {}).get("model_name")
+        if not serving_model or serving_model == self.query_model_name:
+            return
+
+        if serving_model == self.model_name:
+            query_model = self.embedding_model
+        else:
+            query_model = SentenceTransformer(serving_model)
+        self._use_query_model(query_model, serving_model)
+        print(f"Encoding queries with {serving_model}, the serving collection's model")
+
+    def _use_query_model(self, query_model, model_name: str) -> None:
+        self.query_model = query_model
+        self.query_model_name = model_name
+        self.query_cache.clear()
+
+    @property
+    def index_generation(self) -> Tuple[int, int]:
+        """Current index generation (local counter, shared marker mtime)."""
         try:
-            # First, remove any existing chunks for this file
-            self.remove_document(document.file_path)
-
-            if not chunks:
-                print(f"No chunks to add for {document.file_path}")
-                return True
-
-            # Prepare data for ChromaDB
-            ids = []
-            documents = []
-            metadatas = []
-
-            for i, chunk in enumerate(chunks):
-                chunk_id = f"{document.file_path}#chunk_{i}"
-                ids.append(chunk_id)
-                documents.append(chunk["content"])
-
-                # Prepare metadata (ensure no None values)
-                metadata = {
-                    "file_path": document.file_path or "",
-                    "title": document.title or "",
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "word_count": document.word_count or 0,
-                    "token_count": document.token_count or 0,
-                    "tags": json.dumps(document.tags or []),
-                    "links": json.dumps(document.links or []),
-                    "created_at": (
-                        document.created_at.isoformat() if document.created_at else ""
-                    ),
-                    "modified_at": (
-                        document.modified_at.isoformat() if document.modified_at else ""
-                    ),
-                    "indexed_at": datetime.now().isoformat(),
-                }
+            shared_generation = self.generation_file.stat().st_mtime_ns
+        except OSError:
+            shared_generation = 0
+        return self._index_generation, shared_generation
+
+    def _bump_index_generation(self) -> None:
+        with self._generation_lock:
+            self._index_generation += 1
+        try:
+            self.generation_file.write_text(str(time.time_ns()))
+        except OSError:
+            pass
+
+    def get_indexed_commit(self) -> Optional[str]:
+        """Return the vault commit the index was last brought up to, if known."""
+        try:
+            return self.indexed_commit_file.read_text().strip() or None
+        except OSError:
+            return None
+
+    def set_indexed_commit(self, commit_sha: Optional[str]) -> None:
+        """Record (or with None, forget) the vault commit the index reflects."""
+        if commit_sha is None:
+            self.indexed_commit_file.unlink(missing_ok=True)
+            return
+
+        # Write-then-rename so a crash never leaves a truncated SHA behind
+        tmp_file = self.indexed_commit_file.with_suffix(".tmp")
+        tmp_file.write_text(commit_sha)
+        tmp_file.replace(self.indexed_commit_file)
+
+    def get_failed_files(self) -> List[str]:
+        """Return the files the last sync failed to index, to retry them."""
+        try:
+            return json.loads(self.failed_files_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return []
+
+    def set_failed_files(self, file_paths: List[str]) -> None:
+        """Record the files a sync failed to index (empty clears the list)."""
+        if not file_paths:
+            self.failed_files_file.unlink(missing_ok=True)
+            return
+
+        tmp_file = self.failed_files_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(sorted(set(file_paths))))
+        tmp_file.replace(self.failed_files_file)
+
+    def _encode_queries(self, queries: List[str]) -> List[List[float]]:
+        """Encode a batch of search queries with the current embedding model."""
+        embeddings = self.query_model.encode(queries, show_progress_bar=False)
+        return embeddings.tolist()
+
+    def _write_model(self) -> Tuple[Any, str]:
+        """Model (and its name) that chunks for write_collection are embedded with.
+
+        A rebuild's shadow is filled with the current embedding model. The
+        serving collection keeps the model it was built with, like queries
+        do, so syncs after a model reload don't mix two models in one index.
+        """
+        if self.build_collection is not None:
+            return self.embedding_model, self.model_name
+        return self.query_model, self.query_model_name
+
+    def encode_documents(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """Encode chunk texts, reusing cached embeddings of unchanged texts.
+
+        Returns the embeddings and how many of them came from the cache.
+        """
+        model, model_name = self._write_model()
+        if self.chunk_cache is None:
+            embeddings = model.encode(texts, show_progress_bar=False)
+            return embeddings.tolist(), 0
+
+        hashes = [ChunkEmbeddingCache.content_hash(text) for text in texts]
+        embeddings = self.chunk_cache.get_many(model_name, hashes)
+
+        missing = {h: text for h, text in zip(hashes, texts) if h not in embeddings}
+        if missing:
+            encoded = model.encode(
+                list(missing.values()), show_progress_bar=False
+            ).tolist()
+            new_embeddings = dict(zip(missing.keys(), encoded))
+            self.chunk_cache.put_many(model_name, new_embeddings)
+            embeddings.update(new_embeddings)
+
+        cached_count = sum(1 for h in hashes if h not in missing)
+        return [embeddings[h] for h in hashes], cached_count
+
+    def evict_unused_embeddings(self, since: float) -> int:
+        """Evict cached chunk embeddings not used since the given timestamp."""
+        if self.chunk_cache is None:
+            return 0
+        return self.chunk_cache.evict_unused(since)
+
+    def close(self) -> None:
+        """Release the ChromaDB client and the embedding model."""
+        self.search_executor.shutdown(wait=False, cancel_futures=True)
+        self.query_encoder.close()
+        if self.chunk_cache is not None:
+            self.chunk_cache.close()
+        for lexical_index in (self.lexical_index, self.build_lexical_index):
+            if lexical_index is not None:
+                lexical_index.close()
+
+        close_client = getattr(self.client, "close", None)
+        if close_client is not None:
+            try:
+                close_client()
+            except Exception as e:
+                print(f"Failed to close vector store client: {e}")
+
+        self.embedding_model = None
+        self.query_model = None
+
+    @staticmethod
+    def _chunk_id(file_path: str, content_hash: str, occurrence: int) -> str:
+        """Stable chunk ID derived from the chunk text rather than its position."""
+        chunk_id = f"{file_path}#chunk_{content_hash[:16]}"
+        # Identical paragraphs within one note still need distinct IDs
+        return f"{chunk_id}_{occurrence}" if occurrence else chunk_id
+
+    def _collection_metadata(self) -> Dict:
+        return {
+            "description": "Obsidian vault embeddings",
+            "model_name": self.model_name,
+            # Chunks carry one "tag:<name>" key per tag (see search)
+            "tag_keys": True,
+        }
+
+    def _read_alias(self) -> str:
+        try:
+            return self.alias_file.read_text().strip() or self.collection_name
+        except OSError:
+            return self.collection_name
+
+    def _write_pointer(self, path: Path, value: str) -> None:
+        # Write-then-rename so readers never see a partial name
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(value)
+        tmp_path.replace(path)
 
-                # Add custom metadata
-                for key, value in chunk.get("metadata", {}).items():
-                    if isinstance(value, (str, int, float, bool)):
-                        metadata[f"custom_{key}"] = value
-                    elif value is not None:
-                        metadata[f"custom_{key}"] = str(value)
+    def _refresh_collection(self) -> None:
+        """Follow the alias if another process swapped in a rebuilt collection.
 
-                metadatas.append(metadata)
+        Every search thread calls this, so the switch happens once, under a
+        lock. A collection built with a model this process has not loaded
+        is switched to from a background thread once the model is ready;
+        searches keep the previous collection and model until then.
+        """
+        name = self._read_alias()
+        if name == self.active_collection_name:
+            return
 
-            # Generate embeddings
-            embeddings = self.embedding_model.encode(documents, show_progress_bar=False)
+        with self._collection_lock:
+            if name in (self.active_collection_name, self._pending_collection):
+                return
+            collection = self.client.get_collection(name=name)
+            serving_model = (collection.metadata or {}).get("model_name")
+            if serving_model in (None, self.query_model_name, self.model_name):
+                self._switch_collection(name, collection)
+                return
 
-            # Add to collection
-            self.collection.add(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
-                embeddings=embeddings.tolist(),
+            self._pending_collection = name
+            self._query_model_loader = threading.Thread(
+                target=self._switch_after_model_load,
+                args=(name, collection, serving_model),
+                name="query-model-loader",
+                daemon=True,
             )
+            self._query_model_loader.start()
 
-            print(f"Added {len(chunks)} chunks for {document.file_path}")
+    def _switch_after_model_load(self, name: str, collection, model_name: str) -> None:
+        try:
+            query_model = SentenceTransformer(model_name)
+        except Exception as e:
+            print(f"Failed to load query model {model_name}: {e}")
+            with self._collection_lock:
+                self._pending_collection = None
+            return
+
+        with self._collection_lock:
+            self._pending_collection = None
+            if self._read_alias() != name:
+                return  # Superseded by another swap while loading
+            self._use_query_model(query_model, model_name)
+            self._switch_collection(name, collection)
+        print(f"Encoding queries with {model_name}, the serving collection's model")
+
+    def _switch_collection(self, name: str, collection) -> None:
+        """Serve the given collection; the caller holds _collection_lock."""
+        self.collection = collection
+        self.active_collection_name = name
+        # In-flight searches may still use the previous BM25 index, so it is
+        # not closed here; its connection closes with the last reference
+        self.lexical_index = self._open_lexical_index(name)
+        self._sync_query_model()
+
+    def _lexical_index_path(self, collection_name: str) -> Path:
+        return self.persist_directory / f"lexical_{collection_name}.sqlite3"
+
+    def _open_lexical_index(
+        self, collection_name: str, created: bool = False
+    ) -> Optional[LexicalIndex]:
+        """Open a collection's BM25 index; created marks it as covering an empty one.
+
+        An index opened for a collection that already held chunks stays
+        incomplete (and hybrid search falls back to vector search) until a
+        rebuild has indexed every chunk.
+        """
+        if not self.lexical_enabled:
+            return None
+        lexical_index = LexicalIndex(self._lexical_index_path(collection_name))
+        if created:
+            lexical_index.mark_complete()
+        return lexical_index
+
+    @property
+    def write_lexical_index(self) -> Optional[LexicalIndex]:
+        """BM25 index that index writes go to, matching write_collection."""
+        if self.build_collection is not None:
+            return self.build_lexical_index
+        return self.lexical_index
+
+    @property
+    def write_collection(self):
+        """Collection that index writes go to: the shadow during a rebuild."""
+        if self.build_collection is not None:
+            return self.build_collection
+        return self.collection
+
+    def begin_rebuild(self) -> None:
+        """Create an empty shadow collection for a full rebuild to fill."""
+        self.abort_rebuild()
+
+        name = f"{self.collection_name}_{time.time_ns()}"
+        self.build_collection = self.client.create_collection(
+            name=name,
+            metadata=self._collection_metadata(),
+        )
+        self.build_lexical_index = self._open_lexical_index(name, created=True)
+        self._write_pointer(self.build_file, name)
+        print(f"Building index into shadow collection {name}")
+
+    def resume_rebuild(self) -> bool:
+        """Re-attach the shadow collection of an interrupted rebuild."""
+        try:
+            name = self.build_file.read_text().strip()
+            collection = self.client.get_collection(name=name)
+        except Exception:
+            return False
+
+        if (collection.metadata or {}).get("model_name") != self.model_name:
+            return False
+
+        self.build_collection = collection
+        self.build_lexical_index = self._open_lexical_index(name)
+        return True
+
+    def detach_rebuild(self) -> None:
+        """Send index writes back to the serving collection.
+
+        The shadow collection and build_file are kept, so an interrupted
+        rebuild can still be resumed.
+        """
+        if self.build_lexical_index is not None:
+            self.build_lexical_index.close()
+        self.build_collection = None
+        self.build_lexical_index = None
+
+    def commit_rebuild(self) -> None:
+        """Point the serving alias at the rebuilt collection and drop the old one."""
+        if self.build_collection is None:
+            raise RuntimeError("No rebuild in progress")
+        # A shadow filled by two models must never be served as one
+        build_model = (self.build_collection.metadata or {}).get("model_name")
+        if build_model != self.model_name:
+            raise RuntimeError(
+                f"Shadow collection was built with {build_model}, "
+                f"not the current model {self.model_name}"
+            )
+
+        with self._collection_lock:
+            old_name = self.active_collection_name
+            new_collection = self.build_collection
+            self._write_pointer(self.alias_file, new_collection.name)
+
+            self.collection = new_collection
+            self.active_collection_name = new_collection.name
+            self.build_collection = None
+            if self.lexical_index is not None:
+                self.lexical_index.destroy()
+            self.lexical_index = self.build_lexical_index
+            self.build_lexical_index = None
+            self.build_file.unlink(missing_ok=True)
+            self._sync_query_model()
+        self.set_indexed_commit(None)
+        self.set_failed_files([])
+        self._bump_index_generation()
+        print(f"Serving rebuilt collection {new_collection.name}")
+
+        try:
+            self.client.delete_collection(name=old_name)
+        except Exception as e:
+            print(f"Failed to delete previous collection {old_name}: {e}")
+
+    def abort_rebuild(self) -> None:
+        """Drop the shadow collection; the serving collection is untouched."""
+        if self.build_collection is not None:
+            name = self.build_collection.name
+        else:
+            try:
+                name = self.build_file.read_text().strip()
+            except OSError:
+                name = ""
+
+        if name and name != self.active_collection_name:
+            try:
+                self.client.delete_collection(name=name)
+            except Exception as e:
+                print(f"Failed to delete shadow collection {name}: {e}")
+            if self.build_lexical_index is None:
+                self.build_lexical_index = self._open_lexical_index(name)
+            if self.build_lexical_index is not None:
+                self.build_lexical_index.destroy()
+
+        self.build_collection = None
+        self.build_lexical_index = None
+        self.build_file.unlink(missing_ok=True)
+
+    def _build_chunk_records(
+        self, document: ObsidianDocument, chunks: List[Dict]
+    ) -> Tuple[List[str], List[str], List[Dict]]:
+        """Prepare ids, texts and metadata of a document's chunks for ChromaDB."""
+        ids = []
+        documents = []
+        metadatas = []
+        occurrences: Dict[str, int] = {}
+
+        for i, chunk in enumerate(chunks):
+            content_hash = ChunkEmbeddingCache.content_hash(chunk["content"])
+            occurrence = occurrences.get(content_hash, 0)
+            occurrences[content_hash] = occurrence + 1
+
+            ids.append(self._chunk_id(document.file_path, content_hash, occurrence))
+            documents.append(chunk["content"])
+
+            # Prepare metadata (ensure no None values)
+            metadata = {
+                "file_path": document.file_path or "",
+                "title": document.title or "",
+                "chunk_index": i,
+                "total_chunks": len(chunks),
+                "content_hash": content_hash,
+                "word_count": document.word_count or 0,
+                "token_count": document.token_count or 0,
+                "tags": json.dumps(document.tags or []),
+                "links": json.dumps(document.links or []),
+                "created_at": (
+                    document.created_at.isoformat() if document.created_at else ""
+                ),
+                "modified_at": (
+                    document.modified_at.isoformat() if document.modified_at else ""
+                ),
+                "indexed_at": datetime.now().isoformat(),
+            }
+
+            # One boolean key per tag so tag filters run inside the query
+            for tag in document.tags or []:
+                if tag:
+                    metadata[f"{TAG_KEY_PREFIX}{tag}"] = True
+
+            # Add custom metadata
+            for key, value in chunk.get("metadata", {}).items():
+                if isinstance(value, (str, int, float, bool)):
+                    metadata[f"custom_{key}"] = value
+                elif value is not None:
+                    metadata[f"custom_{key}"] = str(value)
+
+            metadatas.append(metadata)
+
+        return ids, documents, metadatas
+
+    @staticmethod
+    def _metadata_changed(stored: Dict, new: Dict) -> bool:
+        """Whether a kept chunk's metadata differs (ignoring the index time)."""
+        ignored = {"indexed_at"}
+        return {k: v for k, v in stored.items() if k not in ignored} != {
+            k: v for k, v in new.items() if k not in ignored
+        }
+
+    def add_document(self, document: ObsidianDocument, chunks: List[Dict]) -> bool:
+        """Add or update a document, writing only the chunks that changed.
+
+        Chunk IDs are derived from chunk content, so an edit to one paragraph
+        deletes and embeds only that paragraph's chunk. Kept chunks whose
+        position or note metadata changed get a metadata-only update.
+        """
+        try:
+            collection = self.write_collection
+            existing = collection.get(
+                where={"file_path": document.file_path}, include=["metadatas"]
+            )
+            stored = dict(zip(existing["ids"], existing["metadatas"]))
+
+            ids, documents, metadatas = self._build_chunk_records(document, chunks)
+            new_ids = set(ids)
+
+            stale_ids = [chunk_id for chunk_id in stored if chunk_id not in new_ids]
+            added = [i for i, chunk_id in enumerate(ids) if chunk_id not in stored]
+            changed = [
+                i
+                for i, chunk_id in enumerate(ids)
+                if chunk_id in stored
+                and self._metadata_changed(stored[chunk_id], metadatas[i])
+            ]
+
+            lexical_index = self.write_lexical_index
+            if stale_ids:
+                collection.delete(ids=stale_ids)
+                if lexical_index is not None:
+                    lexical_index.remove_chunks(stale_ids)
+
+            if added:
+                # Generate embeddings for new chunk texts only
+                embeddings, _ = self.encode_documents([documents[i] for i in added])
+                collection.add(
+                    ids=[ids[i] for i in added],
+                    documents=[documents[i] for i in added],
+                    metadatas=[metadatas[i] for i in added],
+                    embeddings=embeddings,
+                )
+                if lexical_index is not None:
+                    lexical_index.add_chunks(
+                        [ids[i] for i in added],
+                        [document.file_path] * len(added),
+                        [documents[i] for i in added],
+                    )
+
+            if changed:
+                # Updates merge into stored metadata; None drops keys such as
+                # the tag keys of tags removed from the note
+                collection.update(
+                    ids=[ids[i] for i in changed],
+                    metadatas=[
+                        {
+                            **{key: None for key in stored[ids[i]]},
+                            **metadatas[i],
+                        }
+                        for i in changed
+                    ],
+                )
+
+            if stale_ids or added or changed:
+                self._bump_index_generation()
+
+            print(
+                f"Updated {document.file_path}: {len(added)} added, "
+                f"{len(stale_ids)} removed, {len(changed)} updated, "
+                f"{len(ids) - len(added) - len(changed)} unchanged chunks"
+            )
             return True
 
         except Exception as e:
             print(f"Failed to add document {document.file_path}: {e}")
             return False
 
+    def embed_documents(
+        self, items: List[Tuple[ObsidianDocument, List[Dict]]]
+    ) -> EmbeddedBatch:
+        """Build chunk records for many documents and encode them in one call."""
+        batch = EmbeddedBatch(file_paths=[document.file_path for document, _ in items])
+        for document, chunks in items:
+            ids, documents, metadatas = self._build_chunk_records(document, chunks)
+            batch.ids.extend(ids)
+            batch.documents.extend(documents)
+            batch.metadatas.extend(metadatas)
+
+        if batch.documents:
+            batch.embeddings, batch.cached_chunks = self.encode_documents(
+                batch.documents
+            )
+
+        return batch
+
+    def write_documents(self, batch: EmbeddedBatch) -> None:
+        """Replace the stored chunks of a batch's files with one bulk upsert."""
+        collection = self.write_collection
+
+        # Drop stale chunks (e.g. when a note got shorter) in one call
+        collection.delete(where={"file_path": {"$in": batch.file_paths}})
+
+        if batch.ids:
+            collection.upsert(
+                ids=batch.ids,
+                documents=batch.documents,
+                metadatas=batch.metadatas,
+                embeddings=batch.embeddings,
+            )
+
+        lexical_index = self.write_lexical_index
+        if lexical_index is not None:
+            lexical_index.remove_files(batch.file_paths)
+            lexical_index.add_chunks(
+                batch.ids,
+                [metadata["file_path"] for metadata in batch.metadatas],
+                batch.documents,
+            )
+        self._bump_index_generation()
+
+        print(f"Added {len(batch.ids)} chunks for {len(batch.file_paths)} documents")
+
     def remove_document(self, file_path: str) -> bool:
         """Remove all chunks for a specific file."""
         try:
             # Query for all chunks of this file
-            results = self.collection.get(where={"file_path": file_path})
+            collection = self.write_collection
+            results = collection.get(where={"file_path": file_path})
 
             if results["ids"]:
-                self.collection.delete(ids=results["ids"])
+                collection.delete(ids=results["ids"])
+                if self.write_lexical_index is not None:
+                    self.write_lexical_index.remove_chunks(results["ids"])
+                self._bump_index_generation()
                 print(f"Removed {len(results['ids'])} chunks for {file_path}")
 
             return True
@@ -128,65 +734,684 @@ class VectorStore:
         n_results: int = 10,
         file_filter: Optional[str] = None,
         tag_filter: Optional[List[str]] = None,
+        mode: str = "vector",
+        rerank: bool = False,
+        mmr_lambda: Optional[float] = None,
+        max_chunks_per_file: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        snippet: bool = False,
+        query_embedding: Optional[List[float]] = None,
+        query_model_name: Optional[str] = None,
     ) -> List[SearchResult]:
-        """Search for similar documents."""
+        """Search for similar documents.
+
+        mode "hybrid" fuses the vector ranking with a BM25 ranking of the
+        query's terms; it behaves like "vector" while the collection's
+        lexical index is unavailable or incomplete. With rerank, the top
+        candidates are rescored by the cross-encoder; results keep the
+        first-stage order (and no rerank_score) if it is not available
+        within its time budget. mmr_lambda and max_chunks_per_file
+        diversify an over-fetched candidate set (see _diversify).
+
+        fields limits the result fields that are filled in: chunk text is
+        not fetched from Chroma unless "content" is requested, and tags and
+        links are only decoded when requested. With snippet, content is cut
+        to a highlighted window around the best-matching sentence.
+
+        query_embedding, encoded by query_model_name, skips encoding the
+        query (see search_async).
+        """
         try:
-            # Build where clause for filtering
-            where_clause = {}
+            self._refresh_collection()
+
+            # Generate query embedding (or reuse a cached one), also when
+            # the given one predates a switch of the query model
+            model_name = self.query_model_name
+            if query_embedding is None or query_model_name != model_name:
+                query_embedding = self.query_cache.get(model_name, query)
+            if query_embedding is None:
+                query_embedding = self.query_encoder.encode(query)
+                self.query_cache.put(model_name, query, query_embedding)
+
+            return self._run_search(
+                query,
+                query_embedding,
+                n_results,
+                file_filter,
+                tag_filter,
+                mode,
+                rerank,
+                mmr_lambda,
+                max_chunks_per_file,
+                fields,
+                snippet,
+            )
+
+        except Exception as e:
+            print(f"Search failed: {e}")
+            return []
+
+    def find_similar(
+        self,
+        file_path: Optional[str] = None,
+        chunk_id: Optional[str] = None,
+        n_results: int = 10,
+        file_filter: Optional[str] = None,
+        tag_filter: Optional[List[str]] = None,
+        max_chunks_per_file: Optional[int] = None,
+    ) -> Optional[List[SearchResult]]:
+        """Find chunks similar to an indexed note or chunk without encoding text.
 
-            if file_filter:
-                where_clause["file_path"] = {"$regex": file_filter}
+        The stored embedding of the chunk, or the mean of a note's chunk
+        embeddings, is used as the query; chunks of the source note are
+        excluded. Returns None when the source is not in the index.
+        """
+        self._refresh_collection()
+        if chunk_id is not None:
+            source = self.collection.get(
+                ids=[chunk_id], include=["embeddings", "metadatas"]
+            )
+        else:
+            source = self.collection.get(
+                where={"file_path": file_path}, include=["embeddings", "metadatas"]
+            )
+        if not source["ids"]:
+            return None
 
-            # Note: ChromaDB doesn't support complex JSON array queries easily
-            # For tag filtering, we'd need to implement it post-query
+        source_path = source["metadatas"][0]["file_path"]
+        query_embedding = (
+            np.asarray(source["embeddings"], dtype=np.float32).mean(axis=0).tolist()
+        )
 
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(
-                [query], show_progress_bar=False
+        pool_size = n_results
+        if max_chunks_per_file is not None:
+            pool_size = n_results * DIVERSITY_CANDIDATES
+        results = self._vector_search(
+            query_embedding, pool_size, file_filter, tag_filter, source_path
+        )
+        if max_chunks_per_file is not None:
+            results = self._diversify(
+                query_embedding, results, n_results, None, max_chunks_per_file
             )
+        return results[:n_results]
 
-            # Search
+    async def find_similar_async(self, **kwargs) -> Optional[List[SearchResult]]:
+        """Run find_similar on the dedicated search executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.search_executor, partial(self.find_similar, **kwargs)
+        )
+
+    def search_batch(self, requests: List[SearchRequest]) -> List[List[SearchResult]]:
+        """Run several searches with one encode call and shared Chroma queries.
+
+        Plain vector searches with the same filters go to Chroma as a single
+        multi-embedding query. Searches using hybrid mode, reranking or
+        diversification run their remaining stages one by one on the
+        batch-encoded embeddings. A failing search yields an empty list.
+        """
+        results: List[List[SearchResult]] = [[] for _ in requests]
+        if not requests:
+            return results
+
+        try:
+            self._refresh_collection()
+            embeddings = self._embed_queries([request.query for request in requests])
+        except Exception as e:
+            print(f"Batch search failed: {e}")
+            return results
+
+        # Plain searches grouped by their where clause and fetched fields
+        groups: Dict[Tuple[str, bool], List[int]] = {}
+        tag_keys = (self.collection.metadata or {}).get("tag_keys")
+        for i, request in enumerate(requests):
+            plain = (
+                request.mode == "vector"
+                and not (request.rerank and self.reranker is not None)
+                and request.mmr_lambda is None
+                and request.max_chunks_per_file is None
+                and (not request.tag_filter or tag_keys)
+            )
+            if plain:
+                where = self._build_where(request.file_filter, request.tag_filter)
+                key = (
+                    json.dumps(where, sort_keys=True),
+                    self._wants("content", self._fields(request.fields)),
+                )
+                groups.setdefault(key, []).append(i)
+                continue
+
+            try:
+                results[i] = self._run_search(
+                    request.query,
+                    embeddings[i],
+                    request.n_results,
+                    request.file_filter,
+                    request.tag_filter,
+                    request.mode,
+                    request.rerank,
+                    request.mmr_lambda,
+                    request.max_chunks_per_file,
+                    request.fields,
+                    request.snippet,
+                )
+            except Exception as e:
+                print(f"Search failed: {e}")
+
+        for (where, with_content), indices in groups.items():
+            try:
+                response = self.collection.query(
+                    query_embeddings=[embeddings[i] for i in indices],
+                    n_results=max(requests[i].n_results for i in indices),
+                    where=json.loads(where),
+                    include=self._query_include(with_content),
+                )
+            except Exception as e:
+                print(f"Search failed: {e}")
+                continue
+
+            for row, i in enumerate(indices):
+                request = requests[i]
+                query_results = {
+                    key: [response[key][row]] if response.get(key) else None
+                    for key in ("ids", "documents", "metadatas", "distances")
+                }
+                results[i] = self._format_results(
+                    query_results, request.tag_filter, self._fields(request.fields)
+                )[: request.n_results]
+                if request.snippet and with_content:
+                    self._apply_snippets(request.query, results[i])
+
+        return results
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed queries with one model call for those not in the query cache."""
+        model_name = self.query_model_name
+        embeddings = {}
+        for query in queries:
+            if query not in embeddings:
+                embeddings[query] = self.query_cache.get(model_name, query)
+
+        missing = [
+            query for query, embedding in embeddings.items() if embedding is None
+        ]
+        if missing:
+            for query, embedding in zip(
+                missing, self.query_encoder.encode_batch(missing)
+            ):
+                embeddings[query] = embedding
+                self.query_cache.put(model_name, query, embedding)
+
+        return [embeddings[query] for query in queries]
+
+    def _run_search(
+        self,
+        query: str,
+        query_embedding: List[float],
+        n_results: int,
+        file_filter: Optional[str],
+        tag_filter: Optional[List[str]],
+        mode: str,
+        rerank: bool,
+        mmr_lambda: Optional[float],
+        max_chunks_per_file: Optional[int],
+        fields: Optional[List[str]] = None,
+        snippet: bool = False,
+    ) -> List[SearchResult]:
+        """Run the search stages after the query has been embedded."""
+        diversify = mmr_lambda is not None or max_chunks_per_file is not None
+        rerank = rerank and self.reranker is not None
+        pool_size = n_results * DIVERSITY_CANDIDATES if diversify else n_results
+        if rerank:
+            pool_size = max(pool_size, self.rerank_candidates)
+
+        output_fields = self._fields(fields)
+        # The cross-encoder reads the chunk text even when it is not returned
+        stage_fields = (
+            output_fields | {"content"} if rerank and output_fields else output_fields
+        )
+        # MMR compares candidates with their stored embeddings, which come
+        # back with the candidate query rather than in a second round trip
+        embeddings = {} if mmr_lambda is not None else None
+        results = self._search(
+            query,
+            query_embedding,
+            pool_size,
+            file_filter,
+            tag_filter,
+            mode,
+            stage_fields,
+            embeddings,
+        )
+        if rerank:
+            results = self.reranker.rerank(query, results) or results
+        if diversify:
+            results = self._diversify(
+                query_embedding,
+                results,
+                n_results,
+                mmr_lambda,
+                max_chunks_per_file,
+                embeddings,
+            )
+        results = results[:n_results]
+        if snippet and self._wants("content", output_fields):
+            self._apply_snippets(query, results)
+        return results
+
+    @staticmethod
+    def _fields(fields: Optional[List[str]]) -> Optional[FrozenSet[str]]:
+        """Requested result fields; None means all of them."""
+        return None if fields is None else frozenset(fields) | {"id"}
+
+    @staticmethod
+    def _wants(field_name: str, fields: Optional[FrozenSet[str]]) -> bool:
+        return fields is None or field_name in fields
+
+    @staticmethod
+    def _query_include(with_content: bool, with_embeddings: bool = False) -> List[str]:
+        include = ["metadatas", "distances"]
+        if with_content:
+            include.insert(0, "documents")
+        if with_embeddings:
+            include.append("embeddings")
+        return include
+
+    def _apply_snippets(self, query: str, results: List[SearchResult]) -> None:
+        for result in results:
+            result.content = make_snippet(query, result.content, self.snippet_max_chars)
+
+    def _search(
+        self,
+        query: str,
+        query_embedding: List[float],
+        n_results: int,
+        file_filter: Optional[str],
+        tag_filter: Optional[List[str]],
+        mode: str,
+        fields: Optional[FrozenSet[str]] = None,
+        embeddings: Optional[Dict[str, List[float]]] = None,
+    ) -> List[SearchResult]:
+        """Run the first search stage.
+
+        When an embeddings dict is given, the stored embedding of every
+        returned chunk is collected into it by chunk id.
+        """
+        lexical_index = self.lexical_index
+        if mode == "hybrid" and lexical_index and lexical_index.complete:
+            return self._hybrid_search(
+                query,
+                query_embedding,
+                n_results,
+                file_filter,
+                tag_filter,
+                lexical_index,
+                fields,
+                embeddings,
+            )
+
+        return self._vector_search(
+            query_embedding,
+            n_results,
+            file_filter,
+            tag_filter,
+            fields=fields,
+            embeddings=embeddings,
+        )
+
+    def _diversify(
+        self,
+        query_embedding: List[float],
+        results: List[SearchResult],
+        n_results: int,
+        mmr_lambda: Optional[float],
+        max_chunks_per_file: Optional[int],
+        embeddings_by_id: Optional[Dict[str, List[float]]] = None,
+    ) -> List[SearchResult]:
+        """Greedily pick n_results that are relevant but not redundant.
+
+        With mmr_lambda, each pick maximizes maximal marginal relevance:
+        mmr_lambda * relevance - (1 - mmr_lambda) * the highest cosine
+        similarity to an already picked chunk. Relevance is the query
+        similarity, or the normalized rerank score of reranked results.
+        Without it, results keep their order. max_chunks_per_file skips a
+        note's further chunks once it has that many (1 collapses by file).
+        MMR needs the candidates' stored embeddings in embeddings_by_id, as
+        collected by _search.
+        """
+        if mmr_lambda is not None:
+            embeddings_by_id = embeddings_by_id or {}
+            results = [result for result in results if result.id in embeddings_by_id]
+
+        if not results:
+            return results
+
+        count = len(results)
+        if mmr_lambda is None:
+            relevance = -np.arange(count, dtype=np.float32)
+            similarity = None
+        else:
+            embeddings = np.asarray(
+                [embeddings_by_id[result.id] for result in results], dtype=np.float32
+            )
+            embeddings /= np.maximum(
+                np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12
+            )
+            similarity = embeddings @ embeddings.T
+
+            rerank_scores = [result.rerank_score for result in results]
+            if None not in rerank_scores:
+                relevance = np.asarray(rerank_scores, dtype=np.float32)
+                spread = relevance.max() - relevance.min()
+                relevance = (relevance - relevance.min()) / (spread or 1)
+            else:
+                query_vector = np.asarray(query_embedding, dtype=np.float32)
+                relevance = embeddings @ (
+                    query_vector / max(np.linalg.norm(query_vector), 1e-12)
+                )
+
+        file_paths = np.asarray([result.file_path for result in results], dtype=object)
+        file_counts: Dict[str, int] = {}
+        available = np.ones(count, dtype=bool)
+        max_similarity = np.zeros(count, dtype=np.float32)
+        selected = []
+        while len(selected) < n_results and available.any():
+            if similarity is None:
+                scores = relevance
+            else:
+                scores = mmr_lambda * relevance - (1 - mmr_lambda) * max_similarity
+            pick = int(np.argmax(np.where(available, scores, -np.inf)))
+            selected.append(pick)
+            available[pick] = False
+            if similarity is not None:
+                max_similarity = np.maximum(max_similarity, similarity[pick])
+
+            if max_chunks_per_file is not None:
+                file_path = results[pick].file_path
+                file_counts[file_path] = file_counts.get(file_path, 0) + 1
+                if file_counts[file_path] >= max_chunks_per_file:
+                    available &= file_paths != file_path
+
+        return [results[i] for i in selected]
+
+    def _vector_search(
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        file_filter: Optional[str],
+        tag_filter: Optional[List[str]],
+        exclude_file: Optional[str] = None,
+        fields: Optional[FrozenSet[str]] = None,
+        embeddings: Optional[Dict[str, List[float]]] = None,
+    ) -> List[SearchResult]:
+        # Collections built with per-tag keys filter tags inside the query
+        collection_metadata = self.collection.metadata or {}
+        if not tag_filter or collection_metadata.get("tag_keys"):
             results = self.collection.query(
-                query_embeddings=query_embedding.tolist(),
+                query_embeddings=[query_embedding],
                 n_results=n_results,
-                where=where_clause if where_clause else None,
-                include=["documents", "metadatas", "distances"],
+                where=self._build_where(file_filter, tag_filter, exclude_file),
+                include=self._query_include(
+                    self._wants("content", fields), embeddings is not None
+                ),
             )
+            return self._format_results(results, tag_filter, fields, embeddings)
 
-            # Format results
-            formatted_results = []
-            for i in range(len(results["ids"][0])):
-                metadata = results["metadatas"][0][i]
+        return self._search_with_refill(
+            query_embedding,
+            n_results,
+            file_filter,
+            tag_filter,
+            exclude_file,
+            fields,
+            embeddings,
+        )
 
-                # Parse JSON fields
-                tags = json.loads(metadata.get("tags", "[]"))
-                links = json.loads(metadata.get("links", "[]"))
-
-                # Apply tag filtering if specified
-                if tag_filter:
-                    if not any(tag in tags for tag in tag_filter):
-                        continue
-
-                result = SearchResult(
-                    id=results["ids"][0][i],
-                    content=results["documents"][0][i],
-                    distance=results["distances"][0][i],
-                    file_path=metadata["file_path"],
-                    title=metadata["title"],
-                    chunk_index=metadata["chunk_index"],
-                    tags=tags,
-                    links=links,
-                    created_at=metadata.get("created_at"),
-                    modified_at=metadata.get("modified_at"),
+    def _hybrid_search(
+        self,
+        query: str,
+        query_embedding: List[float],
+        n_results: int,
+        file_filter: Optional[str],
+        tag_filter: Optional[List[str]],
+        lexical_index: LexicalIndex,
+        fields: Optional[FrozenSet[str]] = None,
+        embeddings: Optional[Dict[str, List[float]]] = None,
+    ) -> List[SearchResult]:
+        """Fuse vector and BM25 rankings with reciprocal rank fusion."""
+        candidates = n_results * HYBRID_CANDIDATES
+        vector_results = self._vector_search(
+            query_embedding,
+            candidates,
+            file_filter,
+            tag_filter,
+            fields=fields,
+            embeddings=embeddings,
+        )
+        if tag_filter and fields is not None:
+            fields = fields | {"tags"}
+        lexical_hits = lexical_index.search(query, candidates)
+
+        by_id = {result.id: result for result in vector_results}
+        missing_ids = [
+            chunk_id for chunk_id, _ in lexical_hits if chunk_id not in by_id
+        ]
+        if missing_ids:
+            with_content = self._wants("content", fields)
+            include = ["metadatas", "embeddings"]
+            stored = self.collection.get(
+                ids=missing_ids,
+                include=["documents", *include] if with_content else include,
+            )
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
+            for chunk_id, content, metadata, embedding in zip(
+                stored["ids"],
+                stored["documents"] if with_content else [""] * len(stored["ids"]),
+                stored["metadatas"],
+                stored["embeddings"],
+            ):
+                if file_filter and not re.search(file_filter, metadata["file_path"]):
+                    continue
+                # Same measure the collection reports: squared L2 distance
+                distance = float(
+                    np.sum(
+                        (np.asarray(embedding, dtype=np.float32) - query_vector) ** 2
+                    )
                 )
+                result = self._to_search_result(
+                    chunk_id, content, distance, metadata, fields
+                )
+                if tag_filter and not any(tag in result.tags for tag in tag_filter):
+                    continue
+                by_id[chunk_id] = result
+                if embeddings is not None:
+                    embeddings[chunk_id] = embedding
 
-                formatted_results.append(result)
+        scores: Dict[str, float] = {}
+        rankings = (
+            [result.id for result in vector_results],
+            [chunk_id for chunk_id, _ in lexical_hits if chunk_id in by_id],
+        )
+        for ranking in rankings:
+            for rank, chunk_id in enumerate(ranking, start=1):
+                scores[chunk_id] = scores.get(chunk_id, 0) + 1 / (self.rrf_k + rank)
 
-            return formatted_results
+        fused_results = []
+        for chunk_id in sorted(scores, key=scores.get, reverse=True)[:n_results]:
+            result = by_id[chunk_id]
+            result.score = scores[chunk_id]
+            fused_results.append(result)
+        return fused_results
 
-        except Exception as e:
-            print(f"Search failed: {e}")
-            return []
+    @staticmethod
+    def _build_where(
+        file_filter: Optional[str],
+        tag_filter: Optional[List[str]],
+        exclude_file: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """Build the metadata filter; a chunk matches if it has any of the tags."""
+        clauses = []
+        if file_filter:
+            clauses.append({"file_path": {"$regex": file_filter}})
+        if exclude_file:
+            clauses.append({"file_path": {"$ne": exclude_file}})
+        if tag_filter:
+            tag_clauses = [{f"{TAG_KEY_PREFIX}{tag}": True} for tag in tag_filter]
+            clauses.append(
+                tag_clauses[0] if len(tag_clauses) == 1 else {"$or": tag_clauses}
+            )
+
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def _search_with_refill(
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        file_filter: Optional[str],
+        tag_filter: List[str],
+        exclude_file: Optional[str] = None,
+        fields: Optional[FrozenSet[str]] = None,
+        embeddings: Optional[Dict[str, List[float]]] = None,
+    ) -> List[SearchResult]:
+        """Tag-filter after the query, over-fetching until n_results survive.
+
+        Used for collections indexed before tags became filterable keys.
+        """
+        total_chunks = self.collection.count()
+        fetch = n_results * TAG_FILTER_OVERFETCH
+        while True:
+            fetch = min(fetch, total_chunks)
+            results = self.collection.query(
+                query_embeddings=[query_embedding],
+                n_results=max(fetch, 1),
+                where=self._build_where(file_filter, None, exclude_file),
+                include=self._query_include(
+                    self._wants("content", fields), embeddings is not None
+                ),
+            )
+            formatted_results = self._format_results(
+                results, tag_filter, fields, embeddings
+            )
+            exhausted = len(results["ids"][0]) < fetch or fetch >= total_chunks
+            if len(formatted_results) >= n_results or exhausted:
+                return formatted_results[:n_results]
+            fetch *= 2
+
+    def _format_results(
+        self,
+        results: Dict,
+        tag_filter: Optional[List[str]],
+        fields: Optional[FrozenSet[str]] = None,
+        embeddings: Optional[Dict[str, List[float]]] = None,
+    ) -> List[SearchResult]:
+        if tag_filter and fields is not None:
+            fields = fields | {"tags"}  # Needed for the tag check below
+        ids = results["ids"][0]
+        # Chroma returns no documents when they were not included
+        documents = results["documents"][0] if results.get("documents") else None
+        if embeddings is not None and results.get("embeddings") is not None:
+            embeddings.update(zip(ids, results["embeddings"][0]))
+        formatted_results = []
+        for i in range(len(ids)):
+            result = self._to_search_result(
+                ids[i],
+                documents[i] if documents is not None else "",
+                results["distances"][0][i],
+                results["metadatas"][0][i],
+                fields,
+            )
+
+            # Apply tag filtering if specified
+            if tag_filter:
+                if not any(tag in result.tags for tag in tag_filter):
+                    continue
+
+            formatted_results.append(result)
+
+        return formatted_results
+
+    @staticmethod
+    def _to_search_result(
+        chunk_id: str,
+        content: str,
+        distance: float,
+        metadata: Dict,
+        fields: Optional[FrozenSet[str]] = None,
+    ) -> SearchResult:
+        wants_tags = fields is None or "tags" in fields
+        wants_links = fields is None or "links" in fields
+        return SearchResult(
+            id=chunk_id,
+            content=content,
+            distance=distance,
+            file_path=metadata["file_path"],
+            title=metadata["title"],
+            chunk_index=metadata["chunk_index"],
+            # Parse JSON fields, unless left out of the response
+            tags=json.loads(metadata.get("tags", "[]")) if wants_tags else [],
+            links=json.loads(metadata.get("links", "[]")) if wants_links else [],
+            created_at=metadata.get("created_at"),
+            modified_at=metadata.get("modified_at"),
+        )
+
+    async def search_async(
+        self,
+        query: str,
+        n_results: int = 10,
+        file_filter: Optional[str] = None,
+        tag_filter: Optional[List[str]] = None,
+        mode: str = "vector",
+        rerank: bool = False,
+        mmr_lambda: Optional[float] = None,
+        max_chunks_per_file: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        snippet: bool = False,
+    ) -> List[SearchResult]:
+        """Encode the query on the event loop, then search on the executor.
+
+        Queries wait for a shared encode call as asyncio futures, so how many
+        can be coalesced is not limited by the search executor's threads.
+        """
+        model_name = self.query_model_name
+        query_embedding = self.query_cache.get(model_name, query)
+        if query_embedding is None:
+            try:
+                query_embedding = await self.query_encoder.encode_async(query)
+            except Exception as e:
+                print(f"Search failed: {e}")
+                return []
+            self.query_cache.put(model_name, query, query_embedding)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.search_executor,
+            partial(
+                self.search,
+                query=query,
+                n_results=n_results,
+                file_filter=file_filter,
+                tag_filter=tag_filter,
+                mode=mode,
+                rerank=rerank,
+                mmr_lambda=mmr_lambda,
+                max_chunks_per_file=max_chunks_per_file,
+                fields=fields,
+                snippet=snippet,
+                query_embedding=query_embedding,
+                query_model_name=model_name,
+            ),
+        )
+
+    async def search_batch_async(
+        self, requests: List[SearchRequest]
+    ) -> List[List[SearchResult]]:
+        """Run search_batch on the dedicated search executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.search_executor, partial(self.search_batch, requests)
+        )
 
     def get_document_info(self, file_path: str) -> Optional[Dict]:
         """Get information about a document in the store."""
@@ -230,6 +1455,7 @@ class VectorStore:
     def get_stats(self) -> Dict:
         """Get statistics about the vector store."""
         try:
+            self._refresh_collection()
             total_chunks = self.collection.count()
             all_docs = self.list_all_documents()
 
@@ -250,6 +1476,18 @@ class VectorStore:
                 )[:20],
                 "model_name": self.model_name,
                 "collection_name": self.collection_name,
+                "active_collection": self.active_collection_name,
+                "rebuild_in_progress": self.build_collection is not None,
+                "indexed_commit": self.get_indexed_commit(),
+                "query_batching": self.query_encoder.get_stats(),
+                "query_cache": self.query_cache.get_stats(),
+                "embedding_cache": (
+                    self.chunk_cache.get_stats() if self.chunk_cache else None
+                ),
+                "lexical_index": (
+                    self.lexical_index.get_stats() if self.lexical_index else None
+                ),
+                "reranker": self.reranker.get_stats() if self.reranker else None,
             }
 
         except Exception as e:
@@ -270,6 +1508,9 @@ class VectorStore:
                     stats["renamed"] += 1
                 # New file will be handled by the sync process
 
+        if any(stats.values()):
+            self._bump_index_generation()
+
         return stats
 
     def check_model_compatibility(self) -> Dict[str, any]:
@@ -306,16 +1547,20 @@ class VectorStore:
         """Clear all documents from the collection and update metadata."""
         try:
             # Delete the collection
-            self.client.delete_collection(name=self.collection_name)
+            self.client.delete_collection(name=self.active_collection_name)
 
             # Recreate the collection with updated metadata
             self.collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={
-                    "description": "Obsidian vault embeddings",
-                    "model_name": self.model_name,
-                },
+                name=self.active_collection_name,
+                metadata=self._collection_metadata(),
             )
+            if self.lexical_index is not None:
+                self.lexical_index.clear()
+            if self.query_model is not self.embedding_model:
+                self._use_query_model(self.embedding_model, self.model_name)
+            self.set_indexed_commit(None)
+            self.set_failed_files([])
+            self._bump_index_generation()
 
             return {
                 "success": True,
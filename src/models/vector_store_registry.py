@@ -0,0 +1,52 @@
+import threading
+from typing import Dict, Optional
+
+from src.config.settings import Settings
+
+from .vector_store import VectorStore
+
+
+class VectorStoreRegistry:
+    """Holds the process-wide VectorStore and its embedding model."""
+
+    def __init__(self):
+        self._vector_store: Optional[VectorStore] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._vector_store is not None
+
+    def startup(self, settings: Settings) -> VectorStore:
+        """Create the shared vector store (called from the app lifespan)."""
+        return self.get(settings)
+
+    def get(self, settings: Settings) -> VectorStore:
+        """Return the shared vector store, creating it on first use."""
+        vector_store = self._vector_store
+        if vector_store is None:
+            with self._lock:
+                if self._vector_store is None:
+                    self._vector_store = VectorStore(settings=settings)
+                vector_store = self._vector_store
+
+        return vector_store
+
+    def reload_model(self, model_name: str) -> Dict[str, str]:
+        """Hot-swap the embedding model of the shared vector store."""
+        with self._lock:
+            if self._vector_store is None:
+                raise RuntimeError("Vector store not initialized")
+
+            previous_model = self._vector_store.model_name
+            if previous_model != model_name:
+                self._vector_store.load_embedding_model(model_name)
+
+            return {"previous_model": previous_model, "current_model": model_name}
+
+    def shutdown(self) -> None:
+        """Close the shared vector store and drop the reference."""
+        with self._lock:
+            if self._vector_store is not None:
+                self._vector_store.close()
+                self._vector_store = None
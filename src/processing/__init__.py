@@ -0,0 +1,14 @@
+"""Note parsing and chunking, kept free of the embedding stack.
+
+Parse worker processes import this package, so it must not depend on
+src.models (ChromaDB, torch).
+"""
+
+from .obsidian_processor import ObsidianDocument, ObsidianProcessor
+from .parse_worker import ParseWorkerPool
+
+__all__ = [
+    "ObsidianDocument",
+    "ObsidianProcessor",
+    "ParseWorkerPool",
+]
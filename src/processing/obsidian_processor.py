@@ -195,8 +195,13 @@ class ObsidianProcessor:
         self, document: ObsidianDocument, max_tokens: int = 500
     ) -> List[Dict]:
         """Split document content into chunks for embedding."""
+        return self.create_chunks(
+            document, self.split_text(document.content, max_tokens)
+        )
+
+    def split_text(self, content: str, max_tokens: int = 500) -> List[str]:
+        """Split text into chunk texts of at most max_tokens tokens."""
         chunks = []
-        content = document.content
 
         # Split by paragraphs first
         paragraphs = content.split("\n\n")
@@ -210,9 +215,7 @@ class ObsidianProcessor:
             # If this paragraph alone exceeds max_tokens, split it further
             if paragraph_tokens > max_tokens:
                 if current_chunk:
-                    chunks.append(
-                        self._create_chunk(document, current_chunk, len(chunks))
-                    )
+                    chunks.append(current_chunk)
                     current_chunk = ""
                     current_tokens = 0
 
@@ -229,9 +232,7 @@ class ObsidianProcessor:
                     sentence_tokens = self._count_tokens(sentence)
 
                     if temp_tokens + sentence_tokens > max_tokens and temp_chunk:
-                        chunks.append(
-                            self._create_chunk(document, temp_chunk, len(chunks))
-                        )
+                        chunks.append(temp_chunk)
                         temp_chunk = sentence
                         temp_tokens = sentence_tokens
                     else:
@@ -243,7 +244,7 @@ class ObsidianProcessor:
                     current_tokens = temp_tokens
 
             elif current_tokens + paragraph_tokens > max_tokens and current_chunk:
-                chunks.append(self._create_chunk(document, current_chunk, len(chunks)))
+                chunks.append(current_chunk)
                 current_chunk = paragraph
                 current_tokens = paragraph_tokens
             else:
@@ -251,10 +252,14 @@ class ObsidianProcessor:
                 current_tokens += paragraph_tokens
 
         if current_chunk:
-            chunks.append(self._create_chunk(document, current_chunk, len(chunks)))
+            chunks.append(current_chunk)
 
         return chunks
 
+    def create_chunks(self, document: ObsidianDocument, texts: List[str]) -> List[Dict]:
+        """Create chunk dictionaries for a document from its chunk texts."""
+        return [self._create_chunk(document, text, i) for i, text in enumerate(texts)]
+
     def _create_chunk(
         self, document: ObsidianDocument, content: str, chunk_index: int
     ) -> Dict:
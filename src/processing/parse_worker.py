@@ -0,0 +1,86 @@
+"""Process pool for parsing and chunking notes outside the main process.
+
+Worker processes import only this module and the note processor, never the
+src.models package, which pulls in ChromaDB and torch.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .obsidian_processor import ObsidianDocument, ObsidianProcessor
+
+# Each pool worker keeps its own processor (and tiktoken encoder)
+_worker_processor: Optional[ObsidianProcessor] = None
+
+
+def _init_parse_worker() -> None:
+    global _worker_processor
+    _worker_processor = ObsidianProcessor(settings=None)
+
+
+def _parse_in_worker(
+    file_path: str, content: str
+) -> Optional[Tuple[ObsidianDocument, List[str]]]:
+    """Parse and chunk a file, returning the document and its chunk texts.
+
+    Only chunk texts are sent back; the parent process rebuilds the chunk
+    dictionaries, which would otherwise repeat the note metadata per chunk.
+    """
+    document = _worker_processor.process_file(file_path, content)
+    if document is None:
+        return None
+    return document, _worker_processor.split_text(document.content)
+
+
+class ParseWorkerPool:
+    """Optional process pool that parses and chunks notes in parallel.
+
+    Parsing and token counting are pure-Python and hold the GIL, so threads
+    don't scale them. The parent process is multi-threaded (search executor,
+    query encoder, ChromaDB and torch threads), so workers are never forked
+    from it: they come from a forkserver that has preloaded only this module,
+    or are spawned where forkserver is unavailable. Workers are started on
+    first use.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                if "forkserver" in multiprocessing.get_all_start_methods():
+                    mp_context = multiprocessing.get_context("forkserver")
+                    mp_context.set_forkserver_preload([__name__])
+                else:
+                    mp_context = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=mp_context,
+                    initializer=_init_parse_worker,
+                )
+            return self._executor
+
+    async def parse(
+        self, file_path: str, content: str
+    ) -> Optional[Tuple[ObsidianDocument, List[str]]]:
+        """Parse and chunk a file in a worker process."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), _parse_in_worker, file_path, content
+        )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -1,4 +1,13 @@
+from .embedding import ReloadModelRequest
 from .git import FileChange, FileStatus
-from .search import SearchRequest, SearchResult
+from .search import BatchSearchRequest, SearchRequest, SearchResult, SimilarRequest
 
-__all__ = ["FileChange", "FileStatus", "SearchRequest", "SearchResult"]
+__all__ = [
+    "BatchSearchRequest",
+    "FileChange",
+    "FileStatus",
+    "ReloadModelRequest",
+    "SearchRequest",
+    "SearchResult",
+    "SimilarRequest",
+]
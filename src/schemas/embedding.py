@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+
+class ReloadModelRequest(BaseModel):
+    model_name: str  # Embedding model used for indexing from now on
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -8,6 +8,25 @@ class SearchRequest(BaseModel):
     n_results: int = 10
     file_filter: Optional[str] = None
     tag_filter: Optional[List[str]] = None
+    mode: Literal["vector", "hybrid"] = "vector"  # hybrid adds BM25 keyword ranking
+    rerank: bool = False  # Rescore the top candidates with the cross-encoder
+    mmr_lambda: Optional[float] = None  # Diversify by MMR (1 = relevance only)
+    max_chunks_per_file: Optional[int] = None  # Cap per note (1 collapses by file)
+    fields: Optional[List[str]] = None  # SearchResult fields to return (id always)
+    snippet: bool = False  # Return a highlighted window of content, not the chunk
+
+
+class BatchSearchRequest(BaseModel):
+    searches: List[SearchRequest]
+
+
+class SimilarRequest(BaseModel):
+    file_path: Optional[str] = None  # Source note (its chunks are mean-pooled)
+    chunk_id: Optional[str] = None  # Or a single source chunk
+    n_results: int = 10
+    file_filter: Optional[str] = None
+    tag_filter: Optional[List[str]] = None
+    max_chunks_per_file: Optional[int] = None
 
 
 class SearchResult(BaseModel):
@@ -21,3 +40,5 @@ class SearchResult(BaseModel):
     links: List[str]
     created_at: Optional[str] = None
     modified_at: Optional[str] = None
+    score: Optional[float] = None  # Fused rank score of hybrid searches
+    rerank_score: Optional[float] = None  # Cross-encoder score of reranked searches
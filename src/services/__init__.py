@@ -1,7 +1,14 @@
 """Services for the application."""
 
+from .job_manager import IndexJob, JobManager
+from .search_result_cache import SearchResultCache
 from .sync_coordinator import SyncCoordinator
+from .sync_scheduler import SyncScheduler
 
 __all__ = [
+    "IndexJob",
+    "JobManager",
+    "SearchResultCache",
     "SyncCoordinator",
+    "SyncScheduler",
 ]
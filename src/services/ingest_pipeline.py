@@ -0,0 +1,311 @@
+"""Staged ingestion pipeline used by full index rebuilds."""
+
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
+
+from src.models import GitManager, ObsidianProcessor, ParseWorkerPool, VectorStore
+from src.models.vector_store import EmbeddedBatch
+from src.processing import ObsidianDocument
+
+# Marks the end of a stage's output on the queue feeding the next stage
+_END = object()
+
+
+class IngestPipeline:
+    """Runs read → parse/chunk → embed → write as overlapping stages.
+
+    Each stage is connected to the next by a bounded asyncio queue, so a slow
+    stage applies backpressure upstream instead of letting work pile up in
+    memory. Reading and parsing run with several workers; embedding and
+    writing run one batch at a time but overlap with each other, so the
+    total time approaches that of the slowest stage.
+    """
+
+    def __init__(
+        self,
+        git_manager: GitManager,
+        processor: ObsidianProcessor,
+        vector_store: VectorStore,
+        read_concurrency: int = 4,
+        parse_concurrency: int = 2,
+        queue_size: int = 64,
+        batch_max_chunks: int = 256,
+        batch_max_tokens: int = 64000,
+        parse_pool: Optional[ParseWorkerPool] = None,
+    ):
+        self.git_manager = git_manager
+        self.processor = processor
+        self.vector_store = vector_store
+        self.read_concurrency = max(1, read_concurrency)
+        self.parse_concurrency = max(1, parse_concurrency)
+        if parse_pool is not None and parse_pool.enabled:
+            # Each parse worker keeps one file in flight, so fewer workers
+            # than pool processes would leave processes idle
+            self.parse_concurrency = max(self.parse_concurrency, parse_pool.max_workers)
+        self.queue_size = max(1, queue_size)
+        self.batch_max_chunks = batch_max_chunks
+        self.batch_max_tokens = batch_max_tokens
+        self.parse_pool = parse_pool
+
+    async def run(
+        self,
+        file_paths: List[str],
+        stats: Dict[str, int],
+        progress_start: float = 20,
+        progress_span: float = 70,
+        on_written: Optional[Callable[[List[str]], None]] = None,
+        revision: Optional[str] = None,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Ingest the files, updating stats and yielding progress events.
+
+        on_written is called with the paths of each batch's files once their
+        chunks are stored, e.g. to checkpoint progress. Files the processor
+        cannot parse fail the same way on every run, so they are counted as
+        unparseable rather than failed and are passed to on_written too.
+        With revision, files are read at that commit from git objects.
+        """
+        total_files = len(file_paths)
+        start_time = time.time()
+        started = 0
+        finished = 0
+
+        events: asyncio.Queue = asyncio.Queue()
+        paths: asyncio.Queue = asyncio.Queue()
+        for file_path in file_paths:
+            paths.put_nowait(file_path)
+        contents: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        parsed: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        embedded: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        def progress() -> float:
+            return progress_start + (finished / total_files) * progress_span
+
+        def eta() -> str:
+            if finished == 0:
+                return "calculating..."
+            elapsed = time.time() - start_time
+            eta_seconds = (total_files - finished) * elapsed / finished
+            return f"{int(eta_seconds / 60)}m {int(eta_seconds % 60)}s"
+
+        def fail(event_type: str, message: str) -> None:
+            nonlocal finished
+            finished += 1
+            stats["failed"] += 1
+            events.put_nowait({"type": event_type, "message": message})
+
+        def skip_unparseable(file_path: str) -> None:
+            nonlocal finished
+            finished += 1
+            stats["unparseable"] += 1
+            events.put_nowait(
+                {"type": "warning", "message": f"Skipped unparseable: {file_path}"}
+            )
+            if on_written is not None:
+                on_written([file_path])
+
+        async def read_worker() -> None:
+            while True:
+                try:
+                    file_path = paths.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    content = await asyncio.to_thread(
+                        self.git_manager.get_file_content, file_path, revision
+                    )
+                except Exception as e:
+                    fail("error", f"Error processing {file_path}: {e!s}")
+                    continue
+                if content is None:
+                    fail("warning", f"No content found for: {file_path}")
+                    continue
+                await contents.put((file_path, content))
+
+        async def parse_worker() -> None:
+            nonlocal started
+            while True:
+                item = await contents.get()
+                if item is _END:
+                    return
+                file_path, content = item
+
+                started += 1
+                events.put_nowait(
+                    {
+                        "type": "progress",
+                        "message": f"Processing: {file_path}",
+                        "progress": progress(),
+                        "current_file": started,
+                        "total_files": total_files,
+                        "eta": eta(),
+                    }
+                )
+
+                try:
+                    result = await self._parse(file_path, content)
+                    if result is None:
+                        skip_unparseable(file_path)
+                        continue
+                    document, chunks = result
+                except Exception as e:
+                    fail("error", f"Error processing {file_path}: {e!s}")
+                    continue
+                await parsed.put((document, chunks))
+
+        async def read_stage() -> None:
+            try:
+                await asyncio.gather(
+                    *(read_worker() for _ in range(self.read_concurrency))
+                )
+            finally:
+                for _ in range(self.parse_concurrency):
+                    await contents.put(_END)
+
+        async def parse_stage() -> None:
+            try:
+                await asyncio.gather(
+                    *(parse_worker() for _ in range(self.parse_concurrency))
+                )
+            finally:
+                await parsed.put(_END)
+
+        async def embed_stage() -> None:
+            batch: List[Tuple[ObsidianDocument, List[Dict]]] = []
+            batch_chunks = 0
+            batch_tokens = 0
+            try:
+                while True:
+                    item = await parsed.get()
+                    if item is not _END:
+                        document, chunks = item
+                        batch.append(item)
+                        batch_chunks += len(chunks)
+                        batch_tokens += document.token_count
+                        if (
+                            batch_chunks < self.batch_max_chunks
+                            and batch_tokens < self.batch_max_tokens
+                        ):
+                            continue
+
+                    if batch:
+                        await embedded.put((batch, await self._embed(batch)))
+                        batch = []
+                        batch_chunks = 0
+                        batch_tokens = 0
+
+                    if item is _END:
+                        return
+            finally:
+                await embedded.put(_END)
+
+        async def write_stage() -> None:
+            nonlocal finished
+            try:
+                while True:
+                    item = await embedded.get()
+                    if item is _END:
+                        return
+                    batch, embedded_batch = item
+                    results = await self._write(batch, embedded_batch)
+                    if embedded_batch is not None and all(results):
+                        stats["cached_chunks"] += embedded_batch.cached_chunks
+                    if on_written is not None:
+                        on_written(
+                            [
+                                document.file_path
+                                for (document, _), ok in zip(batch, results)
+                                if ok
+                            ]
+                        )
+
+                    for (document, chunks), ok in zip(batch, results):
+                        if not ok:
+                            fail(
+                                "warning",
+                                f"Failed to add to vector store: {document.file_path}",
+                            )
+                            continue
+                        finished += 1
+                        stats["processed"] += 1
+                        stats["total_chunks"] += len(chunks)
+                        events.put_nowait(
+                            {
+                                "type": "file_complete",
+                                "message": f"✅ Processed: {document.file_path} ({len(chunks)} chunks)",
+                                "file_path": document.file_path,
+                                "chunks": len(chunks),
+                            }
+                        )
+            finally:
+                events.put_nowait(_END)
+
+        tasks = [
+            asyncio.create_task(stage())
+            for stage in (read_stage, parse_stage, embed_stage, write_stage)
+        ]
+        try:
+            while True:
+                event = await events.get()
+                if event is _END:
+                    break
+                yield event
+
+            # Surface unexpected stage failures (per-file errors are events)
+            await tasks[-1]
+            for task in tasks[:-1]:
+                if task.done() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _parse(
+        self, file_path: str, content: str
+    ) -> Optional[Tuple[ObsidianDocument, List[Dict]]]:
+        if self.parse_pool is not None and self.parse_pool.enabled:
+            parsed = await self.parse_pool.parse(file_path, content)
+            if parsed is None:
+                return None
+            document, texts = parsed
+            return document, self.processor.create_chunks(document, texts)
+
+        document = await asyncio.to_thread(
+            self.processor.process_file, file_path, content
+        )
+        if not document:
+            return None
+        chunks = await asyncio.to_thread(
+            self.processor.split_content_for_embedding, document
+        )
+        return document, chunks
+
+    async def _embed(
+        self, batch: List[Tuple[ObsidianDocument, List[Dict]]]
+    ) -> Optional[EmbeddedBatch]:
+        try:
+            return await asyncio.to_thread(self.vector_store.embed_documents, batch)
+        except Exception as e:
+            print(f"Batch embedding failed, will add documents one by one: {e}")
+            return None
+
+    async def _write(
+        self,
+        batch: List[Tuple[ObsidianDocument, List[Dict]]],
+        embedded_batch: Optional[EmbeddedBatch],
+    ) -> List[bool]:
+        if embedded_batch is not None:
+            try:
+                await asyncio.to_thread(
+                    self.vector_store.write_documents, embedded_batch
+                )
+                return [True] * len(batch)
+            except Exception as e:
+                print(f"Batch write failed, retrying documents one by one: {e}")
+
+        return await asyncio.to_thread(
+            lambda: [
+                self.vector_store.add_document(document, chunks)
+                for document, chunks in batch
+            ]
+        )
@@ -0,0 +1,174 @@
+"""Runs index operations as single-flight background jobs."""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Callable, Deque, Dict, List, Optional, Tuple
+
+StreamFactory = Callable[[], AsyncGenerator[Dict[str, Any], None]]
+
+
+@dataclass
+class IndexJob:
+    """A sync or rebuild running independently of any client connection."""
+
+    id: str
+    kind: str
+    status: str = "running"  # running, completed, failed or cancelled
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    progress: float = 0
+    message: str = ""
+    result: Optional[Dict[str, Any]] = None
+    cancel_requested: bool = False
+    # Most recent events; event_count keeps counting past the retention bound
+    events: Deque[Dict[str, Any]] = field(default_factory=deque)
+    event_count: int = 0
+    task: Optional[asyncio.Task] = None
+    updated: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+            "cancel_requested": self.cancel_requested,
+            "event_count": self.event_count,
+        }
+
+
+class JobManager:
+    """Keeps at most one index job running and remembers recent ones.
+
+    Sync and rebuild both write to the same collection, so a request to
+    start a job while another one runs joins the running job instead.
+    Events are kept per job so clients can disconnect, poll the status or
+    replay the log, and cancellation is checked between events.
+    """
+
+    def __init__(self, max_finished_jobs: int = 20, max_events: int = 10000):
+        self.max_finished_jobs = max_finished_jobs
+        self.max_events = max_events
+        self._jobs: "OrderedDict[str, IndexJob]" = OrderedDict()
+        self._active: Optional[IndexJob] = None
+
+    @property
+    def active_job(self) -> Optional[IndexJob]:
+        return self._active if self._active and not self._active.done else None
+
+    def start(self, kind: str, stream_factory: StreamFactory) -> Tuple[IndexJob, bool]:
+        """Start a job, or return the running one. The flag tells which."""
+        if self.active_job is not None:
+            return self.active_job, False
+
+        job = IndexJob(id=uuid.uuid4().hex, kind=kind)
+        self._jobs[job.id] = job
+        self._active = job
+        job.task = asyncio.create_task(self._run(job, stream_factory))
+        self._prune()
+        return job, True
+
+    def get(self, job_id: str) -> Optional[IndexJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[IndexJob]:
+        """Jobs from newest to oldest."""
+        return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id: str) -> Optional[IndexJob]:
+        """Ask a running job to stop after its current step."""
+        job = self._jobs.get(job_id)
+        if job is not None and not job.done:
+            job.cancel_requested = True
+        return job
+
+    async def subscribe(
+        self, job: IndexJob, from_event: int = 0
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Replay a job's events from an index, then follow it until it ends."""
+        position = from_event
+        while True:
+            async with job.updated:
+                await job.updated.wait_for(
+                    lambda: job.event_count > position or job.done
+                )
+                # Events older than the retention bound are skipped
+                first_retained = job.event_count - len(job.events)
+                position = max(position, first_retained)
+                pending = list(job.events)[position - first_retained :]
+                finished = job.done
+
+            for event in pending:
+                yield event
+            position += len(pending)
+
+            if finished and position >= job.event_count:
+                return
+
+    async def _run(self, job: IndexJob, stream_factory: StreamFactory) -> None:
+        stream = stream_factory()
+        final_status = "completed"
+        try:
+            async for event in stream:
+                await self._record(job, event)
+                if event.get("type") == "error":
+                    final_status = "failed"
+                elif event.get("type") == "complete":
+                    job.result = event.get("stats")
+
+                if job.cancel_requested:
+                    final_status = "cancelled"
+                    await self._record(
+                        job, {"type": "cancelled", "message": "Job cancelled"}
+                    )
+                    break
+        except asyncio.CancelledError:
+            final_status = "cancelled"
+            raise
+        except Exception as e:  # noqa: BLE001 - keep the job record consistent
+            final_status = "failed"
+            await self._record(job, {"type": "error", "message": f"Job failed: {e!s}"})
+        finally:
+            # Lets the operation run its own cleanup at the point it stopped
+            await stream.aclose()
+            async with job.updated:
+                job.status = final_status
+                job.finished_at = time.time()
+                job.updated.notify_all()
+
+    async def _record(self, job: IndexJob, event: Dict[str, Any]) -> None:
+        async with job.updated:
+            job.events.append(event)
+            job.event_count += 1
+            if len(job.events) > self.max_events:
+                job.events.popleft()
+            if "progress" in event:
+                job.progress = event["progress"]
+            if "message" in event:
+                job.message = event["message"]
+            job.updated.notify_all()
+
+    async def shutdown(self) -> None:
+        """Stop the running job, e.g. when the application shuts down."""
+        job = self.active_job
+        if job is None or job.task is None:
+            return
+        job.cancel_requested = True
+        job.task.cancel()
+        await asyncio.gather(job.task, return_exceptions=True)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
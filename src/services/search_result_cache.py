@@ -0,0 +1,104 @@
+"""Caches complete search result lists until the index changes."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class SearchResultCache:
+    """LRU cache of search results scoped to a single index generation.
+
+    Keys include the index generation reported by the vector store, and the
+    whole cache is dropped as soon as a new generation is observed, so
+    results are never served across a sync or rebuild.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, List[Any]]" = OrderedDict()
+        self._generation: Optional[Hashable] = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(
+        query: str,
+        n_results: int,
+        file_filter: Optional[str],
+        tag_filter: Optional[List[str]],
+        mode: str = "vector",
+        rerank: bool = False,
+        mmr_lambda: Optional[float] = None,
+        max_chunks_per_file: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        snippet: bool = False,
+    ) -> Tuple:
+        return (
+            query,
+            n_results,
+            file_filter,
+            tuple(sorted(tag_filter)) if tag_filter else None,
+            mode,
+            rerank,
+            mmr_lambda,
+            max_chunks_per_file,
+            frozenset(fields) if fields is not None else None,
+            snippet,
+        )
+
+    def get(self, generation: Hashable, key: Tuple) -> Optional[List[Any]]:
+        """Return cached results for the key in the given generation."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._sync_generation(generation)
+            results = self._entries.get(key)
+            if results is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return results
+
+    def put(self, generation: Hashable, key: Tuple, results: List[Any]) -> None:
+        """Store results computed against the given generation."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            # The index changed while the search ran; these results are stale
+            if generation != self._generation:
+                return
+
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _sync_generation(self, generation: Hashable) -> None:
+        if generation != self._generation:
+            if self._entries:
+                self._invalidations += 1
+            self._entries.clear()
+            self._generation = generation
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and current cache size."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0,
+                "invalidations": self._invalidations,
+            }
@@ -2,10 +2,20 @@
 
 import asyncio
 import time
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple
 
-from src.models import GitManager, ObsidianProcessor, VectorStore
-from src.schemas import FileStatus
+from src.models import (
+    GitManager,
+    ObsidianProcessor,
+    ParseWorkerPool,
+    RebuildCheckpoint,
+    VectorStore,
+)
+from src.schemas import FileChange, FileStatus, SearchRequest, SimilarRequest
+
+from .ingest_pipeline import IngestPipeline
+from .job_manager import IndexJob, JobManager
+from .search_result_cache import SearchResultCache
 
 
 class SyncCoordinator:
@@ -16,13 +26,57 @@ class SyncCoordinator:
         git_manager: GitManager,
         vector_store: VectorStore,
         processor: ObsidianProcessor,
+        result_cache: Optional[SearchResultCache] = None,
+        ingest_batch_max_chunks: int = 256,
+        ingest_batch_max_tokens: int = 64000,
+        read_concurrency: int = 4,
+        parse_concurrency: int = 2,
+        pipeline_queue_size: int = 64,
+        parse_pool: Optional[ParseWorkerPool] = None,
+        checkpoint: Optional[RebuildCheckpoint] = None,
+        job_manager: Optional[JobManager] = None,
     ):
         self.git_manager = git_manager
         self.vector_store = vector_store
         self.processor = processor
+        self.result_cache = result_cache
+        self.ingest_batch_max_chunks = ingest_batch_max_chunks
+        self.ingest_batch_max_tokens = ingest_batch_max_tokens
+        self.read_concurrency = read_concurrency
+        self.parse_concurrency = parse_concurrency
+        self.pipeline_queue_size = pipeline_queue_size
+        self.parse_pool = parse_pool
+        self.checkpoint = checkpoint
+        self.job_manager = job_manager
+
+    @property
+    def _reads_from_objects(self) -> bool:
+        """Whether notes are read from git blobs rather than the checkout."""
+        return getattr(self.git_manager, "read_from_objects", False)
+
+    def start_job(self, kind: str, resume: bool = False) -> Tuple[IndexJob, bool]:
+        """Run a sync or rebuild in the background, or join the running job.
+
+        Returns the job and whether it was newly started.
+        """
+        if self.job_manager is None:
+            raise RuntimeError("Background jobs are not configured")
+        if kind == "sync":
+            return self.job_manager.start(kind, self.incremental_sync_stream)
+        if kind == "rebuild":
+            return self.job_manager.start(
+                kind, lambda: self.rebuild_index_stream(resume=resume)
+            )
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    async def rebuild_index_stream(
+        self, resume: bool = False
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Rebuild the entire vector index with streaming progress updates.
 
-    async def rebuild_index_stream(self) -> AsyncGenerator[Dict[str, Any], None]:
-        """Rebuild the entire vector index with streaming progress updates."""
+        With resume, files recorded in the rebuild checkpoint of an
+        interrupted run are kept instead of clearing the index first.
+        """
         try:
             yield {
                 "type": "status",
@@ -39,7 +93,7 @@ class SyncCoordinator:
                 if not self.git_manager.setup_repository():
                     yield {"type": "error", "message": "Failed to setup repository"}
                     return
-            else:
+            elif not self._reads_from_objects:
                 yield {
                     "type": "status",
                     "message": "Updating repository...",
@@ -49,27 +103,76 @@ class SyncCoordinator:
                     yield {"type": "error", "message": "Failed to update repository"}
                     return
 
-            yield {
-                "type": "status",
-                "message": "Clearing existing index...",
-                "progress": 10,
-            }
-            clear_result = await asyncio.to_thread(self.vector_store.clear_collection)
-            if not clear_result["success"]:
+            if self._reads_from_objects:
+                # Index the fetched branch head straight from the object
+                # database; the checkout is left where it is
                 yield {
-                    "type": "error",
-                    "message": f"Failed to clear existing index: {clear_result['message']}",
+                    "type": "status",
+                    "message": "Fetching repository...",
+                    "progress": 5,
+                }
+                indexed_commit = await asyncio.to_thread(
+                    self.git_manager.fetch_remote_head
+                )
+                revision = indexed_commit
+            else:
+                indexed_commit = await asyncio.to_thread(
+                    self.git_manager.get_head_commit
+                )
+                revision = None
+
+            completed_files = None
+            if resume:
+                completed_files = await asyncio.to_thread(
+                    self._load_rebuild_checkpoint, indexed_commit
+                )
+                if completed_files is None:
+                    yield {
+                        "type": "warning",
+                        "message": "No usable checkpoint found, starting a fresh build",
+                    }
+
+            if completed_files is None:
+                # Searches keep using the current index until the swap
+                yield {
+                    "type": "status",
+                    "message": "Creating shadow collection...",
+                    "progress": 10,
+                }
+                try:
+                    await asyncio.to_thread(self.vector_store.begin_rebuild)
+                except Exception as e:
+                    yield {
+                        "type": "error",
+                        "message": f"Failed to create shadow collection: {e!s}",
+                    }
+                    return
+                if self.checkpoint is not None:
+                    await asyncio.to_thread(self.checkpoint.start, indexed_commit)
+            else:
+                yield {
+                    "type": "status",
+                    "message": f"Resuming from checkpoint ({len(completed_files)} files already indexed)",
+                    "progress": 10,
                 }
-                return
 
             yield {
                 "type": "status",
                 "message": "Scanning markdown files...",
                 "progress": 15,
             }
-            md_files = await asyncio.to_thread(self.git_manager.get_all_markdown_files)
+            # A failed listing must not be mistaken for an empty vault
+            md_files = await asyncio.to_thread(
+                self.git_manager.get_all_markdown_files, revision, strict=True
+            )
 
             if not md_files:
+                await asyncio.to_thread(self.vector_store.commit_rebuild)
+                await asyncio.to_thread(
+                    self.vector_store.set_indexed_commit, indexed_commit
+                )
+                if self.checkpoint is not None:
+                    await asyncio.to_thread(self.checkpoint.clear)
                 yield {
                     "type": "complete",
                     "message": "No markdown files found",
@@ -77,6 +180,12 @@ class SyncCoordinator:
                 }
                 return
 
+            skipped_files = 0
+            if completed_files:
+                remaining_files = [f for f in md_files if f not in completed_files]
+                skipped_files = len(md_files) - len(remaining_files)
+                md_files = remaining_files
+
             total_files = len(md_files)
             yield {
                 "type": "status",
@@ -85,87 +194,82 @@ class SyncCoordinator:
                 "total_files": total_files,
             }
 
-            stats = {"processed": 0, "failed": 0, "total_chunks": 0}
+            stats = {
+                "processed": 0,
+                "failed": 0,
+                "unparseable": 0,
+                "total_chunks": 0,
+                "cached_chunks": 0,
+                "resumed": completed_files is not None,
+                "skipped_files": skipped_files,
+            }
             start_time = time.time()
 
-            for i, file_path in enumerate(md_files):
-                progress = 20 + (i / total_files) * 70
-                if i > 0:
-                    elapsed = time.time() - start_time
-                    avg_time_per_file = elapsed / i
-                    remaining_files = total_files - i
-                    eta_seconds = remaining_files * avg_time_per_file
-                    eta_str = f"{int(eta_seconds / 60)}m {int(eta_seconds % 60)}s"
-                else:
-                    eta_str = "calculating..."
-
+            pipeline = IngestPipeline(
+                git_manager=self.git_manager,
+                processor=self.processor,
+                vector_store=self.vector_store,
+                read_concurrency=self.read_concurrency,
+                parse_concurrency=self.parse_concurrency,
+                queue_size=self.pipeline_queue_size,
+                batch_max_chunks=self.ingest_batch_max_chunks,
+                batch_max_tokens=self.ingest_batch_max_tokens,
+                parse_pool=self.parse_pool,
+            )
+            async for event in pipeline.run(
+                md_files,
+                stats,
+                on_written=self.checkpoint.mark_completed if self.checkpoint else None,
+                revision=revision,
+            ):
+                yield event
+
+            stats["embedding_cache_hit_rate"] = (
+                round(stats["cached_chunks"] / stats["total_chunks"], 4)
+                if stats["total_chunks"]
+                else 0
+            )
+            if stats["failed"]:
+                # Read, embedding and write errors may be transient, and
+                # swapping now would drop those notes from search. The shadow
+                # and checkpoint are kept, and failed files stay unrecorded,
+                # so a resumed build retries just those. Unparseable notes
+                # are not failures: they would fail again on every run.
                 yield {
-                    "type": "progress",
-                    "message": f"Processing: {file_path}",
-                    "progress": progress,
-                    "current_file": i + 1,
-                    "total_files": total_files,
-                    "eta": eta_str,
+                    "type": "error",
+                    "message": (
+                        f'Build index incomplete: {stats["failed"]} files failed, '
+                        "still serving the previous index. Resume the rebuild "
+                        "to retry them."
+                    ),
+                    "stats": stats,
                 }
+                return
 
-                try:
-                    content = await asyncio.to_thread(
-                        self.git_manager.get_file_content, file_path
-                    )
-                    if content is None:
-                        stats["failed"] += 1
-                        yield {
-                            "type": "warning",
-                            "message": f"No content found for: {file_path}",
-                        }
-                        continue
-
-                    document = await asyncio.to_thread(
-                        self.processor.process_file, file_path, content
-                    )
-                    if not document:
-                        stats["failed"] += 1
-                        yield {
-                            "type": "warning",
-                            "message": f"Failed to process: {file_path}",
-                        }
-                        continue
-
-                    chunks = await asyncio.to_thread(
-                        self.processor.split_content_for_embedding, document
-                    )
-                    ok = await asyncio.to_thread(
-                        self.vector_store.add_document, document, chunks
-                    )
-                    if ok:
-                        stats["processed"] += 1
-                        stats["total_chunks"] += len(chunks)
-                        yield {
-                            "type": "file_complete",
-                            "message": f"✅ Processed: {file_path} ({len(chunks)} chunks)",
-                            "file_path": file_path,
-                            "chunks": len(chunks),
-                        }
-                    else:
-                        stats["failed"] += 1
-                        yield {
-                            "type": "warning",
-                            "message": f"Failed to add to vector store: {file_path}",
-                        }
+            yield {
+                "type": "status",
+                "message": "Switching searches to the rebuilt index...",
+                "progress": 92,
+            }
+            await asyncio.to_thread(self.vector_store.commit_rebuild)
 
-                except Exception as e:
-                    stats["failed"] += 1
-                    yield {
-                        "type": "error",
-                        "message": f"Error processing {file_path}: {e!s}",
-                    }
+            # Every referenced chunk was touched by a fresh rebuild; drop the rest
+            if not stats["resumed"]:
+                stats["evicted_embeddings"] = await asyncio.to_thread(
+                    self.vector_store.evict_unused_embeddings, start_time
+                )
+            if self.checkpoint is not None:
+                await asyncio.to_thread(self.checkpoint.clear)
+            stats["indexed_commit"] = await self._record_indexed_commit(
+                indexed_commit, []
+            )
 
             total_time = time.time() - start_time
             yield {"type": "status", "message": "Finalizing...", "progress": 95}
 
             result = {
                 "type": "complete",
-                "message": f'Build index complete! Processed {stats["processed"]} files, {stats["failed"]} failed',
+                "message": f'Build index complete! Processed {stats["processed"]} files, {stats["unparseable"]} unparseable',
                 "stats": stats,
                 "total_time_seconds": round(total_time, 2),
                 "progress": 100,
@@ -173,7 +277,12 @@ class SyncCoordinator:
             yield result
 
         except Exception as e:  # noqa: BLE001 - stream safety
+            # The serving index is untouched; the shadow is kept for resume
             yield {"type": "error", "message": f"Build index failed: {e!s}"}
+        finally:
+            # Unless the shadow was swapped in, later syncs must write to the
+            # serving collection again (also when the job is cancelled)
+            self.vector_store.detach_rebuild()
 
     async def incremental_sync_stream(self) -> AsyncGenerator[Dict[str, Any], None]:
         """Perform incremental synchronization with streaming progress updates."""
@@ -190,13 +299,27 @@ class SyncCoordinator:
                 "message": "Detecting file changes...",
                 "progress": 10,
             }
-            changes = self.git_manager.get_changed_files()
+            target_commit = await asyncio.to_thread(self.git_manager.fetch_remote_head)
+            base_commit = await asyncio.to_thread(self._sync_base_commit)
+            changes = await asyncio.to_thread(
+                self.git_manager.get_changes_between, base_commit, target_commit
+            )
+            retry_files = await asyncio.to_thread(self.vector_store.get_failed_files)
 
-            if not changes:
+            if not changes and not retry_files:
+                await asyncio.to_thread(
+                    self.vector_store.set_indexed_commit, target_commit
+                )
                 yield {
                     "type": "complete",
                     "message": "No changes detected - sync up to date",
-                    "stats": {"processed": 0, "deleted": 0, "renamed": 0, "failed": 0},
+                    "stats": {
+                        "processed": 0,
+                        "deleted": 0,
+                        "renamed": 0,
+                        "failed": 0,
+                        "indexed_commit": target_commit,
+                    },
                 }
                 return
 
@@ -215,15 +338,20 @@ class SyncCoordinator:
             }
             change_stats = self.vector_store.process_file_changes(changes)
 
-            # Pull the latest changes
-            yield {
-                "type": "status",
-                "message": "Pulling latest changes from repository...",
-                "progress": 30,
-            }
-            if not self.git_manager.pull_changes():
-                yield {"type": "error", "message": "Failed to pull changes"}
-                return
+            # Pull the latest changes, unless notes are read at target_commit
+            # from the object database
+            if self._reads_from_objects:
+                revision = target_commit
+            else:
+                revision = None
+                yield {
+                    "type": "status",
+                    "message": "Pulling latest changes from repository...",
+                    "progress": 30,
+                }
+                if not self.git_manager.pull_changes():
+                    yield {"type": "error", "message": "Failed to pull changes"}
+                    return
 
             # Process added/modified files
             stats = {
@@ -240,8 +368,16 @@ class SyncCoordinator:
                 for change in changes
                 if change.status in [FileStatus.ADDED, FileStatus.MODIFIED]
             ]
+            retried = self._retry_changes(retry_files, changes)
+            files_to_process.extend(retried)
+            retried_paths = {change.file_path for change in retried}
+            stats["retried"] = len(retried)
+            failed_files: List[str] = []
 
             if not files_to_process:
+                stats["indexed_commit"] = await self._record_indexed_commit(
+                    target_commit, []
+                )
                 yield {
                     "type": "complete",
                     "message": "Sync complete - only deletions/renames processed",
@@ -284,10 +420,14 @@ class SyncCoordinator:
                 try:
                     # Get file content
                     content = await asyncio.to_thread(
-                        self.git_manager.get_file_content, change.file_path
+                        self.git_manager.get_file_content, change.file_path, revision
                     )
                     if content is None:
+                        if change.file_path in retried_paths:
+                            # Removed from the vault since it failed; nothing to retry
+                            continue
                         stats["failed"] += 1
+                        failed_files.append(change.file_path)
                         yield {
                             "type": "warning",
                             "message": f"No content found for: {change.file_path}",
@@ -300,6 +440,7 @@ class SyncCoordinator:
                     )
                     if not document:
                         stats["failed"] += 1
+                        failed_files.append(change.file_path)
                         yield {
                             "type": "warning",
                             "message": f"Failed to process: {change.file_path}",
@@ -327,6 +468,7 @@ class SyncCoordinator:
                         }
                     else:
                         stats["failed"] += 1
+                        failed_files.append(change.file_path)
                         yield {
                             "type": "warning",
                             "message": f"Failed to add to vector store: {change.file_path}",
@@ -334,6 +476,7 @@ class SyncCoordinator:
 
                 except Exception as e:
                     stats["failed"] += 1
+                    failed_files.append(change.file_path)
                     yield {
                         "type": "error",
                         "message": f"Error processing {change.file_path}: {e!s}",
@@ -341,6 +484,9 @@ class SyncCoordinator:
 
             total_time = time.time() - start_time
             yield {"type": "status", "message": "Finalizing sync...", "progress": 95}
+            stats["indexed_commit"] = await self._record_indexed_commit(
+                target_commit, failed_files
+            )
 
             result = {
                 "type": "complete",
@@ -354,21 +500,336 @@ class SyncCoordinator:
         except Exception as e:  # noqa: BLE001 - stream safety
             yield {"type": "error", "message": f"Incremental sync failed: {e!s}"}
 
+    def _load_rebuild_checkpoint(
+        self, head_commit: Optional[str]
+    ) -> Optional[Set[str]]:
+        """Return files an interrupted rebuild already indexed, if resumable.
+
+        Files changed since the checkpointed commit are dropped from the set
+        (and deleted ones from the index) so they are rebuilt at HEAD.
+        """
+        if self.checkpoint is None:
+            return None
+        state = self.checkpoint.load()
+        if state is None:
+            return None
+        # The shadow must still exist and be built with the current model
+        if not self.vector_store.resume_rebuild():
+            return None
+
+        completed_files = state["completed_files"]
+        checkpoint_commit = state["commit"]
+        if checkpoint_commit != head_commit:
+            if not checkpoint_commit or not self.git_manager.has_commit(
+                checkpoint_commit
+            ):
+                return None
+
+            for change in self.git_manager.get_changes_between(
+                checkpoint_commit, head_commit
+            ):
+                completed_files.discard(change.file_path)
+                if change.old_file_path:
+                    completed_files.discard(change.old_file_path)
+                if change.status in (FileStatus.DELETED, FileStatus.RENAMED):
+                    self.vector_store.remove_document(change.file_path)
+
+            # Re-anchor the checkpoint at HEAD with the still-valid files
+            self.checkpoint.start(head_commit)
+            self.checkpoint.mark_completed(completed_files)
+
+        return completed_files
+
+    def has_remote_changes(self) -> bool:
+        """Cheaply check whether the remote branch moved past the index."""
+        remote_commit = self.git_manager.get_remote_head()
+        if remote_commit is None:
+            return False
+        indexed_commit = (
+            self.vector_store.get_indexed_commit() or self.git_manager.get_head_commit()
+        )
+        return remote_commit != indexed_commit
+
+    def _sync_base_commit(self) -> str:
+        """Commit to diff from: the index watermark, else the checked-out HEAD."""
+        indexed_commit = self.vector_store.get_indexed_commit()
+        if indexed_commit and self.git_manager.has_commit(indexed_commit):
+            return indexed_commit
+
+        if indexed_commit:
+            print(f"Indexed commit {indexed_commit} not found, diffing from HEAD")
+        return self.git_manager.get_head_commit()
+
+    async def _record_indexed_commit(
+        self, commit_sha: str, failed_files: List[str]
+    ) -> Optional[str]:
+        """Advance the watermark and remember the files that failed.
+
+        A file that keeps failing must not pin the watermark, or every sync
+        would re-diff an ever-growing range. The next sync retries just the
+        failed files. Returns the watermark now in effect.
+        """
+        await asyncio.to_thread(self.vector_store.set_failed_files, failed_files)
+        await asyncio.to_thread(self.vector_store.set_indexed_commit, commit_sha)
+        return commit_sha
+
+    @staticmethod
+    def _retry_changes(
+        retry_files: List[str], changes: List[FileChange]
+    ) -> List[FileChange]:
+        """Changes that retry files an earlier sync failed to index.
+
+        Files this diff already re-indexes or deletes are left out, and a
+        renamed file is retried under its new path.
+        """
+        renamed_to = {
+            change.old_file_path: change.file_path
+            for change in changes
+            if change.old_file_path
+        }
+        covered = {
+            change.file_path
+            for change in changes
+            if change.status
+            in (FileStatus.ADDED, FileStatus.MODIFIED, FileStatus.DELETED)
+        }
+        retried = []
+        for file_path in retry_files:
+            file_path = renamed_to.get(file_path, file_path)
+            if file_path not in covered:
+                covered.add(file_path)
+                retried.append(
+                    FileChange(status=FileStatus.MODIFIED, file_path=file_path)
+                )
+        return retried
+
+    def _result_cache_key(
+        self,
+        query: str,
+        n_results: int,
+        file_filter: Optional[str],
+        tag_filter: Optional[List[str]],
+        mode: str,
+        rerank: bool,
+        mmr_lambda: Optional[float],
+        max_chunks_per_file: Optional[int],
+        fields: Optional[List[str]],
+        snippet: bool,
+    ) -> Optional[Tuple]:
+        if self.result_cache is None:
+            return None
+        return (
+            self.vector_store.index_generation,
+            SearchResultCache.make_key(
+                query,
+                n_results,
+                file_filter,
+                tag_filter,
+                mode,
+                rerank,
+                mmr_lambda,
+                max_chunks_per_file,
+                fields,
+                snippet,
+            ),
+        )
+
+    def _get_cached_results(self, cache_key: Optional[Tuple]) -> Optional[List]:
+        if cache_key is None:
+            return None
+        return self.result_cache.get(*cache_key)
+
+    def _put_cached_results(
+        self, cache_key: Optional[Tuple], results: List, rerank: bool = False
+    ) -> None:
+        # Empty lists may come from a failed search; don't pin them until the next sync
+        if cache_key is None or not results:
+            return
+        # Nor results that fell back to vector order because reranking was late
+        if rerank and getattr(results[0], "rerank_score", None) is None:
+            return
+        self.result_cache.put(*cache_key, results)
+
     def search_documents(
         self,
         query: str,
         n_results: int = 10,
         file_filter: Optional[str] = None,
         tag_filter: Optional[List[str]] = None,
+        mode: str = "vector",
+        rerank: bool = False,
+        mmr_lambda: Optional[float] = None,
+        max_chunks_per_file: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        snippet: bool = False,
     ) -> List[Dict]:
         """Search documents in the vector store."""
-        return self.vector_store.search(
+        cache_key = self._result_cache_key(
+            query,
+            n_results,
+            file_filter,
+            tag_filter,
+            mode,
+            rerank,
+            mmr_lambda,
+            max_chunks_per_file,
+            fields,
+            snippet,
+        )
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+
+        results = self.vector_store.search(
             query=query,
             n_results=n_results,
             file_filter=file_filter,
             tag_filter=tag_filter,
+            mode=mode,
+            rerank=rerank,
+            mmr_lambda=mmr_lambda,
+            max_chunks_per_file=max_chunks_per_file,
+            fields=fields,
+            snippet=snippet,
         )
 
+        self._put_cached_results(cache_key, results, rerank)
+        return results
+
+    async def search_documents_async(
+        self,
+        query: str,
+        n_results: int = 10,
+        file_filter: Optional[str] = None,
+        tag_filter: Optional[List[str]] = None,
+        mode: str = "vector",
+        rerank: bool = False,
+        mmr_lambda: Optional[float] = None,
+        max_chunks_per_file: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        snippet: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Dict]:
+        """Search documents without blocking the event loop.
+
+        Raises asyncio.TimeoutError when the search does not finish in time.
+        """
+        cache_key = self._result_cache_key(
+            query,
+            n_results,
+            file_filter,
+            tag_filter,
+            mode,
+            rerank,
+            mmr_lambda,
+            max_chunks_per_file,
+            fields,
+            snippet,
+        )
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+
+        results = await asyncio.wait_for(
+            self.vector_store.search_async(
+                query=query,
+                n_results=n_results,
+                file_filter=file_filter,
+                tag_filter=tag_filter,
+                mode=mode,
+                rerank=rerank,
+                mmr_lambda=mmr_lambda,
+                max_chunks_per_file=max_chunks_per_file,
+                fields=fields,
+                snippet=snippet,
+            ),
+            timeout=timeout,
+        )
+
+        self._put_cached_results(cache_key, results, rerank)
+        return results
+
+    async def search_documents_batch_async(
+        self, requests: List[SearchRequest], timeout: Optional[float] = None
+    ) -> List[List[Dict]]:
+        """Run many searches in one vector store batch, one result list each.
+
+        Searches found in the result cache are answered from it; the rest
+        share one query encoding call. Raises asyncio.TimeoutError when the
+        batch does not finish in time.
+        """
+        cache_keys = [
+            self._result_cache_key(
+                request.query,
+                request.n_results,
+                request.file_filter,
+                request.tag_filter,
+                request.mode,
+                request.rerank,
+                request.mmr_lambda,
+                request.max_chunks_per_file,
+                request.fields,
+                request.snippet,
+            )
+            for request in requests
+        ]
+        results = [self._get_cached_results(cache_key) for cache_key in cache_keys]
+
+        pending = [i for i, cached in enumerate(results) if cached is None]
+        if pending:
+            batch_results = await asyncio.wait_for(
+                self.vector_store.search_batch_async([requests[i] for i in pending]),
+                timeout=timeout,
+            )
+            for i, request_results in zip(pending, batch_results):
+                results[i] = request_results
+                self._put_cached_results(
+                    cache_keys[i], request_results, requests[i].rerank
+                )
+
+        return results
+
+    async def find_similar_async(
+        self, request: SimilarRequest, timeout: Optional[float] = None
+    ) -> Optional[List[Dict]]:
+        """Find chunks related to an indexed note or chunk, or None if unknown.
+
+        Raises asyncio.TimeoutError when the lookup does not finish in time.
+        """
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = (
+                self.vector_store.index_generation,
+                (
+                    "similar",
+                    request.file_path,
+                    request.chunk_id,
+                    request.n_results,
+                    request.file_filter,
+                    tuple(sorted(request.tag_filter)) if request.tag_filter else None,
+                    request.max_chunks_per_file,
+                ),
+            )
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+
+        results = await asyncio.wait_for(
+            self.vector_store.find_similar_async(
+                file_path=request.file_path,
+                chunk_id=request.chunk_id,
+                n_results=request.n_results,
+                file_filter=request.file_filter,
+                tag_filter=request.tag_filter,
+                max_chunks_per_file=request.max_chunks_per_file,
+            ),
+            timeout=timeout,
+        )
+
+        if results is not None:
+            self._put_cached_results(cache_key, results)
+        return results
+
     async def get_repository_status(self) -> Dict[str, Any]:
         """Get current repository and vector store status."""
         try:
@@ -377,6 +838,8 @@ class SyncCoordinator:
 
             # Vector store stats
             vector_stats = await asyncio.to_thread(self.vector_store.get_stats)
+            if self.result_cache is not None:
+                vector_stats["result_cache"] = self.result_cache.get_stats()
 
             # Repository info
             repo_files = await asyncio.to_thread(
@@ -0,0 +1,105 @@
+"""Keeps the index fresh by starting incremental syncs automatically."""
+
+import asyncio
+from typing import Callable, Dict, Optional
+
+from .sync_coordinator import SyncCoordinator
+
+
+class SyncScheduler:
+    """Starts incremental sync jobs on a timer and on push notifications.
+
+    Polling first compares the remote branch head (a single ls-remote)
+    with the indexed commit, so an idle vault costs no fetch. Triggers are
+    debounced: a sync starts only once no new trigger arrived for
+    debounce_seconds, so a burst of pushes collapses into one sync.
+    """
+
+    def __init__(
+        self,
+        coordinator_factory: Callable[[], SyncCoordinator],
+        interval_seconds: float = 0,
+        debounce_seconds: float = 10,
+    ):
+        self.coordinator_factory = coordinator_factory
+        self.interval_seconds = interval_seconds  # 0 disables polling
+        self.debounce_seconds = debounce_seconds
+
+        self._trigger = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._polls = 0
+        self._notifications = 0
+        self._syncs_started = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def notify(self) -> None:
+        """Request a sync soon, e.g. from a push webhook."""
+        self._notifications += 1
+        self._trigger.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._wait_for_trigger()
+                await self._debounce()
+                await self._start_sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the loop alive; the next poll or push retries
+                print(f"Scheduled sync failed: {e}")
+
+    async def _wait_for_trigger(self) -> None:
+        """Return once notified or once a poll finds new remote commits."""
+        while True:
+            timeout = self.interval_seconds or None
+            try:
+                await asyncio.wait_for(self._trigger.wait(), timeout)
+                return
+            except asyncio.TimeoutError:
+                self._polls += 1
+                coordinator = self.coordinator_factory()
+                if await asyncio.to_thread(coordinator.has_remote_changes):
+                    return
+
+    async def _debounce(self) -> None:
+        while True:
+            self._trigger.clear()
+            try:
+                await asyncio.wait_for(self._trigger.wait(), self.debounce_seconds)
+            except asyncio.TimeoutError:
+                return
+
+    async def _start_sync(self) -> None:
+        job, created = self.coordinator_factory().start_job("sync")
+        if created:
+            self._syncs_started += 1
+            print(f"Started scheduled sync job {job.id}")
+            await asyncio.gather(job.task, return_exceptions=True)
+        else:
+            # Another job holds the index; sync again once it is done
+            await asyncio.gather(job.task, return_exceptions=True)
+            self._trigger.set()
+
+    def get_stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval_seconds,
+            "debounce_seconds": self.debounce_seconds,
+            "polls": self._polls,
+            "notifications": self._notifications,
+            "syncs_started": self._syncs_started,
+        }
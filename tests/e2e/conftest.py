@@ -1,9 +1,9 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
-from src.dependencies import get_git_manager, get_vector_store
+from src.dependencies import get_git_manager, get_vector_store, vector_store_registry
 from src.main import app
 from src.models import GitManager, VectorStore
 from src.schemas import FileChange, FileStatus, SearchResult
@@ -25,7 +25,7 @@ def get_mock_git_manager():
 def get_mock_vector_store():
     """Override for get_vector_store dependency."""
     mock_vs = Mock(spec=VectorStore)
-    mock_vs.search.return_value = [
+    mock_vs.search.return_value = mock_vs.search_async.return_value = [
         SearchResult(
             id="test.md#chunk_0",
             content="This is a test.",
@@ -37,6 +37,12 @@ def get_mock_vector_store():
             links=[],
         )
     ]
+    mock_vs.search_batch_async.side_effect = lambda requests: [
+        mock_vs.search.return_value for _ in requests
+    ]
+    mock_vs.find_similar_async.side_effect = lambda file_path=None, **kwargs: (
+        None if file_path == "missing.md" else mock_vs.search.return_value
+    )
     mock_vs.add_document.return_value = True
     mock_vs.process_file_changes.return_value = {
         "added": 0,
@@ -56,7 +62,11 @@ def client() -> TestClient:
     app.dependency_overrides[get_git_manager] = get_mock_git_manager
     app.dependency_overrides[get_vector_store] = get_mock_vector_store
 
-    with TestClient(app) as test_client:
+    # Skip preloading the real vector store in the app lifespan
+    with (
+        patch.object(vector_store_registry, "startup"),
+        TestClient(app) as test_client,
+    ):
         yield test_client
 
     app.dependency_overrides = {}  # Clear overrides after tests
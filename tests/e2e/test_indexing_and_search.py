@@ -2,6 +2,8 @@
 Search functionality tests - admin operations have been moved to admin app.
 """
 
+import json
+
 from fastapi.testclient import TestClient
 
 
@@ -44,6 +46,109 @@ class TestSearchFunctionality:
         )
         assert search_response.status_code == 400
 
+    def test_diversification_parameters_validation(self, client: TestClient):
+        """Test that out-of-range diversification parameters are rejected."""
+        for params in ({"mmr_lambda": 1.5}, {"max_chunks_per_file": 0}):
+            search_response = client.post(
+                "/api/obs-vctr-srch/search",
+                json={"query": "API", "n_results": 5, **params},
+            )
+            assert search_response.status_code == 400
+
+    def test_batch_search_returns_results_per_search(self, client: TestClient):
+        """Test that batch search answers every search in request order."""
+        search_response = client.post(
+            "/api/obs-vctr-srch/search/batch",
+            json={"searches": [{"query": "API"}, {"query": "test", "n_results": 3}]},
+        )
+        assert search_response.status_code == 200
+        results = search_response.json()["results"]
+        assert len(results) == 2
+        assert results[0][0]["file_path"] == "test.md"
+
+    def test_batch_search_limits(self, client: TestClient):
+        """Test that oversized or invalid batches are rejected."""
+        too_many = {"searches": [{"query": f"q{i}"} for i in range(33)]}
+        too_large = {
+            "searches": [{"query": f"q{i}", "n_results": 200} for i in range(6)]
+        }
+        invalid = {"searches": [{"query": "ok"}, {"query": " "}]}
+
+        for body in (too_many, too_large, invalid, {"searches": []}):
+            search_response = client.post("/api/obs-vctr-srch/search/batch", json=body)
+            assert search_response.status_code == 400
+
+        assert (
+            "searches[1]"
+            in client.post("/api/obs-vctr-srch/search/batch", json=invalid).json()[
+                "detail"
+            ]
+        )
+
+    def test_similar_endpoint(self, client: TestClient):
+        """Test more-like-this lookups by note and their error responses."""
+        similar_response = client.post(
+            "/api/obs-vctr-srch/similar", json={"file_path": "notes/a.md"}
+        )
+        assert similar_response.status_code == 200
+        assert similar_response.json()["results"][0]["file_path"] == "test.md"
+
+        missing_response = client.post(
+            "/api/obs-vctr-srch/similar", json={"file_path": "missing.md"}
+        )
+        assert missing_response.status_code == 404
+
+        for body in ({}, {"file_path": "a.md", "chunk_id": "a.md#chunk_0"}):
+            response = client.post("/api/obs-vctr-srch/similar", json=body)
+            assert response.status_code == 400
+
+    def test_search_stream_returns_ndjson(self, client: TestClient):
+        """Test that streamed results match the regular JSON response."""
+        body = {"query": "test", "n_results": 1}
+        stream_response = client.post("/api/obs-vctr-srch/search/stream", json=body)
+        search_response = client.post("/api/obs-vctr-srch/search", json=body)
+
+        assert stream_response.status_code == 200
+        assert stream_response.headers["content-type"] == "application/x-ndjson"
+        streamed = [json.loads(line) for line in stream_response.text.splitlines()]
+        assert streamed == search_response.json()["results"]
+
+        empty_response = client.post(
+            "/api/obs-vctr-srch/search/stream", json={"query": " "}
+        )
+        assert empty_response.status_code == 400
+
+    def test_search_fields_projection(self, client: TestClient):
+        """Test that only the requested fields (and id) are returned."""
+        body = {"query": "test", "n_results": 1, "fields": ["title", "file_path"]}
+        search_response = client.post("/api/obs-vctr-srch/search", json=body)
+        assert search_response.status_code == 200
+        assert set(search_response.json()["results"][0]) == {
+            "id",
+            "title",
+            "file_path",
+        }
+
+        stream_response = client.post("/api/obs-vctr-srch/search/stream", json=body)
+        assert set(json.loads(stream_response.text.splitlines()[0])) == {
+            "id",
+            "title",
+            "file_path",
+        }
+
+        batch_response = client.post(
+            "/api/obs-vctr-srch/search/batch",
+            json={"searches": [body, {"query": "test", "n_results": 1}]},
+        )
+        projected, full = batch_response.json()["results"]
+        assert set(projected[0]) == {"id", "title", "file_path"}
+        assert "content" in full[0]
+
+        unknown_response = client.post(
+            "/api/obs-vctr-srch/search", json={"query": "test", "fields": ["nope"]}
+        )
+        assert unknown_response.status_code == 400
+
     def test_admin_endpoints_removed(self, client: TestClient):
         """Test that admin endpoints have been properly removed from public API."""
         admin_endpoints = [
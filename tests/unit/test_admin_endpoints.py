@@ -5,6 +5,7 @@ from unittest.mock import Mock, patch
 from fastapi.testclient import TestClient
 
 from src.apps.admin.app import app
+from src.dependencies import get_job_manager
 
 
 class TestAdminStreamingEndpoints:
@@ -61,7 +62,7 @@ class TestAdminStreamingEndpoints:
         # Mock the coordinator to return successful rebuild
         mock_coordinator = Mock()
 
-        async def mock_rebuild_stream():
+        async def mock_rebuild_stream(resume=False):
             yield {
                 "type": "status",
                 "message": "Starting build index process...",
@@ -101,3 +102,23 @@ class TestAdminStreamingEndpoints:
         response = client.get("/build-index-monitor")
         assert response.status_code == 200
         assert response.headers["content-type"] == "text/html; charset=utf-8"
+
+    @patch("src.apps.admin.app.reload_embedding_model")
+    def test_reload_model_rejected_during_job(self, mock_reload):
+        """Test that the model cannot be swapped while an index job runs."""
+        job_manager = Mock()
+        app.dependency_overrides[get_job_manager] = lambda: job_manager
+        client = TestClient(app)
+        body = {"model_name": "other-model"}
+        try:
+            response = client.post("/api/reload-model", json=body)
+            assert response.status_code == 409
+            mock_reload.assert_not_called()
+
+            job_manager.active_job = None
+            mock_reload.return_value = {"current_model": "other-model"}
+            response = client.post("/api/reload-model", json=body)
+            assert response.status_code == 200
+            mock_reload.assert_called_once_with("other-model")
+        finally:
+            app.dependency_overrides.clear()
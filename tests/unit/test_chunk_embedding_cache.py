@@ -0,0 +1,46 @@
+"""Unit tests for ChunkEmbeddingCache class."""
+
+from unittest.mock import patch
+
+from src.models.chunk_embedding_cache import ChunkEmbeddingCache
+
+
+class TestChunkEmbeddingCache:
+    """Test cases for ChunkEmbeddingCache class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.hash_a = ChunkEmbeddingCache.content_hash("chunk a")
+        self.hash_b = ChunkEmbeddingCache.content_hash("chunk b")
+
+    def test_put_and_get_roundtrip(self, tmp_path):
+        """Test that embeddings persist across cache instances."""
+        cache = ChunkEmbeddingCache(tmp_path / "cache.db")
+        cache.put_many("model", {self.hash_a: [0.5, -1.0]})
+        cache.close()
+
+        cache = ChunkEmbeddingCache(tmp_path / "cache.db")
+        found = cache.get_many("model", [self.hash_a, self.hash_b])
+
+        assert found == {self.hash_a: [0.5, -1.0]}
+        assert cache.get_many("other-model", [self.hash_a]) == {}
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        cache.close()
+
+    def test_evict_unused(self, tmp_path):
+        """Test that entries not touched since a timestamp are evicted."""
+        cache = ChunkEmbeddingCache(tmp_path / "cache.db")
+        with patch("src.models.chunk_embedding_cache.time.time", return_value=100):
+            cache.put_many("model", {self.hash_a: [1.0], self.hash_b: [2.0]})
+        with patch("src.models.chunk_embedding_cache.time.time", return_value=200):
+            cache.get_many("model", [self.hash_a])
+
+        evicted = cache.evict_unused(since=150)
+
+        assert evicted == 1
+        assert cache.get_many("model", [self.hash_a, self.hash_b]) == {
+            self.hash_a: [1.0]
+        }
+        cache.close()
@@ -3,6 +3,9 @@
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import pytest
+from git import Repo
+
 from src.config.settings import Settings
 from src.models import GitManager
 from src.schemas import FileChange, FileStatus
@@ -18,6 +21,7 @@ class TestGitManager:
         self.settings.OBSIDIAN_LOCAL_PATH = "/tmp/test_repo"
         self.settings.OBSIDIAN_BRANCH = "main"
         self.settings.OBS_VAULT_TOKEN = "test_token"
+        self.settings.GIT_READ_FROM_OBJECTS = False
         self.git_manager = GitManager(self.settings)
 
     def test_init(self):
@@ -85,6 +89,7 @@ class TestGitManager:
         mock_origin.refs = {"main": Mock(commit=mock_remote_commit)}
         mock_repo.remotes.origin = mock_origin
         mock_repo.head.commit = mock_local_commit
+        mock_repo.commit.return_value = mock_local_commit
 
         mock_diff_item1 = Mock(
             change_type="M", a_path="test1.md", b_path="test1.md", renamed=False
@@ -110,6 +115,70 @@ class TestGitManager:
         assert result[1].file_path == "test2.md"
         assert result[1].status == FileStatus.ADDED
 
+    def test_read_notes_from_git_objects(self, tmp_path):
+        """Test listing and reading notes from a commit's tree."""
+        repo = Repo.init(tmp_path)
+        (tmp_path / "notes").mkdir()
+        (tmp_path / "notes" / "a.md").write_text("# A\nfirst", encoding="utf-8")
+        (tmp_path / "image.png").write_bytes(b"png")
+        repo.index.add(["notes/a.md", "image.png"])
+        first_commit = repo.index.commit("first")
+
+        (tmp_path / "notes" / "a.md").write_text("# A\nsecond", encoding="utf-8")
+        (tmp_path / "untracked.md").write_text("not committed", encoding="utf-8")
+        repo.index.add(["notes/a.md"])
+        repo.index.commit("second")
+        # Working tree changes must not leak into object reads
+        (tmp_path / "notes" / "a.md").write_text("dirty", encoding="utf-8")
+
+        self.settings.OBSIDIAN_LOCAL_PATH = str(tmp_path)
+        self.settings.GIT_READ_FROM_OBJECTS = True
+        git_manager = GitManager(self.settings)
+        git_manager.repo = repo
+
+        assert git_manager.get_all_markdown_files() == ["notes/a.md"]
+        assert git_manager.get_file_content("notes/a.md") == "# A\nsecond"
+        assert (
+            git_manager.get_file_content("notes/a.md", revision=first_commit.hexsha)
+            == "# A\nfirst"
+        )
+        assert git_manager.get_file_content("untracked.md") is None
+        repo.close()
+
+    def test_strict_markdown_listing_raises(self, tmp_path):
+        """Test that a strict listing reports git errors instead of no files."""
+        self.settings.OBSIDIAN_LOCAL_PATH = str(tmp_path)
+        self.settings.GIT_READ_FROM_OBJECTS = True
+        git_manager = GitManager(self.settings)
+
+        with patch("builtins.print"):
+            assert git_manager.get_all_markdown_files() == []
+        with pytest.raises(RuntimeError):
+            git_manager.get_all_markdown_files(strict=True)
+
+    def test_markdown_listing_cached_per_head(self, tmp_path):
+        """Test that tracked notes are listed from the index once per HEAD."""
+        repo = Repo.init(tmp_path)
+        (tmp_path / "a.md").write_text("a", encoding="utf-8")
+        repo.index.add(["a.md"])
+        repo.index.commit("first")
+        (tmp_path / "untracked.md").write_text("junk", encoding="utf-8")
+
+        self.settings.OBSIDIAN_LOCAL_PATH = str(tmp_path)
+        git_manager = GitManager(self.settings)
+
+        assert git_manager.get_all_markdown_files() == ["a.md"]
+
+        # Staged but uncommitted files don't invalidate the cached listing
+        (tmp_path / "b.md").write_text("b", encoding="utf-8")
+        repo.index.add(["b.md"])
+        assert git_manager.get_all_markdown_files() == ["a.md"]
+
+        repo.index.commit("second")
+        assert git_manager.get_all_markdown_files() == ["a.md", "b.md"]
+        git_manager.repo.close()
+        repo.close()
+
 
 class TestFileChange:
     """Test cases for FileChange model."""
@@ -0,0 +1,167 @@
+"""Unit tests for IngestPipeline class."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.models import GitManager, ObsidianProcessor, ParseWorkerPool, VectorStore
+from src.models.vector_store import EmbeddedBatch
+from src.processing import ObsidianDocument
+from src.services.ingest_pipeline import IngestPipeline
+
+
+def make_document(file_path: str) -> ObsidianDocument:
+    return ObsidianDocument(
+        file_path=file_path,
+        title=file_path,
+        content="Content",
+        metadata={},
+        tags=[],
+        links=[],
+        token_count=10,
+    )
+
+
+class TestIngestPipeline:
+    """Test cases for IngestPipeline class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_git_manager = Mock(spec=GitManager)
+        self.mock_processor = Mock(spec=ObsidianProcessor)
+        self.mock_vector_store = Mock(spec=VectorStore)
+
+        self.mock_git_manager.get_file_content.side_effect = lambda path, revision: (
+            None if path == "missing.md" else f"# {path}"
+        )
+        self.mock_processor.process_file.side_effect = (
+            lambda path, content: make_document(path)
+        )
+        self.mock_processor.split_content_for_embedding.return_value = [
+            {"content": "chunk"}
+        ]
+        self.mock_vector_store.embed_documents.return_value = EmbeddedBatch(
+            file_paths=[]
+        )
+
+        self.pipeline = IngestPipeline(
+            git_manager=self.mock_git_manager,
+            processor=self.mock_processor,
+            vector_store=self.mock_vector_store,
+            read_concurrency=2,
+            parse_concurrency=2,
+            queue_size=1,
+            batch_max_chunks=2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_run_processes_all_files(self):
+        """Test that every file ends up processed or failed."""
+        files = [f"doc{i}.md" for i in range(5)] + ["missing.md"]
+        stats = {
+            "processed": 0,
+            "failed": 0,
+            "unparseable": 0,
+            "total_chunks": 0,
+            "cached_chunks": 0,
+        }
+
+        events = [event async for event in self.pipeline.run(files, stats)]
+
+        assert stats == {
+            "processed": 5,
+            "failed": 1,
+            "unparseable": 0,
+            "total_chunks": 5,
+            "cached_chunks": 0,
+        }
+        completed = [e["file_path"] for e in events if e["type"] == "file_complete"]
+        assert sorted(completed) == [f"doc{i}.md" for i in range(5)]
+        # Five one-chunk files with a two-chunk budget make three batches
+        assert self.mock_vector_store.write_documents.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_run_falls_back_when_embedding_fails(self):
+        """Test that a failed batch embedding retries documents one by one."""
+        self.mock_vector_store.embed_documents.side_effect = RuntimeError("oom")
+        self.mock_vector_store.add_document.return_value = True
+        stats = {
+            "processed": 0,
+            "failed": 0,
+            "unparseable": 0,
+            "total_chunks": 0,
+            "cached_chunks": 0,
+        }
+
+        events = [e async for e in self.pipeline.run(["a.md", "b.md"], stats)]
+
+        assert stats["processed"] == 2
+        assert self.mock_vector_store.add_document.call_count == 2
+        self.mock_vector_store.write_documents.assert_not_called()
+        assert all(e["type"] != "error" for e in events)
+
+    @pytest.mark.asyncio
+    async def test_run_skips_unparseable_files(self):
+        """Test that unparseable files are counted apart from failures."""
+        self.mock_processor.process_file.side_effect = lambda path, content: (
+            None if path == "bad.md" else make_document(path)
+        )
+        stats = {
+            "processed": 0,
+            "failed": 0,
+            "unparseable": 0,
+            "total_chunks": 0,
+            "cached_chunks": 0,
+        }
+        written = []
+
+        async for _ in self.pipeline.run(
+            ["a.md", "bad.md"], stats, on_written=written.extend
+        ):
+            pass
+
+        assert (stats["processed"], stats["failed"], stats["unparseable"]) == (1, 0, 1)
+        assert sorted(written) == ["a.md", "bad.md"]
+
+    @pytest.mark.asyncio
+    async def test_run_uses_parse_pool(self):
+        """Test that the parse stage delegates to the process pool when enabled."""
+        parse_pool = Mock(spec=ParseWorkerPool)
+        parse_pool.enabled = True
+
+        async def parse(file_path, content):
+            return make_document(file_path), ["text"]
+
+        parse_pool.parse.side_effect = parse
+        self.mock_processor.create_chunks.return_value = [{"content": "text"}]
+        self.pipeline.parse_pool = parse_pool
+        stats = {
+            "processed": 0,
+            "failed": 0,
+            "unparseable": 0,
+            "total_chunks": 0,
+            "cached_chunks": 0,
+        }
+
+        async for _ in self.pipeline.run(["a.md", "b.md"], stats):
+            pass
+
+        assert stats["processed"] == 2
+        assert parse_pool.parse.call_count == 2
+        self.mock_processor.process_file.assert_not_called()
+
+    def test_parse_concurrency_covers_pool_workers(self):
+        """Test that an enabled pool gets at least one parse worker per process."""
+        parse_pool = Mock(spec=ParseWorkerPool)
+        parse_pool.enabled = True
+        parse_pool.max_workers = 6
+
+        pipeline = IngestPipeline(
+            git_manager=self.mock_git_manager,
+            processor=self.mock_processor,
+            vector_store=self.mock_vector_store,
+            parse_concurrency=2,
+            parse_pool=parse_pool,
+        )
+
+        assert pipeline.parse_concurrency == 6
@@ -0,0 +1,105 @@
+"""Unit tests for JobManager class."""
+
+import asyncio
+
+import pytest
+
+from src.services import JobManager
+
+
+class TestJobManager:
+    """Test cases for JobManager class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.job_manager = JobManager(max_finished_jobs=2, max_events=100)
+        self.release = None
+
+    def make_stream(self, count=3):
+        """Return a stream factory that waits for release before finishing."""
+
+        async def stream():
+            for i in range(count):
+                yield {"type": "progress", "message": f"step {i}", "progress": i}
+            await self.release.wait()
+            yield {"type": "complete", "message": "done", "stats": {"processed": 3}}
+
+        return stream
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self):
+        """Test that starting a job while one runs joins the running job."""
+        self.release = asyncio.Event()
+        job, created = self.job_manager.start("rebuild", self.make_stream())
+        other, other_created = self.job_manager.start("sync", self.make_stream())
+
+        assert created is True
+        assert other_created is False
+        assert other is job
+
+        self.release.set()
+        await job.task
+        assert job.status == "completed"
+        assert job.result == {"processed": 3}
+
+        _, created_after = self.job_manager.start("sync", self.make_stream(0))
+        assert created_after is True
+
+    @pytest.mark.asyncio
+    async def test_late_subscriber_replays_events(self):
+        """Test that a subscriber joining mid-job sees every event."""
+        self.release = asyncio.Event()
+        job, _ = self.job_manager.start("rebuild", self.make_stream())
+        await asyncio.sleep(0.01)
+
+        async def collect():
+            return [event async for event in self.job_manager.subscribe(job)]
+
+        subscriber = asyncio.create_task(collect())
+        await asyncio.sleep(0.01)
+        self.release.set()
+        events = await subscriber
+
+        assert [e["message"] for e in events] == ["step 0", "step 1", "step 2", "done"]
+        assert job.progress == 2
+        assert job.message == "done"
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_job(self):
+        """Test that cancellation is honoured at the next event."""
+        gate = asyncio.Event()
+        cleaned_up = []
+
+        async def stream():
+            try:
+                yield {"type": "status", "message": "started"}
+                await gate.wait()
+                yield {"type": "progress", "message": "step"}
+                yield {"type": "complete", "message": "never reached"}
+            finally:
+                cleaned_up.append(True)
+
+        job, _ = self.job_manager.start("sync", stream)
+        await asyncio.sleep(0.01)
+        self.job_manager.cancel(job.id)
+        gate.set()
+        await job.task
+
+        assert job.status == "cancelled"
+        assert job.events[-1]["type"] == "cancelled"
+        assert "never reached" not in [e["message"] for e in job.events]
+        assert cleaned_up == [True]
+
+    @pytest.mark.asyncio
+    async def test_error_event_marks_job_failed(self):
+        """Test that a stream ending with an error event fails the job."""
+
+        async def stream():
+            yield {"type": "error", "message": "Failed to pull changes"}
+
+        job, _ = self.job_manager.start("sync", stream)
+        await job.task
+
+        assert job.status == "failed"
+        assert self.job_manager.get(job.id) is job
+        assert self.job_manager.active_job is None
@@ -0,0 +1,81 @@
+"""Unit tests for LexicalIndex class."""
+
+from src.models.lexical_index import LexicalIndex, tokenize
+
+
+class TestLexicalIndex:
+    """Test cases for LexicalIndex class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.ids = ["a.md#chunk_1", "a.md#chunk_2", "b.md#chunk_1"]
+        self.file_paths = ["a.md", "a.md", "b.md"]
+        self.texts = [
+            "Deploy with kubectl apply",
+            "Notes about the weather",
+            "kubectl kubectl rollout restart",
+        ]
+
+    def test_tokenize_keeps_identifiers_and_parts(self):
+        """Test that compound identifiers are indexed whole and by part."""
+        assert tokenize("Call get_user_id in v1.2") == [
+            "call",
+            "get_user_id",
+            "get",
+            "user",
+            "id",
+            "in",
+            "v1.2",
+            "v1",
+            "2",
+        ]
+
+    def test_tokenize_splits_cjk_into_bigrams(self):
+        """Test that text without word spaces is indexed as bigrams."""
+        assert tokenize("東京都") == ["東京", "京都"]
+
+    def test_search_ranks_by_bm25(self, tmp_path):
+        """Test that chunks with more occurrences of a rare term rank first."""
+        index = LexicalIndex(tmp_path / "lexical.sqlite3")
+        index.add_chunks(self.ids, self.file_paths, self.texts)
+
+        hits = index.search("kubectl", 10)
+
+        assert [chunk_id for chunk_id, _ in hits] == ["b.md#chunk_1", "a.md#chunk_1"]
+        assert index.search("missing", 10) == []
+        index.close()
+
+    def test_incremental_updates_persist(self, tmp_path):
+        """Test that re-adding and removing chunks updates the stored index."""
+        index = LexicalIndex(tmp_path / "lexical.sqlite3")
+        index.add_chunks(self.ids, self.file_paths, self.texts)
+        index.add_chunks(["a.md#chunk_2"], ["a.md"], ["kubectl weather"])
+        index.remove_files(["b.md"])
+        index.close()
+
+        index = LexicalIndex(tmp_path / "lexical.sqlite3")
+        hits = index.search("kubectl", 10)
+
+        assert sorted(chunk_id for chunk_id, _ in hits) == [
+            "a.md#chunk_1",
+            "a.md#chunk_2",
+        ]
+        assert index.search("notes", 10) == []
+        assert index.get_stats() == {"chunks": 2, "complete": False}
+
+        index.remove_chunks(["a.md#chunk_1", "a.md#chunk_2"])
+        assert index.get_stats()["chunks"] == 0
+        index.close()
+
+    def test_clear_and_destroy(self, tmp_path):
+        """Test that a cleared index is complete and destroy removes its files."""
+        path = tmp_path / "lexical.sqlite3"
+        index = LexicalIndex(path)
+        index.add_chunks(self.ids, self.file_paths, self.texts)
+
+        index.clear()
+        assert index.search("kubectl", 10) == []
+        assert index.complete
+
+        index.destroy()
+        assert not path.exists()
@@ -4,8 +4,7 @@ from datetime import datetime
 from unittest.mock import Mock, patch
 
 from src.config.settings import Settings
-from src.models import ObsidianProcessor
-from src.models.obsidian_processor import ObsidianDocument
+from src.processing import ObsidianDocument, ObsidianProcessor
 
 
 class TestObsidianProcessor:
@@ -0,0 +1,49 @@
+"""Unit tests for ParseWorkerPool class."""
+
+from src.processing import ObsidianProcessor, ParseWorkerPool
+
+
+class TestParseWorkerPool:
+    """Test cases for ParseWorkerPool class."""
+
+    async def test_parse_matches_in_process_result(self):
+        """Test that worker processes produce the same document and chunks."""
+        content = "---\ntags: [a]\n---\n# Title\n\nFirst paragraph.\n\nSecond."
+        pool = ParseWorkerPool(max_workers=1)
+
+        try:
+            document, texts = await pool.parse("note.md", content)
+        finally:
+            pool.shutdown()
+
+        processor = ObsidianProcessor(settings=None)
+        expected = processor.process_file("note.md", content)
+        assert document == expected
+        assert processor.create_chunks(
+            document, texts
+        ) == processor.split_content_for_embedding(expected)
+
+    async def test_workers_do_not_import_embedding_stack(self):
+        """Test that workers start without loading src.models (ChromaDB, torch)."""
+        pool = ParseWorkerPool(max_workers=1)
+
+        try:
+            await pool.parse("note.md", "# Title")
+            executor = pool._get_executor()
+            loaded = executor.submit(_loaded_modules).result(timeout=30)
+        finally:
+            pool.shutdown()
+
+        assert "src.processing.parse_worker" in loaded
+        assert "src.models" not in loaded
+        assert "chromadb" not in loaded
+
+    def test_disabled_without_workers(self):
+        """Test that a zero-sized pool is disabled."""
+        assert not ParseWorkerPool(max_workers=0).enabled
+
+
+def _loaded_modules():
+    import sys
+
+    return set(sys.modules)
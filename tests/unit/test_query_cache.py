@@ -0,0 +1,58 @@
+"""Unit tests for QueryEmbeddingCache class."""
+
+from unittest.mock import patch
+
+from src.models.query_cache import QueryEmbeddingCache
+
+
+class TestQueryEmbeddingCache:
+    """Test cases for QueryEmbeddingCache class."""
+
+    def test_hit_after_put_with_normalized_query(self):
+        """Test that whitespace variants of a query share an entry."""
+        cache = QueryEmbeddingCache(max_entries=4)
+        cache.put("model", "hello   world", [0.1, 0.2])
+
+        assert cache.get("model", "  hello world ") == [0.1, 0.2]
+        assert cache.get("other-model", "hello world") is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = QueryEmbeddingCache(max_entries=2)
+        cache.put("model", "a", [1.0])
+        cache.put("model", "b", [2.0])
+        cache.get("model", "a")
+        cache.put("model", "c", [3.0])
+
+        assert cache.get("model", "b") is None
+        assert cache.get("model", "a") == [1.0]
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_byte_cap_eviction(self):
+        """Test that the byte cap bounds the cache size."""
+        cache = QueryEmbeddingCache(max_entries=100, max_bytes=100)
+        cache.put("m", "a", [0.0] * 10)
+        cache.put("m", "b", [0.0] * 10)
+
+        assert cache.get_stats()["entries"] == 1
+        assert cache.get("m", "b") is not None
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses."""
+        cache = QueryEmbeddingCache(max_entries=4, ttl_seconds=10)
+        with patch("src.models.query_cache.time.monotonic", return_value=0):
+            cache.put("model", "a", [1.0])
+        with patch("src.models.query_cache.time.monotonic", return_value=11):
+            assert cache.get("model", "a") is None
+
+    def test_disabled_cache(self):
+        """Test that a zero-sized cache stores nothing."""
+        cache = QueryEmbeddingCache(max_entries=0)
+        cache.put("model", "a", [1.0])
+
+        assert cache.get("model", "a") is None
+        assert cache.get_stats()["misses"] == 0
@@ -0,0 +1,100 @@
+"""Unit tests for QueryEncoder class."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.models.query_encoder import QueryEncoder
+
+
+class TestQueryEncoder:
+    """Test cases for QueryEncoder class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.calls = []
+
+        def encode_fn(queries):
+            self.calls.append(list(queries))
+            return [[float(len(query))] for query in queries]
+
+        self.encode_fn = encode_fn
+
+    def test_concurrent_queries_share_one_batch(self):
+        """Test that queries arriving within the window are encoded together."""
+        encoder = QueryEncoder(self.encode_fn, max_batch_size=4, max_wait_ms=200)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(encoder.encode, ["a", "bb", "ccc", "dddd"]))
+        encoder.close()
+
+        assert results == [[1.0], [2.0], [3.0], [4.0]]
+        assert len(self.calls) == 1
+        stats = encoder.get_stats()
+        assert stats["batches"] == 1
+        assert stats["max_batch_size"] == 4
+
+    def test_disabled_encodes_directly(self):
+        """Test that a zero window bypasses the worker thread."""
+        encoder = QueryEncoder(self.encode_fn, max_batch_size=4, max_wait_ms=0)
+
+        assert encoder.encode("abc") == [3.0]
+        assert not encoder.enabled
+        assert encoder.get_stats()["queries"] == 1
+
+    def test_encode_batch_counts_as_one_batch(self):
+        """Test that a caller-assembled batch is encoded once and recorded."""
+        encoder = QueryEncoder(self.encode_fn, max_batch_size=4, max_wait_ms=200)
+
+        assert encoder.encode_batch(["a", "bb", "ccc"]) == [[1.0], [2.0], [3.0]]
+        assert encoder.encode_batch([]) == []
+        encoder.close()
+
+        assert self.calls == [["a", "bb", "ccc"]]
+        stats = encoder.get_stats()
+        assert stats["batches"] == 1
+        assert stats["queries"] == 3
+        assert stats["max_batch_size"] == 3
+
+    @pytest.mark.asyncio
+    async def test_async_queries_coalesce_beyond_thread_count(self):
+        """Test that queries arriving during an encode share the next batch."""
+        encoder = QueryEncoder(self.encode_fn, max_batch_size=32, max_wait_ms=1000)
+        queries = ["q" * (i + 1) for i in range(40)]
+
+        results = await asyncio.gather(*(encoder.encode_async(q) for q in queries))
+
+        assert results == [[float(len(q))] for q in queries]
+        # The first query goes out at once; the other 39 gathered meanwhile
+        assert [len(call) for call in self.calls] == [1, 32, 7]
+        assert encoder.get_stats()["max_batch_size"] == 32
+
+    @pytest.mark.asyncio
+    async def test_lone_async_query_does_not_wait(self):
+        """Test that a query with no encode running skips the wait window."""
+        encoder = QueryEncoder(self.encode_fn, max_batch_size=32, max_wait_ms=10000)
+
+        embedding = await asyncio.wait_for(encoder.encode_async("abc"), timeout=5)
+
+        assert embedding == [3.0]
+
+    def test_encode_errors_propagate(self):
+        """Test that a failing encode call is raised to every caller."""
+
+        def failing_encode(queries):
+            raise ValueError("boom")
+
+        encoder = QueryEncoder(failing_encode, max_batch_size=4, max_wait_ms=1)
+
+        with pytest.raises(ValueError):
+            encoder.encode("abc")
+        encoder.close()
+
+    def test_encode_after_close_raises(self):
+        """Test that a closed encoder rejects new queries."""
+        encoder = QueryEncoder(self.encode_fn, max_batch_size=4, max_wait_ms=1)
+        encoder.close()
+
+        with pytest.raises(RuntimeError):
+            encoder.encode("abc")
@@ -0,0 +1,48 @@
+"""Unit tests for RebuildCheckpoint class."""
+
+from src.models import RebuildCheckpoint
+
+
+class TestRebuildCheckpoint:
+    """Test cases for RebuildCheckpoint class."""
+
+    def test_load_without_checkpoint(self, tmp_path):
+        """Test that a missing checkpoint loads as None."""
+        checkpoint = RebuildCheckpoint(tmp_path / "rebuild_checkpoint.jsonl")
+        assert checkpoint.load() is None
+
+    def test_roundtrip_and_clear(self, tmp_path):
+        """Test recording completed files and clearing the checkpoint."""
+        checkpoint = RebuildCheckpoint(tmp_path / "rebuild_checkpoint.jsonl")
+        checkpoint.start("abc123")
+        checkpoint.mark_completed(["a.md", "notes/b.md"])
+        checkpoint.mark_completed(["c.md"])
+
+        state = checkpoint.load()
+
+        assert state["commit"] == "abc123"
+        assert state["completed_files"] == {"a.md", "notes/b.md", "c.md"}
+
+        checkpoint.clear()
+        assert checkpoint.load() is None
+
+    def test_start_discards_previous_progress(self, tmp_path):
+        """Test that starting a new rebuild resets the completed files."""
+        checkpoint = RebuildCheckpoint(tmp_path / "rebuild_checkpoint.jsonl")
+        checkpoint.start("old")
+        checkpoint.mark_completed(["a.md"])
+
+        checkpoint.start("new")
+
+        assert checkpoint.load() == {"commit": "new", "completed_files": set()}
+
+    def test_ignores_torn_last_line(self, tmp_path):
+        """Test that a partially written line from a crash is skipped."""
+        path = tmp_path / "rebuild_checkpoint.jsonl"
+        checkpoint = RebuildCheckpoint(path)
+        checkpoint.start("abc123")
+        checkpoint.mark_completed(["a.md"])
+        with path.open("a", encoding="utf-8") as f:
+            f.write('"b.m')
+
+        assert checkpoint.load()["completed_files"] == {"a.md"}
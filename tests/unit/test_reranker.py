@@ -0,0 +1,74 @@
+"""Unit tests for CrossEncoderReranker class."""
+
+from unittest.mock import Mock, patch
+
+from src.models.reranker import CrossEncoderReranker
+from src.schemas import SearchResult
+
+
+class TestCrossEncoderReranker:
+    """Test cases for CrossEncoderReranker class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.reranker = CrossEncoderReranker("test-cross-encoder", batch_size=2)
+        self.reranker.model = Mock()
+        # Longer texts score higher
+        self.reranker.model.predict.side_effect = lambda pairs, **kwargs: [
+            float(len(text)) for _, text in pairs
+        ]
+
+    @staticmethod
+    def _candidates(*contents):
+        return [
+            SearchResult(
+                id=f"chunk{i}",
+                content=content,
+                distance=0.1 * i,
+                file_path="note.md",
+                title="Note",
+                chunk_index=i,
+                tags=[],
+                links=[],
+            )
+            for i, content in enumerate(contents)
+        ]
+
+    def test_rerank_orders_by_score_in_batches(self):
+        """Test that candidates are scored in batches and sorted by score."""
+        results = self.reranker.rerank("query", self._candidates("a", "ccc", "bb"))
+
+        assert [result.id for result in results] == ["chunk1", "chunk2", "chunk0"]
+        assert results[0].rerank_score == 3.0
+        assert self.reranker.model.predict.call_count == 2
+
+    def test_rerank_reuses_cached_scores(self):
+        """Test that pairs scored before are not sent to the model again."""
+        self.reranker.rerank("query", self._candidates("a", "bb"))
+        self.reranker.model.predict.reset_mock()
+
+        self.reranker.rerank("query", self._candidates("bb", "ccc"))
+
+        pairs = self.reranker.model.predict.call_args.args[0]
+        assert pairs == [("query", "ccc")]
+        assert self.reranker.get_stats()["cache_hits"] == 1
+
+    def test_rerank_degrades_when_budget_is_exceeded(self):
+        """Test that running out of budget keeps the first-stage order."""
+        self.reranker.budget = 0.5
+        with patch("src.models.reranker.time.monotonic", side_effect=[0.0, 0.1, 0.7]):
+            results = self.reranker.rerank("query", self._candidates("a", "b", "c"))
+
+        assert results is None
+        assert self.reranker.model.predict.call_count == 1
+        assert self.reranker.get_stats()["degraded"] == 1
+
+    def test_rerank_degrades_until_model_is_loaded(self):
+        """Test that the first request starts loading the model and is not reranked."""
+        reranker = CrossEncoderReranker("test-cross-encoder")
+        with patch("src.models.reranker.CrossEncoder") as mock_cross_encoder:
+            assert reranker.rerank("query", self._candidates("a")) is None
+            reranker._loader.join()
+
+        mock_cross_encoder.assert_called_once_with("test-cross-encoder")
+        assert reranker.ready
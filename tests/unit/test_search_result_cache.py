@@ -0,0 +1,52 @@
+"""Unit tests for SearchResultCache class."""
+
+from src.services import SearchResultCache
+
+
+class TestSearchResultCache:
+    """Test cases for SearchResultCache class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = SearchResultCache(max_entries=2)
+        self.key = SearchResultCache.make_key("query", 10, None, ["b", "a"])
+
+    def test_make_key_ignores_tag_order(self):
+        """Test that tag filters are order-insensitive in keys."""
+        assert self.key == SearchResultCache.make_key("query", 10, None, ["a", "b"])
+
+    def test_hit_within_generation(self):
+        """Test that results are served within the same generation."""
+        self.cache.get(1, self.key)
+        self.cache.put(1, self.key, ["result"])
+
+        assert self.cache.get(1, self.key) == ["result"]
+        assert self.cache.get_stats()["hits"] == 1
+
+    def test_new_generation_invalidates(self):
+        """Test that a new index generation drops all cached results."""
+        self.cache.get(1, self.key)
+        self.cache.put(1, self.key, ["result"])
+
+        assert self.cache.get(2, self.key) is None
+        stats = self.cache.get_stats()
+        assert stats["entries"] == 0
+        assert stats["invalidations"] == 1
+
+    def test_stale_put_is_ignored(self):
+        """Test that results computed against an old generation are dropped."""
+        self.cache.get(1, self.key)
+        self.cache.get(2, self.key)
+        self.cache.put(1, self.key, ["stale"])
+
+        assert self.cache.get(2, self.key) is None
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        keys = [SearchResultCache.make_key(q, 10, None, None) for q in "abc"]
+        self.cache.get(1, keys[0])
+        for key in keys:
+            self.cache.put(1, key, [key])
+
+        assert self.cache.get(1, keys[0]) is None
+        assert self.cache.get(1, keys[2]) == [keys[2]]
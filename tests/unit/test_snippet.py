@@ -0,0 +1,40 @@
+"""Unit tests for search result snippets."""
+
+from src.models.snippet import highlight, make_snippet
+
+
+class TestMakeSnippet:
+    """Test cases for make_snippet."""
+
+    def test_window_grows_around_best_sentence(self):
+        """Test that neighbouring sentences are added while they fit."""
+        content = "First line. Restart the kubectl rollout. Last line."
+
+        assert make_snippet("kubectl", content, max_chars=100) == (
+            "First line. Restart the **kubectl** rollout. Last line."
+        )
+        assert make_snippet("kubectl", content, max_chars=30) == (
+            "…Restart the **kubectl** rollout.…"
+        )
+
+    def test_long_sentence_is_cut_around_match(self):
+        """Test that a sentence longer than the limit keeps the matched part."""
+        content = "word " * 50 + "needle " + "word " * 50
+
+        snippet = make_snippet("needle", content, max_chars=60)
+
+        assert snippet.startswith("…") and snippet.endswith("…")
+        assert "**needle**" in snippet
+        assert len(snippet) <= 60 + len("…" * 2 + "****")
+
+    def test_no_match_falls_back_to_start(self):
+        """Test that content without query terms starts from the beginning."""
+        assert make_snippet("absent", "One. Two. Three.", max_chars=9) == "One. Two.…"
+
+    def test_highlight_prefers_whole_identifiers(self):
+        """Test that identifiers win over their parts and words stay whole."""
+        text = "Call get_user_id, not user or username."
+
+        assert highlight(text, {"get_user_id", "user"}) == (
+            "Call **get_user_id**, not **user** or username."
+        )
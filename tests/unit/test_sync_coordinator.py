@@ -1,13 +1,15 @@
 """Unit tests for SyncCoordinator class."""
 
+import asyncio
 from unittest.mock import Mock
 
 import pytest
 
-from src.models import GitManager, ObsidianProcessor, VectorStore
-from src.models.obsidian_processor import ObsidianDocument
-from src.schemas import FileChange, FileStatus
-from src.services import SyncCoordinator
+from src.models import GitManager, ObsidianProcessor, RebuildCheckpoint, VectorStore
+from src.models.vector_store import EmbeddedBatch
+from src.processing import ObsidianDocument
+from src.schemas import FileChange, FileStatus, SearchRequest
+from src.services import JobManager, SearchResultCache, SyncCoordinator
 
 
 class TestSyncCoordinator:
@@ -18,6 +20,14 @@ class TestSyncCoordinator:
         self.mock_git_manager = Mock(spec=GitManager)
         self.mock_vector_store = Mock(spec=VectorStore)
         self.mock_processor = Mock(spec=ObsidianProcessor)
+        self.mock_vector_store.embed_documents.return_value = EmbeddedBatch(
+            file_paths=[]
+        )
+        self.mock_git_manager.fetch_remote_head.return_value = "remote-sha"
+        self.mock_git_manager.get_head_commit.return_value = "head-sha"
+        self.mock_git_manager.has_commit.return_value = True
+        self.mock_vector_store.get_indexed_commit.return_value = "indexed-sha"
+        self.mock_vector_store.get_failed_files.return_value = []
 
         self.coordinator = SyncCoordinator(
             git_manager=self.mock_git_manager,
@@ -34,7 +44,7 @@ class TestSyncCoordinator:
     @pytest.mark.asyncio
     async def test_incremental_sync_stream_no_changes(self):
         """Test incremental sync stream when no changes exist."""
-        self.mock_git_manager.get_changed_files.return_value = []
+        self.mock_git_manager.get_changes_between.return_value = []
 
         results = []
         async for progress in self.coordinator.incremental_sync_stream():
@@ -60,7 +70,7 @@ class TestSyncCoordinator:
             FileChange(file_path="doc2.md", status=FileStatus.ADDED),
             FileChange(file_path="doc3.md", status=FileStatus.DELETED),
         ]
-        self.mock_git_manager.get_changed_files.return_value = changes
+        self.mock_git_manager.get_changes_between.return_value = changes
         self.mock_git_manager.pull_changes.return_value = True
 
         self.mock_vector_store.process_file_changes.return_value = {
@@ -111,11 +121,149 @@ class TestSyncCoordinator:
         assert final_result["stats"]["deleted"] == 1
         assert final_result["stats"]["total_chunks"] == 2
 
+    @pytest.mark.asyncio
+    async def test_incremental_sync_stream_reads_objects_at_target(self):
+        """Test that object mode reads notes at the fetched commit without pulling."""
+        self.mock_git_manager.read_from_objects = True
+        self.mock_git_manager.get_changes_between.return_value = [
+            FileChange(file_path="doc1.md", status=FileStatus.MODIFIED)
+        ]
+        self.mock_vector_store.process_file_changes.return_value = {}
+        self.mock_git_manager.get_file_content.return_value = "Content"
+        self.mock_processor.process_file.return_value = ObsidianDocument(
+            file_path="doc1.md",
+            title="Doc 1",
+            content="Content",
+            metadata={},
+            tags=[],
+            links=[],
+        )
+        self.mock_processor.split_content_for_embedding.return_value = [
+            {"content": "chunk"}
+        ]
+        self.mock_vector_store.add_document.return_value = True
+
+        results = [p async for p in self.coordinator.incremental_sync_stream()]
+
+        assert results[-1]["type"] == "complete"
+        self.mock_git_manager.pull_changes.assert_not_called()
+        self.mock_git_manager.get_file_content.assert_called_once_with(
+            "doc1.md", "remote-sha"
+        )
+
+    @pytest.mark.asyncio
+    async def test_rebuild_index_stream_reads_objects_at_fetched_head(self):
+        """Test that an object-mode rebuild indexes the fetched commit as is."""
+        self.mock_git_manager.read_from_objects = True
+        self.mock_git_manager.repo = Mock()
+        self.mock_git_manager.get_all_markdown_files.return_value = []
+
+        results = [p async for p in self.coordinator.rebuild_index_stream()]
+
+        assert results[-1]["type"] == "complete"
+        self.mock_git_manager.pull_changes.assert_not_called()
+        self.mock_git_manager.get_all_markdown_files.assert_called_once_with(
+            "remote-sha", strict=True
+        )
+        self.mock_vector_store.set_indexed_commit.assert_called_once_with("remote-sha")
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_stream_uses_indexed_commit(self):
+        """Test that syncs diff from the watermark and advance it on success."""
+        changes = [FileChange(file_path="doc1.md", status=FileStatus.DELETED)]
+        self.mock_git_manager.get_changes_between.return_value = changes
+        self.mock_git_manager.pull_changes.return_value = True
+        self.mock_vector_store.process_file_changes.return_value = {"deleted": 1}
+
+        async for _ in self.coordinator.incremental_sync_stream():
+            pass
+
+        self.mock_git_manager.get_changes_between.assert_called_once_with(
+            "indexed-sha", "remote-sha"
+        )
+        self.mock_vector_store.set_indexed_commit.assert_called_once_with("remote-sha")
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_stream_records_failed_files(self):
+        """Test that a failed file advances the watermark and is kept for retry."""
+        self.mock_vector_store.get_indexed_commit.return_value = None
+        changes = [FileChange(file_path="doc1.md", status=FileStatus.MODIFIED)]
+        self.mock_git_manager.get_changes_between.return_value = changes
+        self.mock_git_manager.pull_changes.return_value = True
+        self.mock_vector_store.process_file_changes.return_value = {}
+        self.mock_git_manager.get_file_content.return_value = None
+
+        results = []
+        async for progress in self.coordinator.incremental_sync_stream():
+            results.append(progress)
+
+        # Without a watermark the diff starts at the checked-out HEAD
+        self.mock_git_manager.get_changes_between.assert_called_once_with(
+            "head-sha", "remote-sha"
+        )
+        self.mock_vector_store.set_indexed_commit.assert_called_once_with("remote-sha")
+        self.mock_vector_store.set_failed_files.assert_called_once_with(["doc1.md"])
+        assert results[-1]["stats"]["failed"] == 1
+        assert results[-1]["stats"]["indexed_commit"] == "remote-sha"
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_stream_retries_failed_files(self):
+        """Test that files an earlier sync failed on are retried on their own."""
+        self.mock_vector_store.get_failed_files.return_value = [
+            "broken.md",
+            "gone.md",
+            "old.md",
+        ]
+        self.mock_git_manager.get_changes_between.return_value = [
+            FileChange(file_path="gone.md", status=FileStatus.DELETED),
+            FileChange(
+                file_path="new.md", old_file_path="old.md", status=FileStatus.RENAMED
+            ),
+        ]
+        self.mock_git_manager.pull_changes.return_value = True
+        self.mock_vector_store.process_file_changes.return_value = {}
+        self.mock_git_manager.get_file_content.return_value = "Content"
+        self.mock_processor.process_file.side_effect = lambda path, content: (
+            None
+            if path == "broken.md"
+            else ObsidianDocument(
+                file_path=path,
+                title=path,
+                content=content,
+                metadata={},
+                tags=[],
+                links=[],
+            )
+        )
+        self.mock_processor.split_content_for_embedding.return_value = [
+            {"content": "chunk"}
+        ]
+        self.mock_vector_store.add_document.return_value = True
+
+        results = [p async for p in self.coordinator.incremental_sync_stream()]
+
+        processed = [
+            call.args[0] for call in self.mock_processor.process_file.call_args_list
+        ]
+        assert processed == ["broken.md", "new.md"]
+        assert results[-1]["stats"]["retried"] == 2
+        self.mock_vector_store.set_failed_files.assert_called_once_with(["broken.md"])
+        self.mock_vector_store.set_indexed_commit.assert_called_once_with("remote-sha")
+
+    def test_has_remote_changes(self):
+        """Test the cheap remote check against the indexed commit."""
+        self.mock_git_manager.get_remote_head.return_value = "indexed-sha"
+        assert self.coordinator.has_remote_changes() is False
+
+        self.mock_git_manager.get_remote_head.return_value = "remote-sha"
+        assert self.coordinator.has_remote_changes() is True
+        self.mock_git_manager.fetch_remote_head.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_incremental_sync_stream_pull_failure(self):
         """Test incremental sync stream when git pull fails."""
         changes = [FileChange(file_path="doc1.md", status=FileStatus.MODIFIED)]
-        self.mock_git_manager.get_changed_files.return_value = changes
+        self.mock_git_manager.get_changes_between.return_value = changes
         self.mock_git_manager.pull_changes.return_value = False
         self.mock_vector_store.process_file_changes.return_value = {}
 
@@ -140,9 +288,6 @@ class TestSyncCoordinator:
         self.mock_git_manager.repo = None
         self.mock_git_manager.setup_repository.return_value = True
 
-        # Mock clear collection
-        self.mock_vector_store.clear_collection.return_value = {"success": True}
-
         # Mock markdown files
         self.mock_git_manager.get_all_markdown_files.return_value = [
             "doc1.md",
@@ -173,7 +318,6 @@ class TestSyncCoordinator:
             [{"content": "chunk1"}],
             [{"content": "chunk2"}],
         ]
-        self.mock_vector_store.add_document.side_effect = [True, True]
 
         results = []
         async for progress in self.coordinator.rebuild_index_stream():
@@ -192,6 +336,220 @@ class TestSyncCoordinator:
         assert final_result is not None
         assert final_result["stats"]["processed"] == 2
         assert final_result["stats"]["failed"] == 0
+        self.mock_vector_store.evict_unused_embeddings.assert_called_once()
+
+        # The index is built in a shadow collection and swapped in at the end
+        self.mock_vector_store.begin_rebuild.assert_called_once()
+        self.mock_vector_store.commit_rebuild.assert_called_once()
+        self.mock_vector_store.clear_collection.assert_not_called()
+
+        # Both small files are embedded and written in a single batch
+        self.mock_vector_store.embed_documents.assert_called_once()
+        self.mock_vector_store.write_documents.assert_called_once()
+        file_events = [r for r in results if r["type"] == "file_complete"]
+        assert sorted(e["file_path"] for e in file_events) == ["doc1.md", "doc2.md"]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_index_stream_failure_keeps_serving_index(self):
+        """Test that a failed rebuild never swaps in the shadow collection."""
+        self.mock_git_manager.repo = None
+        self.mock_git_manager.setup_repository.return_value = True
+        self.mock_git_manager.get_all_markdown_files.side_effect = RuntimeError(
+            "disk gone"
+        )
+
+        results = [p async for p in self.coordinator.rebuild_index_stream()]
+
+        assert results[-1]["type"] == "error"
+        self.mock_git_manager.get_all_markdown_files.assert_called_once_with(
+            None, strict=True
+        )
+        self.mock_vector_store.begin_rebuild.assert_called_once()
+        self.mock_vector_store.commit_rebuild.assert_not_called()
+        # Later syncs write to the serving collection, not the stale shadow
+        self.mock_vector_store.detach_rebuild.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_rebuild_detaches_shadow(self):
+        """Test that closing a rebuild stream midway detaches the shadow."""
+        self.mock_git_manager.repo = None
+        self.mock_git_manager.setup_repository.return_value = True
+        self.mock_git_manager.get_all_markdown_files.return_value = ["a.md"]
+
+        stream = self.coordinator.rebuild_index_stream()
+        async for progress in stream:
+            if progress.get("message") == "Scanning markdown files...":
+                break
+        await stream.aclose()
+
+        self.mock_vector_store.begin_rebuild.assert_called_once()
+        self.mock_vector_store.commit_rebuild.assert_not_called()
+        self.mock_vector_store.detach_rebuild.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_rebuild_index_stream_flushes_on_chunk_budget(self):
+        """Test that batches are flushed once the chunk budget is reached."""
+        self.coordinator.ingest_batch_max_chunks = 1
+        self.mock_git_manager.repo = None
+        self.mock_git_manager.setup_repository.return_value = True
+        self.mock_git_manager.get_all_markdown_files.return_value = ["a.md", "b.md"]
+        self.mock_git_manager.get_file_content.return_value = "Content"
+        self.mock_processor.process_file.side_effect = [
+            ObsidianDocument(
+                file_path=path,
+                title=path,
+                content="Content",
+                metadata={},
+                tags=[],
+                links=[],
+            )
+            for path in ["a.md", "b.md"]
+        ]
+        self.mock_processor.split_content_for_embedding.return_value = [
+            {"content": "chunk"}
+        ]
+        # The second batch fails to write and its per-document retry fails too
+        self.mock_vector_store.write_documents.side_effect = [None, RuntimeError()]
+        self.mock_vector_store.add_document.return_value = False
+
+        results = [p async for p in self.coordinator.rebuild_index_stream()]
+
+        assert self.mock_vector_store.write_documents.call_count == 2
+        final_result = results[-1]
+        assert final_result["stats"]["processed"] == 1
+        assert final_result["stats"]["failed"] == 1
+        # The failed note would vanish from search, so the old index is kept
+        assert final_result["type"] == "error"
+        self.mock_vector_store.commit_rebuild.assert_not_called()
+        self.mock_vector_store.set_indexed_commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rebuild_index_stream_resumes_from_checkpoint(self, tmp_path):
+        """Test that a resumed rebuild skips checkpointed files and keeps the index."""
+        checkpoint = RebuildCheckpoint(tmp_path / "rebuild_checkpoint.jsonl")
+        checkpoint.start("head-sha")
+        checkpoint.mark_completed(["done.md"])
+        self.coordinator.checkpoint = checkpoint
+
+        self.mock_git_manager.repo = None
+        self.mock_git_manager.setup_repository.return_value = True
+        self.mock_vector_store.resume_rebuild.return_value = True
+        self.mock_git_manager.get_all_markdown_files.return_value = [
+            "done.md",
+            "todo.md",
+        ]
+        self.mock_git_manager.get_file_content.return_value = "Content"
+        self.mock_processor.process_file.return_value = ObsidianDocument(
+            file_path="todo.md",
+            title="Todo",
+            content="Content",
+            metadata={},
+            tags=[],
+            links=[],
+        )
+        self.mock_processor.split_content_for_embedding.return_value = [
+            {"content": "chunk"}
+        ]
+
+        results = [p async for p in self.coordinator.rebuild_index_stream(resume=True)]
+
+        self.mock_vector_store.begin_rebuild.assert_not_called()
+        self.mock_vector_store.commit_rebuild.assert_called_once()
+        self.mock_git_manager.get_file_content.assert_called_once_with("todo.md", None)
+        stats = results[-1]["stats"]
+        assert stats["resumed"] is True
+        assert stats["skipped_files"] == 1
+        assert stats["processed"] == 1
+        # A completed rebuild leaves nothing to resume
+        assert checkpoint.load() is None
+
+    @pytest.mark.asyncio
+    async def test_rebuild_index_stream_checkpoints_written_files(self, tmp_path):
+        """Test that an interrupted rebuild leaves written files checkpointed."""
+        checkpoint = RebuildCheckpoint(tmp_path / "rebuild_checkpoint.jsonl")
+        self.coordinator.checkpoint = checkpoint
+        self.coordinator.ingest_batch_max_chunks = 1
+
+        self.mock_git_manager.repo = None
+        self.mock_git_manager.setup_repository.return_value = True
+        self.mock_git_manager.get_all_markdown_files.return_value = ["a.md", "b.md"]
+        self.mock_git_manager.get_file_content.return_value = "Content"
+        self.mock_processor.process_file.side_effect = [
+            ObsidianDocument(
+                file_path=path,
+                title=path,
+                content="Content",
+                metadata={},
+                tags=[],
+                links=[],
+            )
+            for path in ["a.md", "b.md"]
+        ]
+        self.mock_processor.split_content_for_embedding.return_value = [
+            {"content": "chunk"}
+        ]
+        self.mock_vector_store.write_documents.side_effect = [None, RuntimeError()]
+        self.mock_vector_store.add_document.return_value = False
+
+        results = [p async for p in self.coordinator.rebuild_index_stream()]
+
+        assert results[-1]["stats"]["resumed"] is False
+        state = checkpoint.load()
+        assert state["commit"] == "head-sha"
+        assert len(state["completed_files"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_rebuild_index_stream_swaps_despite_unparseable_note(self, tmp_path):
+        """Test that a note that can never be parsed does not block the swap."""
+        checkpoint = RebuildCheckpoint(tmp_path / "rebuild_checkpoint.jsonl")
+        self.coordinator.checkpoint = checkpoint
+        checkpointed = []
+        checkpoint.mark_completed = Mock(side_effect=checkpointed.extend)
+        self.mock_git_manager.repo = None
+        self.mock_git_manager.setup_repository.return_value = True
+        self.mock_git_manager.get_all_markdown_files.return_value = ["a.md", "bad.md"]
+        self.mock_git_manager.get_file_content.return_value = "Content"
+        self.mock_processor.process_file.side_effect = lambda path, content: (
+            None
+            if path == "bad.md"
+            else ObsidianDocument(
+                file_path=path,
+                title=path,
+                content=content,
+                metadata={},
+                tags=[],
+                links=[],
+            )
+        )
+        self.mock_processor.split_content_for_embedding.return_value = [
+            {"content": "chunk"}
+        ]
+
+        results = [p async for p in self.coordinator.rebuild_index_stream()]
+
+        final_result = results[-1]
+        assert final_result["type"] == "complete"
+        assert final_result["stats"]["processed"] == 1
+        assert final_result["stats"]["failed"] == 0
+        assert final_result["stats"]["unparseable"] == 1
+        assert sorted(checkpointed) == ["a.md", "bad.md"]
+        self.mock_vector_store.commit_rebuild.assert_called_once()
+        self.mock_vector_store.set_indexed_commit.assert_called_once_with("head-sha")
+
+    @pytest.mark.asyncio
+    async def test_start_job_runs_rebuild_in_background(self):
+        """Test that rebuild jobs run without a connected client."""
+        self.coordinator.job_manager = JobManager()
+        self.mock_git_manager.repo = None
+        self.mock_git_manager.setup_repository.return_value = False
+
+        job, created = self.coordinator.start_job("rebuild")
+        await job.task
+
+        assert created is True
+        assert job.kind == "rebuild"
+        assert job.status == "failed"
+        assert job.message == "Failed to setup repository"
 
     def test_search_documents(self):
         """Test document search."""
@@ -207,5 +565,98 @@ class TestSyncCoordinator:
 
         assert result == mock_results
         self.mock_vector_store.search.assert_called_once_with(
-            query="test query", n_results=5, file_filter="*.md", tag_filter=["tag1"]
+            query="test query",
+            n_results=5,
+            file_filter="*.md",
+            tag_filter=["tag1"],
+            mode="vector",
+            rerank=False,
+            mmr_lambda=None,
+            max_chunks_per_file=None,
+            fields=None,
+            snippet=False,
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_documents_async(self):
+        """Test non-blocking document search."""
+        mock_results = [{"id": "1", "content": "Result 1"}]
+        self.mock_vector_store.search_async.return_value = mock_results
+
+        result = await self.coordinator.search_documents_async(
+            query="test query", n_results=5, timeout=1.0
+        )
+
+        assert result == mock_results
+        self.mock_vector_store.search_async.assert_awaited_once_with(
+            query="test query",
+            n_results=5,
+            file_filter=None,
+            tag_filter=None,
+            mode="vector",
+            rerank=False,
+            mmr_lambda=None,
+            max_chunks_per_file=None,
+            fields=None,
+            snippet=False,
         )
+
+    @pytest.mark.asyncio
+    async def test_search_documents_async_timeout(self):
+        """Test that slow searches raise a timeout."""
+
+        async def slow_search(**kwargs):
+            await asyncio.sleep(1)
+            return []
+
+        self.mock_vector_store.search_async.side_effect = slow_search
+
+        with pytest.raises(asyncio.TimeoutError):
+            await self.coordinator.search_documents_async(
+                query="test query", timeout=0.01
+            )
+
+    def test_search_documents_uses_result_cache(self):
+        """Test that repeated searches are served from the result cache."""
+        self.coordinator.result_cache = SearchResultCache(max_entries=8)
+        self.mock_vector_store.index_generation = (1, 0)
+        self.mock_vector_store.search.return_value = [{"id": "1"}]
+
+        first = self.coordinator.search_documents(query="test query")
+        second = self.coordinator.search_documents(query="test query")
+
+        assert first == second == [{"id": "1"}]
+        self.mock_vector_store.search.assert_called_once()
+
+        # A write to the index bumps the generation and forces a fresh search
+        self.mock_vector_store.index_generation = (2, 0)
+        self.coordinator.search_documents(query="test query")
+        assert self.mock_vector_store.search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_documents_batch_uses_result_cache(self):
+        """Test that batch searches only send uncached searches to the store."""
+        self.coordinator.result_cache = SearchResultCache(max_entries=8)
+        self.mock_vector_store.index_generation = (1, 0)
+        self.mock_vector_store.search.return_value = [{"id": "cached"}]
+        self.coordinator.search_documents(query="first")
+        self.mock_vector_store.search_batch_async.return_value = [[{"id": "fresh"}]]
+
+        results = await self.coordinator.search_documents_batch_async(
+            [SearchRequest(query="first"), SearchRequest(query="second")]
+        )
+
+        assert results == [[{"id": "cached"}], [{"id": "fresh"}]]
+        sent = self.mock_vector_store.search_batch_async.call_args.args[0]
+        assert [request.query for request in sent] == ["second"]
+
+    def test_degraded_rerank_results_are_not_cached(self):
+        """Test that results missing their rerank scores are searched again."""
+        self.coordinator.result_cache = SearchResultCache(max_entries=8)
+        self.mock_vector_store.index_generation = (1, 0)
+        self.mock_vector_store.search.return_value = [Mock(rerank_score=None)]
+
+        self.coordinator.search_documents(query="test query", rerank=True)
+        self.coordinator.search_documents(query="test query", rerank=True)
+
+        assert self.mock_vector_store.search.call_count == 2
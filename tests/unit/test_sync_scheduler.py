@@ -0,0 +1,61 @@
+"""Unit tests for SyncScheduler class."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from src.services import SyncCoordinator, SyncScheduler
+
+
+class TestSyncScheduler:
+    """Test cases for SyncScheduler class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_coordinator = Mock(spec=SyncCoordinator)
+        # Tests wait on this instead of sleeping, which was flaky under load
+        self.synced = asyncio.Event()
+        self.mock_coordinator.start_job.side_effect = lambda kind: (
+            self.synced.set() or Mock(id="job", task=asyncio.sleep(0)),
+            True,
+        )
+
+    @pytest.mark.asyncio
+    async def test_burst_of_notifications_starts_one_sync(self):
+        """Test that triggers within the debounce window collapse into one sync."""
+        scheduler = SyncScheduler(
+            coordinator_factory=lambda: self.mock_coordinator,
+            debounce_seconds=0.5,
+        )
+        scheduler.start()
+
+        for _ in range(3):
+            scheduler.notify()
+            await asyncio.sleep(0.01)
+        await asyncio.wait_for(self.synced.wait(), timeout=5)
+        await scheduler.stop()
+
+        self.mock_coordinator.start_job.assert_called_once_with("sync")
+        assert scheduler.get_stats()["notifications"] == 3
+        assert scheduler.get_stats()["syncs_started"] == 1
+
+    @pytest.mark.asyncio
+    async def test_poll_without_remote_changes_does_not_sync(self):
+        """Test that polling only syncs when the remote moved."""
+        polls = []
+        self.mock_coordinator.has_remote_changes.side_effect = (
+            lambda: polls.append(None) or len(polls) == 3
+        )
+        scheduler = SyncScheduler(
+            coordinator_factory=lambda: self.mock_coordinator,
+            interval_seconds=0.01,
+            debounce_seconds=0.01,
+        )
+        scheduler.start()
+
+        await asyncio.wait_for(self.synced.wait(), timeout=5)
+        await scheduler.stop()
+
+        assert len(polls) >= 3
+        self.mock_coordinator.start_job.assert_called_once_with("sync")
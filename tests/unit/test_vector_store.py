@@ -1,12 +1,20 @@
 """Unit tests for VectorStore class."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pytest
 
 from src.config.settings import Settings
 from src.models import VectorStore
-from src.models.obsidian_processor import ObsidianDocument
-from src.schemas import FileChange, FileStatus
+from src.models.chunk_embedding_cache import ChunkEmbeddingCache
+from src.models.lexical_index import LexicalIndex
+from src.models.vector_store import EmbeddedBatch
+from src.processing import ObsidianDocument
+from src.schemas import FileChange, FileStatus, SearchRequest, SearchResult
 
 
 class TestVectorStore:
@@ -17,6 +25,18 @@ class TestVectorStore:
         self.settings = Mock(spec=Settings)
         self.settings.VECTOR_DB_PATH = "./test_chroma_db"
         self.settings.EMBEDDING_MODEL_NAME = "test-model"
+        self.settings.SEARCH_MAX_WORKERS = 2
+        self.settings.QUERY_BATCH_MAX_SIZE = 8
+        self.settings.QUERY_BATCH_WAIT_MS = 2.0
+        self.settings.QUERY_CACHE_MAX_ENTRIES = 16
+        self.settings.QUERY_CACHE_MAX_BYTES = 0
+        self.settings.QUERY_CACHE_TTL_SECONDS = 0
+        self.settings.EMBEDDING_CACHE_ENABLED = False
+        self.settings.LEXICAL_INDEX_ENABLED = False
+        self.settings.HYBRID_RRF_K = 60
+        self.settings.RERANK_MODEL_NAME = ""
+        self.settings.RERANK_CANDIDATES = 20
+        self.settings.SNIPPET_MAX_CHARS = 300
 
         with (
             patch(
@@ -30,6 +50,10 @@ class TestVectorStore:
 
             self.mock_client = self.mock_client_class.return_value
             self.mock_collection = Mock()
+            self.mock_collection.metadata = {
+                "model_name": "test-model",
+                "tag_keys": True,
+            }
             self.mock_client.get_or_create_collection.return_value = (
                 self.mock_collection
             )
@@ -46,6 +70,16 @@ class TestVectorStore:
         )
         self.mock_client.get_or_create_collection.assert_called_once()
 
+    @patch("builtins.print")
+    @patch("src.models.vector_store.SentenceTransformer")
+    def test_load_embedding_model(self, mock_transformer_class, mock_print):
+        """Test hot-swapping the embedding model."""
+        self.vector_store.load_embedding_model("other-model")
+
+        mock_transformer_class.assert_called_once_with("other-model")
+        assert self.vector_store.model_name == "other-model"
+        assert self.vector_store.embedding_model == mock_transformer_class.return_value
+
     @patch("builtins.print")
     def test_add_document_success(self, mock_print):
         """Test successful document addition."""
@@ -66,23 +100,328 @@ class TestVectorStore:
         mock_embeddings.tolist.return_value = [[0.1], [0.2]]
         self.vector_store.embedding_model.encode.return_value = mock_embeddings
 
-        with patch.object(self.vector_store, "remove_document", return_value=True):
-            result = self.vector_store.add_document(document, chunks)
+        self.vector_store.collection.get.return_value = {"ids": [], "metadatas": []}
+
+        result = self.vector_store.add_document(document, chunks)
 
         assert result is True
         self.vector_store.collection.add.assert_called_once()
         call_args = self.vector_store.collection.add.call_args[1]
         assert len(call_args["ids"]) == 2
+        self.vector_store.collection.delete.assert_not_called()
+
+    @patch("builtins.print")
+    def test_add_document_writes_only_changed_chunks(self, mock_print):
+        """Test that re-adding an edited note only touches changed chunks."""
+        document = ObsidianDocument(
+            file_path="test.md",
+            title="Test",
+            content="content",
+            metadata={},
+            tags=[],
+            links=[],
+        )
+        old_chunks = [
+            {"content": "Intro", "metadata": {}},
+            {"content": "Old paragraph", "metadata": {}},
+            {"content": "Outro", "metadata": {}},
+        ]
+        old_ids, _, old_metadatas = self.vector_store._build_chunk_records(
+            document, old_chunks
+        )
+        self.vector_store.collection.get.return_value = {
+            "ids": old_ids,
+            "metadatas": old_metadatas,
+        }
+        mock_embeddings = Mock()
+        mock_embeddings.tolist.return_value = [[0.1]]
+        self.vector_store.embedding_model.encode.return_value = mock_embeddings
+
+        new_chunks = [
+            {"content": "Intro", "metadata": {}},
+            {"content": "New paragraph", "metadata": {}},
+            {"content": "Outro", "metadata": {}},
+        ]
+        result = self.vector_store.add_document(document, new_chunks)
+
+        assert result is True
+        self.vector_store.collection.delete.assert_called_once_with(ids=[old_ids[1]])
+        self.vector_store.embedding_model.encode.assert_called_once()
+        assert self.vector_store.embedding_model.encode.call_args[0][0] == [
+            "New paragraph"
+        ]
+        add_args = self.vector_store.collection.add.call_args[1]
+        assert len(add_args["ids"]) == 1
+        self.vector_store.collection.update.assert_not_called()
+
+    @patch("builtins.print")
+    def test_add_document_unchanged_is_noop(self, mock_print):
+        """Test that re-adding an unchanged note writes nothing."""
+        document = ObsidianDocument(
+            file_path="test.md",
+            title="Test",
+            content="content",
+            metadata={},
+            tags=[],
+            links=[],
+        )
+        chunks = [{"content": "Same", "metadata": {}}]
+        ids, _, metadatas = self.vector_store._build_chunk_records(document, chunks)
+        self.vector_store.collection.get.return_value = {
+            "ids": ids,
+            "metadatas": metadatas,
+        }
+        generation = self.vector_store.index_generation
+
+        assert self.vector_store.add_document(document, chunks) is True
+
+        self.vector_store.embedding_model.encode.assert_not_called()
+        self.vector_store.collection.add.assert_not_called()
+        self.vector_store.collection.delete.assert_not_called()
+        assert self.vector_store.index_generation == generation
+
+    @patch("builtins.print")
+    def test_embed_and_write_documents_bulk_upsert(self, mock_print):
+        """Test that many documents share one encode and one upsert call."""
+        items = [
+            (
+                ObsidianDocument(
+                    file_path=f"doc{i}.md",
+                    title=f"Doc {i}",
+                    content="content",
+                    metadata={},
+                    tags=[],
+                    links=[],
+                ),
+                [{"content": f"Chunk {i}", "metadata": {}}],
+            )
+            for i in range(3)
+        ]
+        mock_embeddings = Mock()
+        mock_embeddings.tolist.return_value = [[0.1], [0.2], [0.3]]
+        self.vector_store.embedding_model.encode.return_value = mock_embeddings
+
+        self.vector_store.write_documents(self.vector_store.embed_documents(items))
+
+        self.vector_store.embedding_model.encode.assert_called_once()
+        self.vector_store.collection.upsert.assert_called_once()
+        call_args = self.vector_store.collection.upsert.call_args[1]
+        assert [chunk_id.split("#")[0] for chunk_id in call_args["ids"]] == [
+            "doc0.md",
+            "doc1.md",
+            "doc2.md",
+        ]
+
+    def test_encode_documents_reuses_cached_chunks(self, tmp_path):
+        """Test that only unseen chunk texts are sent to the model."""
+        self.vector_store.chunk_cache = ChunkEmbeddingCache(tmp_path / "cache.db")
+        self.vector_store.embedding_model.encode.side_effect = lambda texts, **_: (
+            np.array([[float(len(text))] for text in texts])
+        )
+
+        first, first_cached = self.vector_store.encode_documents(["a", "bb"])
+        second, second_cached = self.vector_store.encode_documents(["bb", "ccc"])
+
+        assert first == [[1.0], [2.0]] and first_cached == 0
+        assert second == [[2.0], [3.0]] and second_cached == 1
+        last_call = self.vector_store.embedding_model.encode.call_args_list[-1]
+        assert last_call[0][0] == ["ccc"]
+        self.vector_store.chunk_cache.close()
+
+    def test_indexed_commit_roundtrip(self, tmp_path):
+        """Test persisting and clearing the indexed commit watermark."""
+        self.vector_store.indexed_commit_file = tmp_path / "indexed_commit"
+        assert self.vector_store.get_indexed_commit() is None
+
+        self.vector_store.set_indexed_commit("abc123")
+        assert self.vector_store.get_indexed_commit() == "abc123"
+
+        with patch("builtins.print"):
+            self.vector_store.clear_collection()
+        assert self.vector_store.get_indexed_commit() is None
+
+    def test_failed_files_roundtrip(self, tmp_path):
+        """Test persisting and clearing the files a sync failed to index."""
+        self.vector_store.failed_files_file = tmp_path / "sync_failed_files.json"
+        assert self.vector_store.get_failed_files() == []
+
+        self.vector_store.set_failed_files(["b.md", "a.md", "b.md"])
+        assert self.vector_store.get_failed_files() == ["a.md", "b.md"]
+
+        self.vector_store.set_failed_files([])
+        assert not self.vector_store.failed_files_file.exists()
+
+    @patch("builtins.print")
+    def test_shadow_rebuild_swaps_alias(self, mock_print, tmp_path):
+        """Test that rebuild writes go to a shadow that replaces the live index."""
+        self.vector_store.alias_file = tmp_path / "active_collection"
+        self.vector_store.build_file = tmp_path / "build_collection"
+        self.vector_store.indexed_commit_file = tmp_path / "indexed_commit"
+        live_collection = self.vector_store.collection
+        shadow_collection = Mock()
+        shadow_collection.name = "obsidian_vault_2"
+        shadow_collection.metadata = {"model_name": "test-model"}
+        self.mock_client.create_collection.return_value = shadow_collection
+
+        self.vector_store.begin_rebuild()
+        self.vector_store.write_documents(EmbeddedBatch(file_paths=["a.md"]))
+
+        shadow_collection.delete.assert_called_once()
+        live_collection.delete.assert_not_called()
+        assert self.vector_store.collection is live_collection
+
+        self.vector_store.commit_rebuild()
+
+        assert self.vector_store.collection is shadow_collection
+        assert self.vector_store.alias_file.read_text() == "obsidian_vault_2"
+        assert not self.vector_store.build_file.exists()
+        self.mock_client.delete_collection.assert_called_once_with(
+            name="obsidian_vault"
+        )
+
+    @patch("builtins.print")
+    def test_detached_rebuild_writes_to_serving_collection(self, mock_print, tmp_path):
+        """Test that writes after an unfinished rebuild reach the serving index."""
+        self.vector_store.build_file = tmp_path / "build_collection"
+        live_collection = self.vector_store.collection
+        shadow_collection = Mock()
+        shadow_collection.name = "obsidian_vault_2"
+        self.mock_client.create_collection.return_value = shadow_collection
+
+        self.vector_store.begin_rebuild()
+        self.vector_store.detach_rebuild()
+        self.vector_store.write_documents(EmbeddedBatch(file_paths=["a.md"]))
+
+        live_collection.delete.assert_called_once()
+        shadow_collection.delete.assert_not_called()
+        # The shadow stays registered so the rebuild can be resumed
+        assert self.vector_store.build_file.exists()
+        self.mock_client.delete_collection.assert_not_called()
+
+    @patch("builtins.print")
+    def test_search_follows_alias_swapped_elsewhere(self, mock_print, tmp_path):
+        """Test that searches pick up a collection swapped in by another process."""
+        self.vector_store.alias_file = tmp_path / "active_collection"
+        self.vector_store.alias_file.write_text("obsidian_vault_2")
+        swapped_collection = Mock()
+        swapped_collection.metadata = {"model_name": "test-model"}
+        swapped_collection.query.return_value = {
+            "ids": [[]],
+            "documents": [[]],
+            "metadatas": [[]],
+            "distances": [[]],
+        }
+        self.mock_client.get_collection.return_value = swapped_collection
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.1])
+
+        self.vector_store.search("query")
+
+        self.mock_client.get_collection.assert_called_once_with(name="obsidian_vault_2")
+        swapped_collection.query.assert_called_once()
+
+    @patch("builtins.print")
+    @patch("src.models.vector_store.SentenceTransformer")
+    def test_swapped_collection_switches_query_model(
+        self, mock_transformer_class, mock_print, tmp_path
+    ):
+        """Test that queries use the model named by a collection swapped elsewhere."""
+        self.vector_store.alias_file = tmp_path / "active_collection"
+        self.vector_store.alias_file.write_text("obsidian_vault_2")
+        swapped_collection = Mock()
+        swapped_collection.metadata = {"model_name": "other-model"}
+        self.mock_client.get_collection.return_value = swapped_collection
+
+        self.vector_store._refresh_collection()
+        # Searches keep the previous collection while the model loads
+        self.vector_store._refresh_collection()
+        self.vector_store._query_model_loader.join(timeout=5)
+
+        mock_transformer_class.assert_called_once_with("other-model")
+        assert self.vector_store.query_model is mock_transformer_class.return_value
+        assert self.vector_store.query_model_name == "other-model"
+        assert self.vector_store.collection is swapped_collection
+
+    @patch("builtins.print")
+    def test_concurrent_refresh_switches_collection_once(self, mock_print, tmp_path):
+        """Test that racing search threads switch to a swapped collection once."""
+        self.vector_store.alias_file = tmp_path / "active_collection"
+        self.vector_store.alias_file.write_text("obsidian_vault_2")
+        swapped_collection = Mock()
+        swapped_collection.metadata = {"model_name": "test-model"}
+
+        def get_collection(name):
+            time.sleep(0.05)
+            return swapped_collection
+
+        self.mock_client.get_collection.side_effect = get_collection
+
+        with patch.object(
+            self.vector_store, "_open_lexical_index"
+        ) as mock_open_lexical_index:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                for _ in range(4):
+                    pool.submit(self.vector_store._refresh_collection)
+
+        self.mock_client.get_collection.assert_called_once_with(name="obsidian_vault_2")
+        mock_open_lexical_index.assert_called_once_with("obsidian_vault_2")
+        assert self.vector_store.collection is swapped_collection
+
+    @patch("builtins.print")
+    @patch("src.models.vector_store.SentenceTransformer")
+    def test_sync_after_model_reload_keeps_serving_model(
+        self, mock_transformer_class, mock_print
+    ):
+        """Test that syncs after a reload embed with the serving collection's model."""
+        document = ObsidianDocument(
+            file_path="test.md",
+            title="Test",
+            content="content",
+            metadata={},
+            tags=[],
+            links=[],
+        )
+        serving_model = self.vector_store.embedding_model
+        serving_model.encode.return_value = np.array([[0.1]])
+        new_model = mock_transformer_class.return_value
+        new_model.encode.return_value = np.array([[0.9]])
+        self.vector_store.collection.get.return_value = {"ids": [], "metadatas": []}
+
+        self.vector_store.load_embedding_model("other-model")
+        self.vector_store.add_document(document, [{"content": "Chunk"}])
+
+        new_model.encode.assert_not_called()
+        add_args = self.vector_store.collection.add.call_args.kwargs
+        assert add_args["embeddings"] == [[0.1]]
+
+        # A rebuild's shadow is filled with the new model
+        self.vector_store.build_collection = Mock()
+        assert self.vector_store.encode_documents(["Chunk"]) == ([[0.9]], 0)
+
+    @patch("builtins.print")
+    def test_commit_rebuild_rejects_mixed_model_shadow(self, mock_print, tmp_path):
+        """Test that a shadow built with another model is never swapped in."""
+        self.vector_store.build_file = tmp_path / "build_collection"
+        shadow_collection = Mock()
+        shadow_collection.metadata = {"model_name": "old-model"}
+        self.vector_store.build_collection = shadow_collection
+
+        with pytest.raises(RuntimeError):
+            self.vector_store.commit_rebuild()
+
+        assert self.vector_store.collection is self.mock_collection
 
     def test_remove_document_success(self):
         """Test successful document removal."""
         file_path = "test.md"
         self.vector_store.collection.get.return_value = {"ids": ["id1", "id2"]}
 
+        generation = self.vector_store.index_generation
+
         result = self.vector_store.remove_document(file_path)
 
         assert result is True
         self.vector_store.collection.delete.assert_called_once_with(ids=["id1", "id2"])
+        assert self.vector_store.index_generation != generation
 
     def test_search_success(self):
         """Test successful document search."""
@@ -115,6 +454,409 @@ class TestVectorStore:
         assert len(results) == 1
         assert results[0].id == "doc1#0"
 
+        # A repeated query reuses the cached embedding
+        self.vector_store.search(query)
+        self.vector_store.embedding_model.encode.assert_called_once()
+        assert self.vector_store.query_cache.get_stats()["hits"] == 1
+
+    def test_search_pushes_tag_filter_into_query(self):
+        """Test that tag filters become a where clause on tag-keyed collections."""
+        self.vector_store.collection.metadata = {"tag_keys": True}
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.1])
+        self.vector_store.collection.query.return_value = {
+            "ids": [[]],
+            "documents": [[]],
+            "metadatas": [[]],
+            "distances": [[]],
+        }
+
+        self.vector_store.search("query", n_results=5, tag_filter=["a", "b"])
+
+        self.vector_store.collection.query.assert_called_once_with(
+            query_embeddings=[[0.1]],
+            n_results=5,
+            where={"$or": [{"tag:a": True}, {"tag:b": True}]},
+            include=["documents", "metadatas", "distances"],
+        )
+
+    def test_search_refills_tag_filter_on_legacy_collection(self):
+        """Test that collections without tag keys over-fetch until enough match."""
+        self.vector_store.collection.metadata = {"model_name": "old"}
+        self.vector_store.collection.count.return_value = 100
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.1])
+
+        def query(n_results, **kwargs):
+            # Only every tenth chunk carries the requested tag
+            metadatas = [
+                {
+                    "file_path": f"doc{i}.md",
+                    "title": f"Doc{i}",
+                    "chunk_index": 0,
+                    "tags": '["a"]' if i % 10 == 0 else "[]",
+                    "links": "[]",
+                }
+                for i in range(n_results)
+            ]
+            return {
+                "ids": [[f"doc{i}" for i in range(n_results)]],
+                "documents": [["content"] * n_results],
+                "metadatas": [metadatas],
+                "distances": [[0.1] * n_results],
+            }
+
+        self.vector_store.collection.query.side_effect = query
+
+        results = self.vector_store.search("query", n_results=3, tag_filter=["a"])
+
+        assert [result.id for result in results] == ["doc0", "doc10", "doc20"]
+        fetched = [
+            call.kwargs["n_results"]
+            for call in self.vector_store.collection.query.call_args_list
+        ]
+        assert fetched == [12, 24]
+
+    def test_hybrid_search_fuses_lexical_matches(self, tmp_path):
+        """Test that hybrid search adds keyword-only hits via rank fusion."""
+        self.vector_store.lexical_index = LexicalIndex(tmp_path / "lexical.sqlite3")
+        self.vector_store.lexical_index.mark_complete()
+        self.vector_store.lexical_index.add_chunks(
+            ["b.md#chunk_1", "c.md#chunk_1"],
+            ["b.md", "c.md"],
+            ["calls parse_frontmatter first", "unrelated text"],
+        )
+        self.vector_store.collection.metadata = {"tag_keys": True}
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.0, 1.0])
+
+        def metadata(file_path):
+            return {
+                "file_path": file_path,
+                "title": file_path,
+                "chunk_index": 0,
+                "tags": "[]",
+                "links": "[]",
+            }
+
+        self.vector_store.collection.query.return_value = {
+            "ids": [["a.md#chunk_1"]],
+            "documents": [["semantic match"]],
+            "metadatas": [[metadata("a.md")]],
+            "distances": [[0.2]],
+        }
+        self.vector_store.collection.get.return_value = {
+            "ids": ["b.md#chunk_1"],
+            "documents": ["calls parse_frontmatter first"],
+            "metadatas": [metadata("b.md")],
+            "embeddings": [[1.0, 1.0]],
+        }
+
+        results = self.vector_store.search(
+            "parse_frontmatter", n_results=5, mode="hybrid"
+        )
+
+        assert [result.id for result in results] == ["a.md#chunk_1", "b.md#chunk_1"]
+        assert results[1].distance == 1.0
+        assert results[0].score == results[1].score == 1 / 61
+        self.vector_store.collection.get.assert_called_once_with(
+            ids=["b.md#chunk_1"], include=["documents", "metadatas", "embeddings"]
+        )
+        self.vector_store.lexical_index.close()
+
+    def test_hybrid_search_without_complete_lexical_index(self, tmp_path):
+        """Test that hybrid search is plain vector search until the index is built."""
+        self.vector_store.lexical_index = LexicalIndex(tmp_path / "lexical.sqlite3")
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.1])
+        self.vector_store.collection.query.return_value = {
+            "ids": [[]],
+            "documents": [[]],
+            "metadatas": [[]],
+            "distances": [[]],
+        }
+
+        self.vector_store.search("query", n_results=5, mode="hybrid")
+
+        assert self.vector_store.collection.query.call_args.kwargs["n_results"] == 5
+        self.vector_store.collection.get.assert_not_called()
+        self.vector_store.lexical_index.close()
+
+    @patch("builtins.print")
+    def test_writes_update_lexical_index(self, mock_print, tmp_path):
+        """Test that document writes and removals keep the BM25 index in step."""
+        lexical_index = LexicalIndex(tmp_path / "lexical.sqlite3")
+        self.vector_store.lexical_index = lexical_index
+        batch = EmbeddedBatch(
+            file_paths=["a.md"],
+            ids=["a.md#chunk_1"],
+            documents=["kubernetes operator notes"],
+            metadatas=[{"file_path": "a.md"}],
+            embeddings=[[0.1]],
+        )
+
+        self.vector_store.write_documents(batch)
+        assert [hit[0] for hit in lexical_index.search("kubernetes", 5)] == [
+            "a.md#chunk_1"
+        ]
+
+        self.vector_store.collection.get.return_value = {"ids": ["a.md#chunk_1"]}
+        self.vector_store.remove_document("a.md")
+        assert lexical_index.search("kubernetes", 5) == []
+        lexical_index.close()
+
+    def test_search_reranks_candidate_pool(self):
+        """Test that reranked searches rescore a larger pool and truncate it."""
+        self.vector_store.reranker = Mock()
+        self.vector_store.reranker.rerank.side_effect = lambda query, candidates: list(
+            reversed(candidates)
+        )
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.1])
+        candidates = [Mock(id=f"chunk{i}") for i in range(20)]
+
+        with patch.object(
+            self.vector_store, "_search", return_value=candidates
+        ) as mock_search:
+            results = self.vector_store.search("query", n_results=3, rerank=True)
+
+        mock_search.assert_called_once_with(
+            "query", [0.1], 20, None, None, "vector", None, None
+        )
+        assert [result.id for result in results] == ["chunk19", "chunk18", "chunk17"]
+
+    def test_search_keeps_vector_order_when_rerank_degrades(self):
+        """Test that a late or unavailable reranker falls back to vector order."""
+        self.vector_store.reranker = Mock()
+        self.vector_store.reranker.rerank.return_value = None
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.1])
+        candidates = [Mock(id=f"chunk{i}") for i in range(20)]
+
+        with patch.object(self.vector_store, "_search", return_value=candidates):
+            results = self.vector_store.search("query", n_results=3, rerank=True)
+
+        assert [result.id for result in results] == ["chunk0", "chunk1", "chunk2"]
+
+    @staticmethod
+    def _metadata(file_path):
+        return {
+            "file_path": file_path,
+            "title": file_path,
+            "chunk_index": 0,
+            "tags": "[]",
+            "links": "[]",
+        }
+
+    @staticmethod
+    def _results(*file_paths):
+        return [
+            SearchResult(
+                id=f"{file_path}#chunk_{i}",
+                content="content",
+                distance=0.1 * i,
+                file_path=file_path,
+                title=file_path,
+                chunk_index=i,
+                tags=[],
+                links=[],
+            )
+            for i, file_path in enumerate(file_paths)
+        ]
+
+    def test_search_caps_chunks_per_file(self):
+        """Test that max_chunks_per_file collapses an over-fetched pool by note."""
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.1])
+        candidates = self._results("a.md", "a.md", "b.md", "a.md", "c.md")
+
+        with patch.object(
+            self.vector_store, "_search", return_value=candidates
+        ) as mock_search:
+            results = self.vector_store.search(
+                "query", n_results=3, max_chunks_per_file=1
+            )
+
+        assert mock_search.call_args.args[2] == 12
+        assert [result.file_path for result in results] == ["a.md", "b.md", "c.md"]
+        self.vector_store.collection.get.assert_not_called()
+
+    def test_search_mmr_skips_near_duplicates(self):
+        """Test that MMR prefers a different chunk over a near-duplicate one."""
+        self.vector_store.query_encoder.encode = Mock(return_value=[1.0, 0.0])
+        ids = ["a.md#chunk_0", "a.md#chunk_1", "b.md#chunk_2"]
+        self.vector_store.collection.query.return_value = {
+            "ids": [ids],
+            "documents": [["content"] * 3],
+            "distances": [[0.1, 0.2, 0.3]],
+            "metadatas": [[self._metadata(path) for path in ("a.md", "a.md", "b.md")]],
+            "embeddings": [[[1.0, 0.05], [1.0, 0.06], [0.8, -0.6]]],
+        }
+
+        results = self.vector_store.search("query", n_results=2, mmr_lambda=0.5)
+
+        assert [result.id for result in results] == ["a.md#chunk_0", "b.md#chunk_2"]
+        # Embeddings come with the candidates, without a second round trip
+        assert (
+            "embeddings"
+            in self.vector_store.collection.query.call_args.kwargs["include"]
+        )
+        self.vector_store.collection.get.assert_not_called()
+
+        # With lambda 1 MMR is plain relevance order
+        results = self.vector_store.search("query", n_results=2, mmr_lambda=1.0)
+
+        assert [result.id for result in results] == ["a.md#chunk_0", "a.md#chunk_1"]
+
+    def test_search_fields_skip_documents_and_decoding(self):
+        """Test that unrequested content, tags and links are not fetched or parsed."""
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.1])
+        metadata = self._metadata("a.md")
+        metadata["tags"] = '["project"]'
+        self.vector_store.collection.query.return_value = {
+            "ids": [["a.md#chunk_0"]],
+            "documents": None,
+            "distances": [[0.1]],
+            "metadatas": [[metadata]],
+        }
+
+        results = self.vector_store.search("query", fields=["title", "file_path"])
+
+        assert self.vector_store.collection.query.call_args.kwargs["include"] == [
+            "metadatas",
+            "distances",
+        ]
+        assert results[0].title == "a.md"
+        assert results[0].content == ""
+        assert results[0].tags == []
+
+    def test_search_snippet_highlights_best_sentence(self):
+        """Test that snippet mode cuts content around the matching sentence."""
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.1])
+        self.vector_store.snippet_max_chars = 40
+        self.vector_store.collection.query.return_value = {
+            "ids": [["a.md#chunk_0"]],
+            "documents": [
+                ["Intro text that is long enough. Deploy with docker compose. Bye."]
+            ],
+            "distances": [[0.1]],
+            "metadatas": [[self._metadata("a.md")]],
+        }
+
+        results = self.vector_store.search("docker deploy", snippet=True)
+
+        assert results[0].content == "…**Deploy** with **docker** compose. Bye."
+
+    def test_search_batch_shares_encoding_and_query(self):
+        """Test that plain searches are encoded and queried together."""
+        self.vector_store.collection.metadata = {"tag_keys": True}
+        self.vector_store.embedding_model.encode.return_value = np.array([[0.1], [0.2]])
+        self.vector_store.collection.query.return_value = {
+            "ids": [["a.md#chunk_0", "b.md#chunk_0"], ["b.md#chunk_0", "a.md#chunk_0"]],
+            "documents": [["a", "b"], ["b", "a"]],
+            "distances": [[0.1, 0.2], [0.1, 0.3]],
+            "metadatas": [
+                [self._metadata("a.md"), self._metadata("b.md")],
+                [self._metadata("b.md"), self._metadata("a.md")],
+            ],
+        }
+        requests = [
+            SearchRequest(query="first", n_results=1),
+            SearchRequest(query="second", n_results=2),
+            SearchRequest(query="first", n_results=5, mode="hybrid"),
+        ]
+
+        with patch.object(
+            self.vector_store, "_run_search", return_value=[]
+        ) as mock_run_search:
+            results = self.vector_store.search_batch(requests)
+
+        assert [[result.id for result in found] for found in results] == [
+            ["a.md#chunk_0"],
+            ["b.md#chunk_0", "a.md#chunk_0"],
+            [],
+        ]
+        self.vector_store.embedding_model.encode.assert_called_once_with(
+            ["first", "second"], show_progress_bar=False
+        )
+        self.vector_store.collection.query.assert_called_once_with(
+            query_embeddings=[[0.1], [0.2]],
+            n_results=2,
+            where=None,
+            include=["documents", "metadatas", "distances"],
+        )
+        # The hybrid search runs its own stages on the shared embedding
+        assert mock_run_search.call_args.args[:3] == ("first", [0.1], 5)
+        # The shared encode call shows up in the query batching stats
+        stats = self.vector_store.query_encoder.get_stats()
+        assert (stats["batches"], stats["queries"]) == (1, 2)
+
+    def test_find_similar_uses_mean_of_stored_embeddings(self):
+        """Test that a note's neighbours are queried without encoding text."""
+        self.vector_store.collection.metadata = {"tag_keys": True}
+        self.vector_store.collection.get.return_value = {
+            "ids": ["a.md#chunk_0", "a.md#chunk_1"],
+            "embeddings": [[1.0, 0.0], [0.0, 1.0]],
+            "metadatas": [self._metadata("a.md"), self._metadata("a.md")],
+        }
+        self.vector_store.collection.query.return_value = {
+            "ids": [["b.md#chunk_0"]],
+            "documents": [["b"]],
+            "distances": [[0.3]],
+            "metadatas": [[self._metadata("b.md")]],
+        }
+
+        results = self.vector_store.find_similar(file_path="a.md", n_results=3)
+
+        assert [result.id for result in results] == ["b.md#chunk_0"]
+        self.vector_store.collection.query.assert_called_once_with(
+            query_embeddings=[[0.5, 0.5]],
+            n_results=3,
+            where={"file_path": {"$ne": "a.md"}},
+            include=["documents", "metadatas", "distances"],
+        )
+        self.vector_store.embedding_model.encode.assert_not_called()
+
+    def test_find_similar_unknown_source(self):
+        """Test that an unindexed source yields None."""
+        self.vector_store.collection.get.return_value = {
+            "ids": [],
+            "embeddings": [],
+            "metadatas": [],
+        }
+
+        assert self.vector_store.find_similar(chunk_id="missing") is None
+        self.vector_store.collection.query.assert_not_called()
+
+    async def test_search_async_runs_on_executor(self):
+        """Test that async search encodes on the loop, then searches on the executor."""
+        self.vector_store.query_encoder.encode_async = AsyncMock(return_value=[0.1])
+        with patch.object(self.vector_store, "search", return_value=[]) as mock_search:
+            results = await self.vector_store.search_async("query", n_results=3)
+
+        assert results == []
+        self.vector_store.query_encoder.encode_async.assert_awaited_once_with("query")
+        mock_search.assert_called_once_with(
+            query="query",
+            n_results=3,
+            file_filter=None,
+            tag_filter=None,
+            mode="vector",
+            rerank=False,
+            mmr_lambda=None,
+            max_chunks_per_file=None,
+            fields=None,
+            snippet=False,
+            query_embedding=[0.1],
+            query_model_name="test-model",
+        )
+
+    def test_search_reencodes_after_query_model_switch(self):
+        """Test that an embedding from a replaced query model is not used."""
+        self.vector_store.query_encoder.encode = Mock(return_value=[0.2])
+
+        with patch.object(
+            self.vector_store, "_run_search", return_value=[]
+        ) as mock_run_search:
+            self.vector_store.search(
+                "query", query_embedding=[0.1], query_model_name="old-model"
+            )
+
+        assert mock_run_search.call_args.args[1] == [0.2]
+
     def test_process_file_changes(self):
         """Test processing file changes."""
         changes = [
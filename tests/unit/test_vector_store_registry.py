@@ -0,0 +1,69 @@
+"""Unit tests for VectorStoreRegistry class."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.config.settings import Settings
+from src.models import VectorStoreRegistry
+
+
+class TestVectorStoreRegistry:
+    """Test cases for VectorStoreRegistry class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.settings = Mock(spec=Settings)
+        self.settings.EMBEDDING_MODEL_NAME = "test-model"
+        self.registry = VectorStoreRegistry()
+
+    @patch("src.models.vector_store_registry.VectorStore")
+    def test_get_creates_store_once(self, mock_vector_store_class):
+        """Test that the vector store is constructed only once."""
+        first = self.registry.get(self.settings)
+        second = self.registry.get(self.settings)
+
+        assert first is second
+        assert self.registry.is_initialized
+        mock_vector_store_class.assert_called_once_with(settings=self.settings)
+
+    @patch("src.models.vector_store_registry.VectorStore")
+    def test_reload_model_swaps_when_changed(self, mock_vector_store_class):
+        """Test hot-swapping the embedding model."""
+        vector_store = mock_vector_store_class.return_value
+        vector_store.model_name = "test-model"
+        self.registry.startup(self.settings)
+
+        result = self.registry.reload_model("other-model")
+
+        vector_store.load_embedding_model.assert_called_once_with("other-model")
+        assert result == {
+            "previous_model": "test-model",
+            "current_model": "other-model",
+        }
+
+    @patch("src.models.vector_store_registry.VectorStore")
+    def test_reload_model_noop_when_unchanged(self, mock_vector_store_class):
+        """Test that reloading the same model does nothing."""
+        vector_store = mock_vector_store_class.return_value
+        vector_store.model_name = "test-model"
+        self.registry.startup(self.settings)
+
+        self.registry.reload_model("test-model")
+
+        vector_store.load_embedding_model.assert_not_called()
+
+    def test_reload_model_requires_initialization(self):
+        """Test that reloading before startup raises."""
+        with pytest.raises(RuntimeError):
+            self.registry.reload_model("other-model")
+
+    @patch("src.models.vector_store_registry.VectorStore")
+    def test_shutdown_closes_store(self, mock_vector_store_class):
+        """Test that shutdown closes and drops the shared store."""
+        self.registry.startup(self.settings)
+
+        self.registry.shutdown()
+
+        mock_vector_store_class.return_value.close.assert_called_once()
+        assert not self.registry.is_initialized